@@ -1,9 +1,16 @@
 import sys
 import os
-import json
-import hashlib
-
-from PySide6.QtCore import Qt, QSettings, QEasingCurve, QPropertyAnimation, QRect
+import time
+import multiprocessing
+
+from PySide6.QtCore import (
+    Qt,
+    QEasingCurve,
+    QThread,
+    QTimer,
+    QVariantAnimation,
+    Signal,
+)
 from PySide6.QtWidgets import (
     QApplication,
     QWidget,
@@ -14,71 +21,114 @@ from PySide6.QtWidgets import (
     QLabel,
     QSizePolicy,
 )
-from PySide6.QtGui import QAction, QIcon, QPixmap
+from PySide6.QtGui import QAction, QIcon, QPainter, QPixmap
 
 from ui.dashboard import DashboardTab
 from ui.mercy_tracker import MercyTrackerTab
 from ui.app_metadata import APP_VERSION, APP_BUILD, APP_THEME_KEY
 from ui.settings_page import SettingsPage
 from ui.pity import PityPage
+from ui.gacha_simulator import GachaSimulatorTab
 from ui.shardinventory import ShardInventory
+from ui import theme as theme_engine
+from ui.animation import get_animation_manager
+from logic.app_state import get_app_store, sync_with_log
+from logic.build_info import resolve_build_number
+from logic.persistence import get_settings_store
+from logic.tracing import get_tracer, span
+from core.inventory import Inventory
+
 
+# Pages not opened yet are built this long after the window first shows
+IDLE_PAGE_BUILD_DELAY_MS = 300
 
-BUILD_FILE = "build.json"
+# Set by main(); the "startup" span runs from here to the first paint
+_main_started_ns = None
 
 
 # ---------------------------------------------------------
-#   BUILD SYSTEM HELPERS
+#   BACKGROUND BUILD CHECK
 # ---------------------------------------------------------
 
-def hash_file(path: str) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
-def collect_project_hashes(root: str) -> dict:
-    hashes = {}
-    for dirpath, _, filenames in os.walk(root):
-        for name in filenames:
-            if name.endswith(".py"):
-                full_path = os.path.join(dirpath, name)
-                rel_path = os.path.relpath(full_path, root)
-                try:
-                    hashes[rel_path] = hash_file(full_path)
-                except Exception:
-                    continue
-    return hashes
-
-
-def load_build_info() -> dict:
-    if os.path.exists(BUILD_FILE):
-        try:
-            with open(BUILD_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {"build": 1, "hashes": {}}
+class BuildInfoWorker(QThread):
+    """
+    Resolves the build number off the GUI thread so hashing and the
+    build.json write never delay the first paint.
+    """
 
+    build_ready = Signal(int)
 
-def save_build_info(info: dict):
-    with open(BUILD_FILE, "w", encoding="utf-8") as f:
-        json.dump(info, f, indent=4)
+    def run(self):
+        try:
+            with span("startup.build_hash"):
+                build = resolve_build_number()
+        except Exception:
+            return
+        self.build_ready.emit(build)
 
 
-def update_build_if_needed() -> int:
-    root = os.path.dirname(os.path.abspath(__file__))
-    current_hashes = collect_project_hashes(root)
-    info = load_build_info()
+# ---------------------------------------------------------
+#   PAGE TRANSITION OVERLAY
+# ---------------------------------------------------------
 
-    if info.get("hashes") != current_hashes:
-        info["build"] = int(info.get("build", 1)) + 1
-        info["hashes"] = current_hashes
-        save_build_info(info)
+class _TransitionOverlay(QWidget):
+    """
+    Paints a page transition from two cached snapshots, so the real page
+    widgets are neither moved nor repainted while it runs. Records the
+    paint time of every frame and the gap between frames.
+    """
 
-    return int(info.get("build", 1))
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hide()
+
+        self._old = QPixmap()
+        self._new = QPixmap()
+        self._direction = 1
+        self._progress = 0.0
+
+        self.frame_paint_ns = []
+        self.frame_gaps_ns = []
+        self._last_frame_ns = None
+
+    def begin(self, old: QPixmap, new: QPixmap, direction: int, rect):
+        self._old, self._new = old, new
+        self._direction = direction
+        self._progress = 0.0
+        self.frame_paint_ns = []
+        self.frame_gaps_ns = []
+        self._last_frame_ns = None
+
+        self.setGeometry(rect)
+        self.raise_()
+        self.show()
+
+    def end(self):
+        self.hide()
+        # Snapshots are full-page pixmaps; don't keep them around
+        self._old = QPixmap()
+        self._new = QPixmap()
+
+    def set_progress(self, progress: float):
+        self._progress = progress
+        self.update()
+
+    def paintEvent(self, event):
+        start = time.perf_counter_ns()
+        if self._last_frame_ns is not None:
+            self.frame_gaps_ns.append(start - self._last_frame_ns)
+        self._last_frame_ns = start
+
+        offset = round(self._progress * self.width())
+        painter = QPainter(self)
+        painter.drawPixmap(-self._direction * offset, 0, self._old)
+        painter.drawPixmap(self._direction * (self.width() - offset), 0, self._new)
+        painter.end()
+
+        self.frame_paint_ns.append(time.perf_counter_ns() - start)
+        get_tracer().record("stack.frame", start)
 
 
 # ---------------------------------------------------------
@@ -86,46 +136,175 @@ def update_build_if_needed() -> int:
 # ---------------------------------------------------------
 
 class AnimatedStack(QStackedWidget):
+    # Emitted once per lazy page, right after its real widget is created
+    page_built = Signal(int, QWidget)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._anim_duration = 250
         self._is_animating = False
 
+        # Snapshot transitions; requests made mid-slide wait here (latest wins)
+        self._overlay = _TransitionOverlay(self)
+        self._transition = None
+        self._target_index = None
+        self._queued_index = None
+
+        # Frame stats of the last finished slide (see _record_transition)
+        self.last_transition = None
+        self._transition_start = 0
+        self._prepare_ns = 0
+
+        # index -> factory for pages still represented by a placeholder
+        self._page_factories = {}
+
     def set_duration(self, ms: int):
         self._anim_duration = ms
 
+    # ---------------- LAZY PAGES ----------------
+
+    def add_lazy_page(self, factory) -> int:
+        """
+        Reserve a slot with an empty placeholder. The real page is created
+        by calling factory() on first navigation or via build_pending_pages().
+        """
+        index = self.addWidget(QWidget())
+        self._page_factories[index] = factory
+        return index
+
+    def is_page_built(self, index: int) -> bool:
+        return index not in self._page_factories
+
+    def ensure_page(self, index: int) -> QWidget:
+        factory = self._page_factories.pop(index, None)
+        if factory is None:
+            return self.widget(index)
+
+        placeholder = self.widget(index)
+        was_current = self.currentIndex() == index
+
+        with span(f"page.build.{getattr(factory, '__name__', index)}"):
+            page = factory()
+        self.insertWidget(index, page)
+        self.removeWidget(placeholder)
+        placeholder.deleteLater()
+
+        if was_current:
+            super().setCurrentIndex(index)
+
+        self.page_built.emit(index, page)
+        return page
+
+    def build_pending_pages(self, delay_ms: int = 0):
+        """Build the remaining placeholders one per event-loop turn."""
+        if not self._page_factories:
+            return
+
+        def build_next():
+            if not self._page_factories:
+                return
+            if self._is_animating:
+                QTimer.singleShot(self._anim_duration, build_next)
+                return
+            self.ensure_page(min(self._page_factories))
+            if self._page_factories:
+                QTimer.singleShot(0, build_next)
+
+        QTimer.singleShot(delay_ms, build_next)
+
+    def setCurrentIndex(self, index: int):
+        # A direct jump wins over a running or queued slide
+        self._queued_index = None
+        if self._is_animating:
+            self._finish_transition(run_queued=False)
+        self.ensure_page(index)
+        super().setCurrentIndex(index)
+
+    def resizeEvent(self, event):
+        # Snapshots no longer match the page size: land the slide now
+        if self._is_animating:
+            self._transition.setCurrentTime(self._transition.totalDuration())
+        super().resizeEvent(event)
+
+    # ---------------- ANIMATION ----------------
+
     def slide_to_index(self, index: int):
-        if index == self.currentIndex() or self._is_animating:
+        if self._is_animating:
+            self._queued_index = None if index == self._target_index else index
+            return
+        if index == self.currentIndex():
             return
 
+        self.ensure_page(index)
+
+        if get_animation_manager().reduced_motion or not self.isVisible():
+            super().setCurrentIndex(index)
+            return
+
+        prepare_start = time.perf_counter_ns()
+
         old_widget = self.currentWidget()
         new_widget = self.widget(index)
 
-        w = self.frameRect().width()
-        h = self.frameRect().height()
+        # Lay the incoming page out at its final size, then snapshot both
+        new_widget.setGeometry(old_widget.geometry())
+        if new_widget.layout() is not None:
+            new_widget.layout().activate()
+        old_pixmap = old_widget.grab()
+        new_pixmap = new_widget.grab()
 
         direction = 1 if index > self.currentIndex() else -1
 
-        new_widget.setGeometry(QRect(direction * w, 0, w, h))
-        new_widget.show()
-
-        old_widget.hide()
-
         self._is_animating = True
+        self._target_index = index
+        self._overlay.begin(old_pixmap, new_pixmap, direction, old_widget.geometry())
+        self._prepare_ns = time.perf_counter_ns() - prepare_start
+        self._transition_start = prepare_start
+
+        self._transition = QVariantAnimation(self)
+        self._transition.setDuration(self._anim_duration)
+        self._transition.setEasingCurve(QEasingCurve.Type.InOutCubic)
+        self._transition.setStartValue(0.0)
+        self._transition.setEndValue(1.0)
+        self._transition.valueChanged.connect(self._overlay.set_progress)
+        self._transition.finished.connect(self._finish_transition)
+        get_animation_manager().start(self._transition, self._overlay, ambient=False)
+
+    def _finish_transition(self, run_queued: bool = True):
+        if not self._is_animating:
+            return
 
-        anim_new = QPropertyAnimation(new_widget, b"geometry", self)
-        anim_new.setDuration(self._anim_duration)
-        anim_new.setEasingCurve(QEasingCurve.Type.InOutCubic)
-        anim_new.setStartValue(QRect(direction * w, 0, w, h))
-        anim_new.setEndValue(QRect(0, 0, w, h))
+        transition, self._transition = self._transition, None
+        transition.finished.disconnect(self._finish_transition)
+        get_animation_manager().stop(transition)
+        transition.deleteLater()
 
-        def on_finished():
-            self.setCurrentIndex(index)
-            new_widget.setGeometry(QRect(0, 0, w, h))
-            self._is_animating = False
+        # Swap the real page in only now
+        index, self._target_index = self._target_index, None
+        super().setCurrentIndex(index)
+        self._overlay.end()
+        self._is_animating = False
 
-        anim_new.finished.connect(on_finished)
-        anim_new.start()
+        self._record_transition(index)
+
+        queued, self._queued_index = self._queued_index, None
+        if run_queued and queued is not None and queued != self.currentIndex():
+            self.slide_to_index(queued)
+
+    def _record_transition(self, index: int):
+        paints = self._overlay.frame_paint_ns
+        gaps = self._overlay.frame_gaps_ns
+        self.last_transition = {
+            "index": index,
+            "frames": len(paints),
+            "prepare_ms": self._prepare_ns / 1e6,
+            "mean_paint_ms": sum(paints) / len(paints) / 1e6 if paints else 0.0,
+            "max_paint_ms": max(paints, default=0) / 1e6,
+            "max_frame_gap_ms": max(gaps, default=0) / 1e6,
+        }
+        get_tracer().record(
+            "stack.transition", self._transition_start, args=self.last_transition
+        )
 
 
 # ---------------------------------------------------------
@@ -133,11 +312,11 @@ class AnimatedStack(QStackedWidget):
 # ---------------------------------------------------------
 
 class MainWindow(QWidget):
-    def __init__(self, build_number: int):
+    def __init__(self, build_number: int | None = None):
         super().__init__()
 
         # Settings + theme
-        self.settings = QSettings("SketeRAID", "Hydra Companion")
+        self.settings = get_settings_store()
 
         if self.settings.value(APP_THEME_KEY) is None:
             self.settings.setValue(APP_THEME_KEY, "dark")
@@ -173,11 +352,13 @@ class MainWindow(QWidget):
         self.action_dashboard = QAction("Dashboard", self)
         self.action_mercy = QAction("Mercy Tracker", self)
         self.action_pity = QAction("Pity", self)
+        self.action_simulator = QAction("Simulator", self)
         self.action_settings = QAction("Settings", self)
 
         self.top_bar.addAction(self.action_dashboard)
         self.top_bar.addAction(self.action_mercy)
         self.top_bar.addAction(self.action_pity)
+        self.top_bar.addAction(self.action_simulator)
         self.top_bar.addAction(self.action_settings)
 
         spacer2 = QWidget()
@@ -211,27 +392,29 @@ class MainWindow(QWidget):
         self.stack.set_duration(250)
         main_layout.addWidget(self.stack)
 
-        # Pages
-        self.dashboard_tab = DashboardTab()
-        self.mercy_tab = MercyTrackerTab()
-        self.pity_tab = PityPage()
-        self.settings_tab = SettingsPage(self.settings, self.build_number)
-
-        self.stack.addWidget(self.dashboard_tab)   # index 0
-        self.stack.addWidget(self.mercy_tab)       # index 1
-        self.stack.addWidget(self.pity_tab)        # index 2
-        self.stack.addWidget(self.settings_tab)    # index 3
-
-        # Shared shard inventory
-        self.inventory = ShardInventory()
-        self.dashboard_tab.set_inventory(self.inventory)
-
-        # ⭐ FIX ADDED HERE ⭐
-        self.mercy_tab.set_inventory(self.inventory)
-
-        # Pity updates
-        self.mercy_tab.pity_updated.connect(self.pity_tab.update_pity)
-        self.mercy_tab.pity_updated.connect(self.dashboard_tab.update_pity)
+        # Pity, hits and inventory live in one app store; pages subscribe
+        # to the keys they render (logic/app_state.py)
+        self.store = get_app_store()
+        self.inventory = ShardInventory(Inventory(store=self.store))
+
+        # Pity comes from the pull log (shared with the hydra CLI)
+        with span("startup.sync_pity"):
+            sync_with_log(self.store, self.settings)
+
+        # Pages are created lazily: on first navigation, or shortly after
+        # the first paint while the app is idle
+        self.dashboard_tab = None
+        self.mercy_tab = None
+        self.pity_tab = None
+        self.simulator_tab = None
+        self.settings_tab = None
+
+        self.stack.page_built.connect(self._on_page_built)
+        self.stack.add_lazy_page(DashboardTab)                # index 0
+        self.stack.add_lazy_page(MercyTrackerTab)             # index 1
+        self.stack.add_lazy_page(PityPage)                    # index 2
+        self.stack.add_lazy_page(GachaSimulatorTab)           # index 3
+        self.stack.add_lazy_page(self._create_settings_page)  # index 4
 
         # Apply theme
         self.apply_theme(self.current_theme)
@@ -240,12 +423,59 @@ class MainWindow(QWidget):
         self.action_dashboard.triggered.connect(lambda: self.set_page(0))
         self.action_mercy.triggered.connect(lambda: self.set_page(1))
         self.action_pity.triggered.connect(lambda: self.set_page(2))
-        self.action_settings.triggered.connect(lambda: self.set_page(3))
+        self.action_simulator.triggered.connect(lambda: self.set_page(3))
+        self.action_settings.triggered.connect(lambda: self.set_page(4))
 
         self.action_theme_toggle.triggered.connect(self.toggle_theme)
 
         self.set_page(0, animate=False)
 
+        self._idle_build_started = False
+        self._shown_ns = None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._idle_build_started:
+            self._idle_build_started = True
+            self._shown_ns = get_tracer().now()
+            self.stack.build_pending_pages(IDLE_PAGE_BUILD_DELAY_MS)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._shown_ns is not None:
+            # show() -> first frame actually painted
+            tracer = get_tracer()
+            tracer.record("startup.first_paint", self._shown_ns)
+            if _main_started_ns is not None:
+                tracer.record("startup", _main_started_ns)
+            self._shown_ns = None
+
+    # ---------------- LAZY PAGE WIRING ----------------
+
+    def _create_settings_page(self) -> SettingsPage:
+        return SettingsPage(self.settings, self.build_number)
+
+    def _on_page_built(self, index: int, page: QWidget):
+        if index == 0:
+            self.dashboard_tab = page
+            page.set_inventory(self.inventory)
+            page.set_theme(self.current_theme)
+        elif index == 1:
+            self.mercy_tab = page
+            page.set_inventory(self.inventory)
+        elif index == 2:
+            self.pity_tab = page
+            page.set_theme(self.current_theme)
+        elif index == 3:
+            self.simulator_tab = page
+        elif index == 4:
+            self.settings_tab = page
+
+    def set_build_number(self, build_number: int):
+        self.build_number = build_number
+        if self.settings_tab is not None:
+            self.settings_tab.set_build_number(build_number)
+
     def set_page(self, index: int, animate: bool = True):
         if animate:
             self.stack.slide_to_index(index)
@@ -260,6 +490,7 @@ class MainWindow(QWidget):
             self.action_dashboard,
             self.action_mercy,
             self.action_pity,
+            self.action_simulator,
             self.action_settings,
         ]
 
@@ -284,7 +515,8 @@ class MainWindow(QWidget):
         self.apply_theme(self.current_theme)
         self.update_theme_icon()
 
-        self.settings_tab.refresh_theme_label()
+        if self.settings_tab is not None:
+            self.settings_tab.refresh_theme_label()
 
     def update_theme_icon(self):
         if self.current_theme == "dark":
@@ -293,93 +525,63 @@ class MainWindow(QWidget):
             self.action_theme_toggle.setText("Dark Mode")
 
     def apply_theme(self, theme: str):
-        if theme == "dark":
-            self.setStyleSheet(self.dark_stylesheet())
-        else:
-            self.setStyleSheet(self.light_stylesheet())
-
-        self.pity_tab.set_theme(theme)
-        self.dashboard_tab.set_theme(theme)
+        with span("apply_theme", theme=theme):
+            # One cached stylesheet for the whole window; pages only get tokens
+            self.setStyleSheet(theme_engine.stylesheet(theme))
 
-    def dark_stylesheet(self) -> str:
-        return """
-        QWidget {
-            background-color: #000000;
-            color: #f0f0f0;
-        }
-        QToolBar {
-            background-color: #0a0a0a;
-            border-bottom: 1px solid #222;
-        }
-        QToolButton {
-            padding: 6px 14px;
-            font-weight: bold;
-            border-radius: 10px;
-            background-color: #111;
-            border: 2px solid #222;
-            color: #f0f0f0;
-        }
-        QToolButton:hover {
-            border: 2px solid #66ff66;
-            background-color: #151515;
-            box-shadow: 0 0 8px #66ff66;
-        }
-        QToolButton[active="true"] {
-            border: 2px solid #99ff99;
-            background-color: #0d0d0d;
-            box-shadow: 0 0 12px #99ff99;
-        }
-        QToolButton:pressed {
-            background-color: #222;
-        }
-        """
+            if self.pity_tab is not None:
+                self.pity_tab.set_theme(theme)
+            if self.dashboard_tab is not None:
+                self.dashboard_tab.set_theme(theme)
 
-    def light_stylesheet(self) -> str:
-        return """
-        QWidget {
-            background-color: #f5f5f5;
-            color: #202020;
-        }
-        QToolBar {
-            background-color: #e0e0e0;
-            border-bottom: 1px solid #c0c0c0;
-        }
-        QToolButton {
-            padding: 6px 14px;
-            font-weight: bold;
-            border: 2px solid transparent;
-            border-radius: 10px;
-            background-color: transparent;
-        }
-        QToolButton:hover {
-            border: 2px solid #225522;
-            background-color: #f0f0f0;
-        }
-        QToolButton[active="true"] {
-            border: 2px solid #337733;
-            background-color: #dff5df;
-        }
-        QToolButton:pressed {
-            background-color: #cfcfcf;
-        }
-        """
 
 # ---------------------------------------------------------
 #   ENTRY POINT
 # ---------------------------------------------------------
 
+def _take_trace_flag(argv: list) -> list:
+    """Enable span timing for --trace / --trace=FILE and drop the flag."""
+    remaining = []
+    for arg in argv:
+        if arg == "--trace":
+            get_tracer().enable()
+        elif arg.startswith("--trace="):
+            get_tracer().enable(arg.split("=", 1)[1])
+        else:
+            remaining.append(arg)
+    return remaining
+
+
 def main():
-    build_number = update_build_if_needed()
-    app = QApplication(sys.argv)
+    global _main_started_ns
+    argv = _take_trace_flag(sys.argv)
+    _main_started_ns = get_tracer().now()
+
+    with span("startup.qapplication"):
+        app = QApplication(argv)
 
     icon_path = os.path.join("logos and assets", "logo.ico")
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
 
-    window = MainWindow(build_number)
+    with span("startup.main_window"):
+        window = MainWindow()
     window.showMaximized()
-    sys.exit(app.exec())
+
+    # Build number is resolved after the window is up
+    build_worker = BuildInfoWorker()
+    build_worker.build_ready.connect(window.set_build_number)
+    build_worker.start()
+
+    # Write any debounced settings before the process exits
+    app.aboutToQuit.connect(get_settings_store().close)
+
+    exit_code = app.exec()
+    build_worker.wait()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
+    # Simulator worker processes re-enter here in frozen builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -1,11 +1,18 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
 
+# Bake the build number into the bundle so the frozen app never walks sources
+sys.path.insert(0, SPECPATH)
+from logic.build_info import write_build_manifest, BUILD_MANIFEST_FILE
+
+write_build_manifest(os.path.join(SPECPATH, BUILD_MANIFEST_FILE))
 
 a = Analysis(
     ['app.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[(BUILD_MANIFEST_FILE, '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
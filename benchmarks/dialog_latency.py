@@ -0,0 +1,95 @@
+# -------------------------------------------------------------
+#  Prompt dialog open latency
+# -------------------------------------------------------------
+#
+# Compares opening the tracker prompts the old way (a new dialog and a
+# new Fusion style for every prompt) with the pooled dialogs that are
+# reset and reused. "Open" covers building or preparing the dialog,
+# show() and the event-loop turn that lays it out and polishes it.
+#
+#   QT_QPA_PLATFORM=offscreen python -m benchmarks.dialog_latency
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QStyleFactory, QWidget
+
+from ui.prompt_dialogs import HitPositionDialog, RarityPromptDialog
+
+
+RARITIES = ["Epic", "Legendary", "No Hit"]
+
+
+def _open_and_close(app, dialog):
+    dialog.show()
+    app.processEvents()
+    dialog.hide()
+
+
+def fresh_rarity(app, parent, i):
+    # Pre-pool behaviour: everything is rebuilt for every prompt
+    dialog = RarityPromptDialog(RARITIES, parent)
+    dialog.setStyle(QStyleFactory.create("Fusion"))
+    dialog.prepare(f"Hit at Position {i}", "Select the rarity:")
+    _open_and_close(app, dialog)
+    dialog.deleteLater()
+
+
+def fresh_positions(app, parent, i):
+    dialog = HitPositionDialog(parent)
+    dialog.setStyle(QStyleFactory.create("Fusion"))
+    dialog.prepare("Hits", "Select positions:", 1, 10)
+    _open_and_close(app, dialog)
+    dialog.deleteLater()
+
+
+def pooled(dialog, prepare):
+    def run(app, parent, i):
+        prepare(dialog, i)
+        _open_and_close(app, dialog)
+    return run
+
+
+def measure(app, parent, fn, runs: int) -> list[float]:
+    fn(app, parent, 0)  # warm-up
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(app, parent, i)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    app.processEvents()
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.dialog_latency")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    parent = QWidget()
+
+    rarity = RarityPromptDialog(RARITIES, parent)
+    positions = HitPositionDialog(parent)
+
+    cases = [
+        ("rarity prompt, fresh", fresh_rarity),
+        ("rarity prompt, pooled", pooled(rarity, lambda d, i: d.prepare(f"Hit at Position {i}", "Select the rarity:"))),
+        ("position prompt, fresh", fresh_positions),
+        ("position prompt, pooled", pooled(positions, lambda d, i: d.prepare("Hits", "Select positions:", 1, 10))),
+    ]
+
+    print(f"{'case':<26}{'median ms':>10}{'p95 ms':>10}")
+    for name, fn in cases:
+        samples = sorted(measure(app, parent, fn, args.runs))
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{name:<26}{statistics.median(samples):>10.3f}{p95:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,527 @@
+# -------------------------------------------------------------
+#  Benchmark suite
+# -------------------------------------------------------------
+#
+# Reproducible timings for the core computations and the offscreen UI
+# refresh paths, written as JSON and compared against a stored
+# baseline. Cases are compared on their best sample, which is far less
+# sensitive to scheduler and CPU-frequency noise than the median: a case
+# regresses when it is slower than the baseline by more than its
+# threshold (relative) and by more than its noise floor (absolute), and
+# the run then exits with 1. Medians and p95 are reported alongside.
+#
+# Runs against a temporary data directory and a separate settings scope,
+# so the real pull log, history and QSettings are never touched.
+# Baselines are machine-specific, so none is committed
+# (benchmarks/baseline.json is ignored by git): the first run on a
+# machine records one, and cases missing from it are added by the run
+# that first sees them. --save-baseline replaces the stored timings.
+#
+#   python -m benchmarks.suite
+#   python -m benchmarks.suite --json results.json
+#   python -m benchmarks.suite --save-baseline
+#   python -m benchmarks.suite --only theme.toggle window.construct
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6
+from PySide6.QtCore import QEvent, QEventLoop, QSettings, QTimer
+from PySide6.QtWidgets import QApplication, QWidget
+
+from logic import persistence
+from logic.app_state import build_store, chance_key, pity_key, primary_key
+from logic.paths import ORGANIZATION, APPLICATION
+from logic.build_info import collect_project_hashes
+from core.rules import HIGHEST_RARITY, MERCY_RULES, SHARDS, shard_from_display
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Allowed slowdown over the baseline before a case fails
+DEFAULT_THRESHOLD = 0.30
+THRESHOLDS = {
+    "hashes.cold": 0.50,        # disk-bound
+    "window.construct": 0.40,
+    "window.show": 0.50,
+    "idle.pulse_visible": 0.50,
+    "stack.prepare": 0.75,      # two full-page grabs
+}
+
+# Differences below this are timer noise, whatever the ratio
+NOISE_FLOOR_MS = 0.02
+NOISE_FLOORS = {
+    # Idle cases are CPU ms per wall-clock second
+    "idle.pulse_visible": 5.0,
+    "idle.pulse_hidden": 2.0,
+    "idle.minimized": 2.0,
+}
+
+# Synthetic source tree for collect_project_hashes
+TREE_DIRS = 20
+TREE_FILES_PER_DIR = 25
+TREE_FILE_BYTES = 4096
+
+
+# Settings scope used while benchmarking (the suite writes theme and pity)
+BENCH_APPLICATION = f"{APPLICATION} Benchmark"
+
+
+# ---------------------------------------------------------
+#   MEASUREMENT
+# ---------------------------------------------------------
+
+def measure(fn, runs: int, inner: int = 1, warmup: int = 1) -> list[float]:
+    """Milliseconds per call of fn(i), one sample per `inner` calls."""
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    for run in range(runs):
+        start = time.perf_counter()
+        for i in range(inner):
+            fn(run * inner + i)
+        samples.append((time.perf_counter() - start) * 1000.0 / inner)
+    return samples
+
+
+def summarize(samples: list[float], **extra) -> dict:
+    ordered = sorted(samples)
+    result = {
+        "median_ms": statistics.median(ordered),
+        "p95_ms": ordered[max(0, int(len(ordered) * 0.95) - 1)],
+        "min_ms": ordered[0],
+        "runs": len(ordered),
+    }
+    result.update(extra)
+    return result
+
+
+def flush_deletes(app):
+    app.processEvents()
+    QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+# ---------------------------------------------------------
+#   CASES
+# ---------------------------------------------------------
+
+def _write_tree(root: str):
+    payload = b"# synthetic\n" + b"x = 1\n" * (TREE_FILE_BYTES // 6)
+    for d in range(TREE_DIRS):
+        folder = os.path.join(root, f"pkg{d:02d}")
+        os.makedirs(folder)
+        for f in range(TREE_FILES_PER_DIR):
+            with open(os.path.join(folder, f"mod{f:02d}.py"), "wb") as out:
+                out.write(payload + str(f).encode())
+
+
+def bench_hashes(app, args) -> dict:
+    root = tempfile.mkdtemp(prefix="hydra-bench-tree-")
+    try:
+        _write_tree(root)
+        cache = {}
+        collect_project_hashes(root, cache)
+        files = TREE_DIRS * TREE_FILES_PER_DIR
+        return {
+            "hashes.cold": summarize(measure(lambda i: collect_project_hashes(root), args.runs), files=files),
+            "hashes.warm": summarize(measure(lambda i: collect_project_hashes(root, cache), args.runs), files=files),
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def set_top_pity(store, shard: str, value: int):
+    """Store write a tracker makes for a new top-rarity pity."""
+    key = pity_key(shard)
+    store.set(key, {**store.get(key), HIGHEST_RARITY[shard]: value})
+
+
+def bench_pity_page(app, args) -> dict:
+    from ui.pity import PityPage
+
+    page = PityPage()
+    page.resize(1000, 700)
+    page.show()
+    app.processEvents()
+
+    # Store write plus the derived chance, on a store nothing watches
+    store = build_store()
+
+    def chance(i):
+        shard = SHARDS[i % len(SHARDS)]
+        set_top_pity(store, shard, i % MERCY_RULES[shard]["hard"])
+        store.get(chance_key(shard))
+
+    def next_pity(banner: str) -> int:
+        # Always a change, so the store never skips the write
+        return (page._pulls(banner) + 1) % page.banners[banner]["hard"]
+
+    def render(i):
+        banner = page.current_banner
+        set_top_pity(page.store, shard_from_display(banner), next_pity(banner))
+        page._render_pity_curve(banner)
+        page.curve_widget.repaint()
+
+    def refresh(i):
+        # The per-pull path: store write -> subscription -> refresh_ui
+        banner = page.current_banner
+        set_top_pity(page.store, shard_from_display(banner), next_pity(banner))
+        app.processEvents()
+
+    # Curve rendering alone, without the page refreshing on each write
+    page.store.unsubscribe(page._on_pity_changed)
+    chance_samples = measure(chance, args.runs, inner=1000)
+    render_samples = measure(render, args.runs)
+    page.store.subscribe([primary_key(shard) for shard in SHARDS], page._on_pity_changed)
+
+    results = {
+        "pity.compute_chance": summarize(chance_samples),
+        "pity.render_curve": summarize(render_samples),
+        "pity.refresh_ui": summarize(measure(refresh, args.runs)),
+    }
+
+    page.close()
+    page.deleteLater()
+    flush_deletes(app)
+    return results
+
+
+def bench_inventory(app, args) -> dict:
+    from ui.shardinventory import ShardInventory
+
+    inventory = ShardInventory()
+    emissions = []
+    inventory.inventory_changed.connect(emissions.append)
+    keys = inventory.model.to_dict().keys()
+
+    def bulk(i):
+        with inventory.batch():
+            for n in range(args.bulk_size):
+                for key in keys:
+                    inventory.adjust(key, 1 if n % 2 else -1)
+        app.processEvents()
+
+    samples = measure(bulk, args.runs)
+    runs = args.runs + 1  # plus warm-up
+    return {
+        "inventory.bulk_update": summarize(
+            samples,
+            updates=args.bulk_size * len(keys),
+            emissions_per_batch=len(emissions) / runs,
+        ),
+    }
+
+
+def bench_window(app, args) -> dict:
+    import app as app_module
+
+    construct, show = [], []
+    for run in range(args.window_runs + 1):
+        start = time.perf_counter()
+        window = app_module.MainWindow()
+        built = time.perf_counter()
+        window.show()
+        app.processEvents()
+        shown = time.perf_counter()
+
+        if run:  # first run is warm-up (imports, caches)
+            construct.append((built - start) * 1000.0)
+            show.append((shown - built) * 1000.0)
+
+        # Build the idle pages now so their timers find nothing to do
+        for index in range(window.stack.count()):
+            window.stack.ensure_page(index)
+        window.close()
+        window.deleteLater()
+        flush_deletes(app)
+
+    return {
+        "window.construct": summarize(construct),
+        "window.show": summarize(show),
+    }
+
+
+def _stylesheet_chars(window) -> int:
+    """Stylesheet text held by the window and every widget in it."""
+    return len(window.styleSheet()) + sum(len(w.styleSheet()) for w in window.findChildren(QWidget))
+
+
+def bench_theme(app, args) -> dict:
+    import app as app_module
+
+    window = app_module.MainWindow()
+    for index in range(window.stack.count()):
+        window.stack.ensure_page(index)
+    window.show()
+    app.processEvents()
+
+    sheet_before = _stylesheet_chars(window)
+
+    def toggle(i):
+        window.toggle_theme()
+        app.processEvents()
+
+    samples = measure(toggle, args.toggles, warmup=2)
+    growth = _stylesheet_chars(window) - sheet_before
+
+    window.close()
+    window.deleteLater()
+    flush_deletes(app)
+
+    return {
+        "theme.toggle": summarize(samples, toggles=args.toggles, stylesheet_growth=growth),
+    }
+
+
+def bench_stack(app, args) -> dict:
+    """Page slides: snapshot cost before a slide and paint time per frame."""
+    import app as app_module
+
+    window = app_module.MainWindow()
+    for index in range(window.stack.count()):
+        window.stack.ensure_page(index)
+    window.resize(1200, 800)
+    window.show()
+    app.processEvents()
+
+    stack = window.stack
+    prepare, paint, gaps, frames = [], [], [], []
+    for run in range(args.slides + 1):
+        target = (stack.currentIndex() + 1 + run % 2) % stack.count()
+        window.set_page(target)
+        while stack._is_animating:
+            app.processEvents(QEventLoop.WaitForMoreEvents)
+        stats = stack.last_transition
+        if run and stats:  # first slide is warm-up
+            prepare.append(stats["prepare_ms"])
+            paint.append(stats["mean_paint_ms"])
+            gaps.append(stats["max_frame_gap_ms"])
+            frames.append(stats["frames"])
+
+    window.close()
+    window.deleteLater()
+    flush_deletes(app)
+
+    return {
+        "stack.prepare": summarize(prepare),
+        "stack.frame_paint": summarize(
+            paint,
+            frames_median=statistics.median(frames),
+            max_frame_gap_ms=max(gaps),
+        ),
+    }
+
+
+def _idle_cpu(seconds: float) -> float:
+    """Process CPU milliseconds per wall-clock second of event loop."""
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    start = time.process_time()
+    loop.exec()
+    return (time.process_time() - start) * 1000.0 / seconds
+
+
+def bench_idle(app, args) -> dict:
+    """
+    CPU used by a window nobody touches, with the Pity page glowing at
+    hard pity: on screen, hidden behind another page and minimised.
+    """
+    import app as app_module
+
+    window = app_module.MainWindow()
+    for index in range(window.stack.count()):
+        window.stack.ensure_page(index)
+    window.show()
+    window.set_page(2, animate=False)
+
+    page = window.pity_tab
+    shard = shard_from_display(page.current_banner)
+    set_top_pity(page.store, shard, MERCY_RULES[shard]["hard"])
+    app.processEvents()
+
+    def sample():
+        return [_idle_cpu(args.idle_seconds) for _ in range(args.idle_runs)]
+
+    results = {"idle.pulse_visible": summarize(sample(), unit="cpu ms/s")}
+
+    window.set_page(0, animate=False)
+    app.processEvents()
+    results["idle.pulse_hidden"] = summarize(sample(), unit="cpu ms/s")
+
+    window.set_page(2, animate=False)
+    window.showMinimized()
+    app.processEvents()
+    results["idle.minimized"] = summarize(sample(), unit="cpu ms/s")
+
+    window.close()
+    window.deleteLater()
+    flush_deletes(app)
+    return results
+
+
+CASES = (
+    ("hashes", bench_hashes),
+    ("pity", bench_pity_page),
+    ("inventory", bench_inventory),
+    ("window", bench_window),
+    ("theme", bench_theme),
+    ("stack", bench_stack),
+    ("idle", bench_idle),
+)
+
+
+# ---------------------------------------------------------
+#   BASELINE
+# ---------------------------------------------------------
+
+def make_baseline(results: dict) -> dict:
+    return {
+        name: {
+            "min_ms": round(result["min_ms"], 6),
+            "median_ms": round(result["median_ms"], 6),
+            "threshold": THRESHOLDS.get(name, DEFAULT_THRESHOLD),
+            "floor": NOISE_FLOORS.get(name, NOISE_FLOOR_MS),
+        }
+        for name, result in results.items()
+    }
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """Annotate results with baseline deltas; returns {name: reason} for failures."""
+    failures = {}
+    for name, result in results.items():
+        # Stylesheets must not grow however fast the toggle is
+        if result.get("stylesheet_growth"):
+            failures[name] = f"stylesheet grew by {result['stylesheet_growth']} chars"
+        if result.get("emissions_per_batch", 1) > 1:
+            failures[name] = f"{result['emissions_per_batch']:.1f} signals per batch"
+
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        base = reference["min_ms"]
+        best = result["min_ms"]
+        threshold = reference.get("threshold", THRESHOLDS.get(name, DEFAULT_THRESHOLD))
+        floor = reference.get("floor", NOISE_FLOORS.get(name, NOISE_FLOOR_MS))
+        result["baseline_ms"] = base
+        result["change"] = (best - base) / base if base else 0.0
+
+        if best > base * (1.0 + threshold) and best - base > floor:
+            failures[name] = f"{result['change'] * 100:+.0f}% over baseline (limit +{threshold * 100:.0f}%)"
+    return failures
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path: str, meta: dict, results: dict):
+    """Store results in the baseline, keeping cases this run did not time."""
+    stored = load_baseline(path)
+    stored.update(make_baseline(results))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": stored}, f, indent=2)
+        f.write("\n")
+
+
+# ---------------------------------------------------------
+#   ENTRY POINT
+# ---------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--runs", type=int, default=30, help="samples per case")
+    parser.add_argument("--window-runs", type=int, default=8, help="MainWindow constructions")
+    parser.add_argument("--toggles", type=int, default=20, help="theme toggles")
+    parser.add_argument("--slides", type=int, default=10, help="page slides")
+    parser.add_argument("--idle-seconds", type=float, default=0.5, help="length of one idle sample")
+    parser.add_argument("--idle-runs", type=int, default=4, help="idle samples per state")
+    parser.add_argument("--bulk-size", type=int, default=250, help="adjustments per shard per batch")
+    parser.add_argument("--only", nargs="+", metavar="CASE", help="case names or groups to run")
+    parser.add_argument("--json", metavar="FILE", help="write results as JSON ('-' for stdout)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    # Fresh, throwaway data directory and settings scope for every run
+    data_dir = tempfile.mkdtemp(prefix="hydra-bench-")
+    os.environ["HYDRA_DATA_DIR"] = data_dir
+    persistence.APPLICATION = BENCH_APPLICATION
+    QSettings(ORGANIZATION, BENCH_APPLICATION).clear()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    results = {}
+    try:
+        for group, bench in CASES:
+            if args.only and not any(o == group or o.startswith(group + ".") for o in args.only):
+                continue
+            for name, result in bench(app, args).items():
+                if not args.only or group in args.only or name in args.only:
+                    results[name] = result
+    finally:
+        persistence.get_settings_store().close()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+    failures = compare(results, baseline)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pyside": PySide6.__version__,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+        "regressions": failures,
+    }
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"{'case':<24}{'median ms':>11}{'p95 ms':>10}{'best ms':>10}{'baseline':>10}{'change':>9}")
+        for name, result in results.items():
+            base = f"{result['baseline_ms']:.3f}" if "baseline_ms" in result else "-"
+            change = f"{result['change'] * 100:+.0f}%" if "change" in result else "-"
+            flag = "  REGRESSION" if name in failures else ""
+            print(
+                f"{name:<24}{result['median_ms']:>11.4f}{result['p95_ms']:>10.4f}"
+                f"{result['min_ms']:>10.4f}{base:>10}{change:>9}{flag}"
+            )
+        for name, reason in failures.items():
+            print(f"{name}: {reason}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, report["meta"], results)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    # Nothing to compare against yet: this run is the reference from now on
+    unmeasured = {name: result for name, result in results.items() if name not in baseline}
+    if unmeasured:
+        save_baseline(args.baseline, report["meta"], unmeasured)
+        print(f"Recorded {len(unmeasured)} new case(s) in {args.baseline}", file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
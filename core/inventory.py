@@ -0,0 +1,111 @@
+# -------------------------------------------------------------
+#  Shard inventory model (Qt-free)
+# -------------------------------------------------------------
+#
+# The shard counts and their update rules (never below 0, unknown keys
+# ignored). Counts live in a core.store.Store under "inventory/<key>",
+# so they can share the app store (and its batches) with pity and hits.
+# Listeners are plain callables taking the counts dict; ShardInventory
+# (ui/shardinventory.py) adds the Qt signal and the per-event-loop-turn
+# coalescing on top.
+
+from contextlib import contextmanager
+
+from core.store import Store
+
+
+SHARD_KEYS = ("ancient", "void", "primal", "sacred")
+
+
+def inventory_key(shard_type: str) -> str:
+    """Store key holding one shard count."""
+    return f"inventory/{shard_type}"
+
+
+class Inventory:
+    def __init__(self, counts: dict | None = None, store: Store | None = None):
+        self.store = store if store is not None else Store()
+        self._keys = {key: inventory_key(key) for key in SHARD_KEYS}
+        self._listeners = {}
+
+        with self.store.batch():
+            for key in self._keys.values():
+                if key not in self.store:
+                    self.store.set(key, 0)
+            if counts:
+                self._set_all(counts)
+
+    # -----------------------------
+    #   LISTENERS
+    # -----------------------------
+    def subscribe(self, callback):
+        """Call callback(counts) after every committed change."""
+        def on_change(_changes):
+            callback(self.to_dict())
+
+        self._listeners[callback] = on_change
+        self.store.subscribe(self._keys.values(), on_change)
+
+    def unsubscribe(self, callback):
+        on_change = self._listeners.pop(callback, None)
+        if on_change is not None:
+            self.store.unsubscribe(on_change)
+
+    # -----------------------------
+    #   READS
+    # -----------------------------
+    def get(self, shard_type: str) -> int:
+        key = self._keys.get(shard_type)
+        return self.store.get(key, 0) if key else 0
+
+    def can_afford(self, shard_type: str, pulls: int) -> bool:
+        return pulls <= self.get(shard_type)
+
+    def to_dict(self) -> dict:
+        return {shard_type: self.get(shard_type) for shard_type in SHARD_KEYS}
+
+    @property
+    def in_batch(self) -> bool:
+        return self.store.in_batch
+
+    # -----------------------------
+    #   UPDATES
+    # -----------------------------
+    def adjust(self, shard_type: str, delta: int):
+        """Change a shard count by delta in one step (never below 0)."""
+        key = self._keys.get(shard_type)
+        if key is None or not delta:
+            return
+        self.store.set(key, max(0, self.store.get(key, 0) + int(delta)))
+
+    def apply_deltas(self, deltas: dict):
+        """Apply several shard deltas at once, e.g. {"ancient": -10, "void": 3}."""
+        with self.batch():
+            for shard_type, delta in deltas.items():
+                self.adjust(shard_type, delta)
+
+    def set_value(self, shard_type: str, value: int):
+        """Directly set a shard count."""
+        if shard_type in self._keys:
+            self.store.set(self._keys[shard_type], max(0, int(value)))
+
+    def reset(self):
+        """Reset all shard counts to zero."""
+        self._set_all({})
+
+    def load_from_dict(self, data: dict):
+        self._set_all(data)
+
+    def _set_all(self, data: dict):
+        self.store.update({
+            key: int(data.get(shard_type, 0)) for shard_type, key in self._keys.items()
+        })
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several updates into one notification, sent when the
+        outermost batch commits. If the block raises, counts are rolled back.
+        """
+        with self.store.batch():
+            yield self
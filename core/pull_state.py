@@ -0,0 +1,198 @@
+# -------------------------------------------------------------
+#  Pull state machine (Qt-free)
+# -------------------------------------------------------------
+#
+# Pity counters for one shard and the transition every kind of pull
+# applies to them:
+#
+#   single     one shard; a hit resets its rarity and every lower one
+#   ten        ten shards; each rarity restarts after its last hit
+#   custom     any number of shards, same rule as ten
+#   reset      every counter back to 0 (user reset)
+#   hard_pity  top rarity recorded at hard pity; every counter back to 0
+#   set        counters corrected by hand; no shards are consumed
+#
+# Hits are (position, rarity) pairs with 1-based positions inside the
+# pull; a set event reuses them as (new pity, rarity). The tracker
+# widgets, the pull log fold and the CLI all drive pity through
+# apply_pull, so they cannot drift apart.
+
+import re
+from itertools import groupby
+from operator import itemgetter
+
+from core.rules import HIGHEST_RARITY, SUPPORTED_RARITIES, chance, rarity_rank, rules_for
+
+
+KINDS = ("single", "ten", "custom", "reset", "hard_pity", "set")
+
+# Shards consumed by each fixed-size pull
+PULL_SIZES = {"single": 1, "ten": 10}
+
+# "17 L", "23: legendary", "145-M", "9=epic"
+_PASTE_ENTRY = re.compile(r"(\d+)\s*[:=\-]?\s*([A-Za-z]+)")
+
+
+def parse_hits(text: str, count: int, rarities) -> tuple[dict, list[str]]:
+    """
+    Read "position rarity" pairs from free text. Rarities match by
+    prefix (case-insensitive). Returns ({position: rarity}, problems).
+    """
+    hits = {}
+    problems = []
+
+    for match in _PASTE_ENTRY.finditer(text):
+        pos = int(match.group(1))
+        word = match.group(2).lower()
+        rarity = next((r for r in rarities if r.lower().startswith(word)), None)
+
+        if rarity is None:
+            problems.append(f"{match.group(0).strip()}: unknown rarity")
+        elif not 1 <= pos <= count:
+            problems.append(f"{match.group(0).strip()}: position out of range")
+        else:
+            hits[pos] = rarity
+
+    leftover = _PASTE_ENTRY.sub("", text).strip(" \t\r\n,;")
+    if leftover:
+        problems.append(f"not understood: {leftover[:40]}")
+
+    return hits, problems
+
+
+def apply_pull(pity: dict, kind: str, count: int, hits=()) -> dict:
+    """
+    Apply one pull to a {rarity: pity} dict in place and return it.
+    Hits of rarities the dict does not track reset nothing.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"unknown pull kind: {kind}")
+
+    if kind in ("reset", "hard_pity"):
+        for r in pity:
+            pity[r] = 0
+        return pity
+
+    if kind == "set":
+        for value, rarity in hits:
+            if rarity in pity:
+                pity[rarity] = max(0, int(value))
+        return pity
+
+    hits = list(hits)
+    if not hits:
+        for r in pity:
+            pity[r] += count
+        return pity
+
+    if kind == "single":
+        rarity = hits[0][1]
+        if rarity not in pity:
+            return pity
+        rank = rarity_rank(rarity)
+        for r in pity:
+            if rarity_rank(r) <= rank:
+                pity[r] = 0
+        return pity
+
+    latest = {}
+    for pos, rarity in hits:
+        if pos > latest.get(rarity, 0):
+            latest[rarity] = pos
+    for r in pity:
+        if r in latest:
+            pity[r] = count - latest[r]
+        else:
+            pity[r] += count
+    return pity
+
+
+def hit_pities(pity: dict, hits) -> list[tuple[int, str, int]]:
+    """
+    (position, rarity, pity at the hit) for one pull's hits, in position
+    order, given the {rarity: pity} before the pull. The pull is replayed
+    through apply_pull one hit at a time, so an earlier hit in the same
+    pull restarts the count exactly as it does for the counters.
+    """
+    running = dict(pity)
+    done = 0
+    landed = []
+    for pos, group in groupby(sorted((int(p), r) for p, r in hits), key=itemgetter(0)):
+        rarities = [r for _, r in group]
+        step = pos - done
+        landed.extend((pos, r, running.get(r, 0) + step) for r in rarities)
+        apply_pull(running, "custom", step, [(step, r) for r in rarities])
+        done = pos
+    return landed
+
+
+def set_hits(pity: dict) -> list[tuple[int, str]]:
+    """Hits list of a set event for {rarity: new pity}."""
+    return [(int(value), rarity) for rarity, value in pity.items()]
+
+
+class PullState:
+    """Pity counters for one shard."""
+
+    def __init__(self, shard: str, pity: dict | None = None):
+        self.shard = shard
+        self.rarities = SUPPORTED_RARITIES[shard]
+        self.top_rarity = HIGHEST_RARITY[shard]
+        self.pity = {r: 0 for r in self.rarities}
+        if pity:
+            self.load(pity)
+
+    # -----------------------------
+    #   TRANSITIONS
+    # -----------------------------
+    def apply(self, kind: str, count: int | None = None, hits=()) -> dict:
+        """Apply a pull and return the new counters."""
+        if count is None:
+            count = PULL_SIZES.get(kind, 0)
+        return apply_pull(self.pity, kind, int(count), hits)
+
+    def preview(self, kind: str, count: int | None = None, hits=()) -> dict:
+        """Counters a pull would lead to, leaving this state untouched."""
+        if count is None:
+            count = PULL_SIZES.get(kind, 0)
+        return apply_pull(dict(self.pity), kind, int(count), hits)
+
+    def single(self, rarity: str | None = None) -> dict:
+        """One shard; rarity None (or "No Hit") for no hit."""
+        hits = [(1, rarity)] if rarity in self.pity else []
+        return self.apply("single", 1, hits)
+
+    def reset(self) -> dict:
+        return self.apply("reset", 0)
+
+    def record_hard_pity(self) -> dict:
+        return self.apply("hard_pity", 0, [(0, self.top_rarity)])
+
+    def correct(self, pity: dict) -> dict:
+        """Set counters by hand, e.g. {"Legendary": 120}."""
+        return self.apply("set", 0, set_hits(pity))
+
+    def load(self, pity: dict):
+        """Replace counters (unknown rarities are ignored, negatives clamp to 0)."""
+        for r, value in pity.items():
+            if r in self.pity:
+                self.pity[r] = max(0, int(value))
+
+    # -----------------------------
+    #   DERIVED VALUES
+    # -----------------------------
+    @property
+    def primary(self) -> int:
+        """Pity of the shard's top rarity."""
+        return self.pity[self.top_rarity]
+
+    def chance(self, rarity: str | None = None) -> float:
+        """% chance of a rarity (default: the top one) on the next pull."""
+        rarity = rarity or self.top_rarity
+        return chance(self.shard, self.pity[rarity], rarity)
+
+    def at_hard_pity(self) -> bool:
+        return self.primary >= rules_for(self.shard)["hard"]
+
+    def to_dict(self) -> dict:
+        return dict(self.pity)
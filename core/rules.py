@@ -0,0 +1,156 @@
+# -------------------------------------------------------------
+#  Shard and mercy rules (Qt-free)
+# -------------------------------------------------------------
+#
+# The one table of shard facts the rest of the app builds on: which
+# rarities each shard tracks, the mercy rules for each of them, the
+# inventory key and display name. Plain data and arithmetic only, so
+# CLIs, benchmarks and worker processes can import it without Qt or
+# NumPy. The compiled per-pity tables live in logic/mercy.py.
+
+SHARDS = ("Ancient", "Void", "Primal", "Sacred")
+
+# Lowest rarity first; a hit resets the pity of every lower rarity
+RARITIES = ("Epic", "Legendary", "Mythical")
+
+NO_HIT = "No Hit"
+
+
+# -------------------------------------------------------------
+#  Mercy rules for each shard type
+# -------------------------------------------------------------
+MERCY_RULES = {
+    "Ancient": {
+        "base": 0.5,
+        "soft": 200,
+        "inc": 5.0,
+        "hard": 219,
+        "rarity": "Legendary",
+    },
+    "Void": {
+        "base": 0.5,
+        "soft": 200,
+        "inc": 5.0,
+        "hard": 219,
+        "rarity": "Legendary",
+    },
+    "Sacred": {
+        "base": 6.0,
+        "soft": 12,
+        "inc": 2.0,
+        "hard": 59,
+        "rarity": "Legendary",
+    },
+    "Primal": {
+        "base": 0.1,
+        "soft": 200,
+        "inc": 10.0,
+        "hard": 210,
+        "rarity": "Mythical",
+    },
+}
+
+# Highest rarity per shard
+HIGHEST_RARITY = {shard: rules["rarity"] for shard, rules in MERCY_RULES.items()}
+
+# Mercy for the lower rarity a shard also tracks. A hit of the top rarity
+# resets this pity too (Legendary resets Epic, Mythical resets Legendary).
+LINKED_RULES = {
+    "Ancient": {
+        "base": 8.0,
+        "soft": 20,
+        "inc": 2.0,
+        "hard": 66,
+        "rarity": "Epic",
+    },
+    "Void": {
+        "base": 8.0,
+        "soft": 20,
+        "inc": 2.0,
+        "hard": 66,
+        "rarity": "Epic",
+    },
+    "Primal": {
+        "base": 1.0,
+        "soft": 75,
+        "inc": 1.0,
+        "hard": 174,
+        "rarity": "Legendary",
+    },
+}
+
+# Rarities each shard tracks pity for, lowest first
+SUPPORTED_RARITIES = {
+    shard: tuple(
+        rules["rarity"] for rules in (LINKED_RULES.get(shard), MERCY_RULES[shard]) if rules is not None
+    )
+    for shard in SHARDS
+}
+
+# Inventory keys (see core/inventory.py) and display names per shard
+INVENTORY_KEYS = {shard: shard.lower() for shard in SHARDS}
+DISPLAY_NAMES = {shard: f"{shard} Shards" for shard in SHARDS}
+
+
+def shard_from_display(name: str) -> str:
+    """Shard name for a display name such as "Ancient Shards"."""
+    return name.replace(" Shards", "")
+
+
+def rarity_rank(rarity: str) -> int:
+    return RARITIES.index(rarity)
+
+
+def rules_for(shard: str, rarity: str | None = None) -> dict:
+    """
+    Mercy rules for a shard's top rarity, or for the linked rarity when
+    it is passed. Raises KeyError if the shard has no mercy for it.
+    """
+    rules = MERCY_RULES[shard]
+    if rarity is not None and rarity != rules["rarity"]:
+        rules = LINKED_RULES.get(shard)
+        if rules is None or rules["rarity"] != rarity:
+            raise KeyError(f"{shard} shards have no mercy for {rarity}")
+    return rules
+
+
+def chance_formula(pulls: int, base: float, soft: int, inc: float, hard: int) -> float:
+    """Reference formula for the % chance at a given pity."""
+    if pulls <= soft:
+        chance = base
+    else:
+        extra = min(pulls, hard) - soft
+        chance = base + extra * inc
+
+    if pulls >= hard:
+        chance = 100.0
+
+    return max(0.0, min(chance, 100.0))
+
+
+def chance(shard: str, pity: int, rarity: str | None = None) -> float:
+    """% chance of a rarity (default: the top one) on the next pull."""
+    rules = rules_for(shard, rarity)
+    return chance_formula(pity, rules["base"], rules["soft"], rules["inc"], rules["hard"])
+
+
+# -------------------------------------------------------------
+#  Tracking sanity checks
+# -------------------------------------------------------------
+def tracking_problem(shard: str, current_pity: int, hard_pity: int, current_chance: float) -> str | None:
+    """
+    Explain why the tracked pity cannot be right (past hard pity, or a
+    chance above 100%), or return None when it looks consistent.
+    """
+    highest_rarity = HIGHEST_RARITY.get(shard, "Unknown")
+
+    if current_pity > hard_pity:
+        return (
+            f"You have surpassed the Hard Pity Level for {highest_rarity} "
+            f"on the {shard} shard."
+        )
+
+    if current_chance > 100:
+        return f"Your {highest_rarity} chance for the {shard} shard has exceeded 100%."
+
+    return None
@@ -0,0 +1,184 @@
+# -------------------------------------------------------------
+#  Observable state store (Qt-free)
+# -------------------------------------------------------------
+#
+# One keyed store for the state several views render (pity, hits,
+# inventory). Views subscribe to the keys they show and get one call
+# per committed change, with only the keys that changed.
+#
+# - set() ignores writes of an equal value, so nothing downstream runs.
+# - batch() groups writes into one commit (rolled back if the block
+#   raises), so a pull that touches pity, hits and inventory notifies
+#   each subscriber once.
+# - derive() declares a value computed from other keys (chance, ETA).
+#   It is computed once per change, on first read, and shared by every
+#   reader; subscribers of a derived key are only called when its value
+#   actually changed.
+#
+# Values are treated as immutable: store a new dict instead of
+# mutating the one that is in the store.
+
+from contextlib import contextmanager
+
+
+_MISSING = object()
+
+
+class _Subscription:
+    __slots__ = ("keys", "callback")
+
+    def __init__(self, keys, callback):
+        self.keys = keys
+        self.callback = callback
+
+
+class Store:
+    def __init__(self, values: dict | None = None):
+        self._values = dict(values or {})
+
+        # key -> (dependency keys, fn)
+        self._derived = {}
+        # key -> derived keys that read it
+        self._dependents = {}
+        # Derived values computed since their last invalidation
+        self._cache = {}
+
+        self._subscriptions = []
+        self._by_key = {}
+
+        # Written keys and invalidated derived keys (with the value
+        # subscribers last saw) waiting for the commit
+        self._pending = {}
+        self._stale = {}
+        self._batch_depth = 0
+
+    # -----------------------------
+    #   READS
+    # -----------------------------
+    def get(self, key: str, default=None):
+        value = self._values.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if key not in self._derived:
+            return default
+
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            deps, fn = self._derived[key]
+            value = self._cache[key] = fn(*(self.get(dep) for dep in deps))
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values or key in self._derived
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    # -----------------------------
+    #   WRITES
+    # -----------------------------
+    def set(self, key: str, value):
+        if key in self._derived:
+            raise KeyError(f"{key!r} is derived and cannot be set")
+        if self._values.get(key, _MISSING) == value:
+            return
+        self._values[key] = value
+        self._pending[key] = None
+        if key in self._dependents:
+            self._invalidate(key)
+
+        if self._batch_depth == 0:
+            self._commit()
+
+    def update(self, values: dict):
+        """Set several keys in one commit."""
+        with self.batch():
+            for key, value in values.items():
+                self.set(key, value)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group writes into one commit, made when the outermost batch ends.
+        If the block raises, the written values are rolled back.
+        """
+        snapshot = (dict(self._values), dict(self._pending), dict(self._stale))
+        self._batch_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._values, self._pending, self._stale = snapshot
+            # Derived values may have been read mid-batch
+            self._cache.clear()
+            raise
+        finally:
+            self._batch_depth -= 1
+
+        if self._batch_depth == 0 and self._pending:
+            self._commit()
+
+    # -----------------------------
+    #   DERIVED VALUES
+    # -----------------------------
+    def derive(self, key: str, deps, fn):
+        """Make key = fn(*values of deps), recomputed when a dependency changes."""
+        deps = tuple(deps)
+        self._derived[key] = (deps, fn)
+        self._cache.pop(key, None)
+        for dep in deps:
+            self._dependents.setdefault(dep, []).append(key)
+
+    def _invalidate(self, key: str):
+        stack = [key]
+        while stack:
+            for dependent in self._dependents.get(stack.pop(), ()):
+                before = self._cache.pop(dependent, _MISSING)
+                # Keep the value from before the first change in this commit
+                self._stale.setdefault(dependent, before)
+                stack.append(dependent)
+
+    # -----------------------------
+    #   SUBSCRIPTIONS
+    # -----------------------------
+    def subscribe(self, keys, callback):
+        """
+        Call callback(changes) after each commit that changed any of keys
+        (one key or an iterable); changes is {key: new value} for those
+        keys only.
+        """
+        keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        subscription = _Subscription(keys, callback)
+        self._subscriptions.append(subscription)
+        for key in keys:
+            self._by_key.setdefault(key, []).append(subscription)
+
+    def unsubscribe(self, callback):
+        for subscription in [s for s in self._subscriptions if s.callback == callback]:
+            self._subscriptions.remove(subscription)
+            for key in subscription.keys:
+                self._by_key[key].remove(subscription)
+
+    def _commit(self):
+        written, self._pending = self._pending, {}
+        stale, self._stale = self._stale, {}
+
+        changes = {key: self._values.get(key) for key in written}
+        for key, before in stale.items():
+            # Nobody watches it: leave it to be computed on the next read
+            if not self._by_key.get(key):
+                continue
+            value = self.get(key)
+            if before is _MISSING or value != before:
+                changes[key] = value
+
+        notify = {}
+        for key, value in changes.items():
+            for subscription in self._by_key.get(key, ()):
+                notify.setdefault(subscription, {})[key] = value
+
+        # Registration order, so views that subscribed first update first
+        for subscription in self._subscriptions[:]:
+            # Skips subscribers removed by an earlier callback
+            if subscription in notify and subscription in self._subscriptions:
+                subscription.callback(notify[subscription])
@@ -0,0 +1,366 @@
+# -------------------------------------------------------------
+#  hydra: headless command line for Hydra Companion
+# -------------------------------------------------------------
+#
+# Batch bookkeeping without the GUI. Everything here runs on the
+# Qt-free core (core/) and the data-directory stores the app uses: the
+# pull log is the source of truth for pity and the history database is
+# kept in step with it. Both are safe to use while the app is open.
+#
+#   python hydra.py pity
+#   python hydra.py record Ancient ten --hits "3 E, 9 L"
+#   python hydra.py record Sacred custom --count 40
+#   python hydra.py set Primal 120
+#   python hydra.py forecast Ancient --within 30
+#   python hydra.py simulate Void 200 --trials 100000
+#   python hydra.py export pulls.csv
+#   python hydra.py --data-dir ~/raid/alt-account import pulls.jsonl
+#
+# Heavy modules (sqlite history, NumPy) are only imported by the
+# commands that need them, so a pity lookup starts in well under 100 ms.
+
+import os
+import sys
+import json
+import time
+import argparse
+
+from core.rules import HIGHEST_RARITY, SHARDS, SUPPORTED_RARITIES, chance, rules_for, tracking_problem
+from core.pull_state import KINDS, PULL_SIZES, PullState, apply_pull, parse_hits, set_hits
+from logic.paths import DATA_DIR_ENV
+
+
+# Kinds `record` accepts; reset / set / hard_pity have their own commands
+RECORD_KINDS = ("single", "ten", "custom")
+
+EXPORT_FIELDS = ("timestamp", "shard", "kind", "count", "hits")
+
+
+def _shard(name: str) -> str:
+    """Case-insensitive shard name, also accepting "ancient shards"."""
+    key = name.lower().replace(" shards", "")
+    for shard in SHARDS:
+        if shard.lower() == key:
+            return shard
+    raise argparse.ArgumentTypeError(f"unknown shard: {name} (choose from {', '.join(SHARDS)})")
+
+
+def _log():
+    from logic.pull_log import get_pull_log
+    return get_pull_log()
+
+
+def _record(events) -> dict:
+    """
+    Append (shard, kind, count, hits, timestamp) events to the pull log
+    and the history database. The log lock is held throughout, so the
+    pity each hit landed at cannot be changed by the app in between.
+    Returns the new pity per shard.
+    """
+    from logic.history_store import get_history
+
+    log = _log()
+    history = get_history()  # backfills from the log if the database is new
+
+    now = time.time()
+    events = [(shard, kind, count, hits, now if ts is None else ts) for shard, kind, count, hits, ts in events]
+
+    with log.locked():
+        pity = {shard: dict(p) for shard, p in log.refresh().pity.items()}
+
+        rows = []
+        for shard, kind, count, hits, ts in events:
+            before = dict(pity[shard])
+            apply_pull(pity[shard], kind, count, hits)
+            history_hits = () if kind == "set" else hits
+            rows.append((shard, kind, count, history_hits, before, ts))
+
+        log.append_many(events)
+        history.record_many(rows)
+
+    return pity
+
+
+def _print_pity(shard: str, pity: dict):
+    state = PullState(shard, pity)
+    parts = ", ".join(f"{r} {v}" for r, v in state.pity.items())
+    print(f"{shard}: {parts} ({state.chance():.1f}% {state.top_rarity})")
+
+    rules = rules_for(shard)
+    problem = tracking_problem(shard, state.primary, rules["hard"], state.chance())
+    if problem:
+        print(f"  warning: {problem}", file=sys.stderr)
+    elif state.at_hard_pity():
+        print(f"  hard pity reached: the next {state.top_rarity} is guaranteed", file=sys.stderr)
+
+
+# -------------------------------------------------------------
+#  Commands
+# -------------------------------------------------------------
+def cmd_pity(args):
+    state = _log().refresh()
+    shards = [args.shard] if args.shard else SHARDS
+
+    if args.json:
+        out = {
+            shard: {
+                rarity: {"pity": value, "chance": chance(shard, value, rarity), "hard": rules_for(shard, rarity)["hard"]}
+                for rarity, value in state.pity[shard].items()
+            }
+            for shard in shards
+        }
+        print(json.dumps(out, indent=4))
+        return
+
+    print(f"{'shard':<9}{'rarity':<11}{'pity':>6}{'chance':>9}{'hard':>6}")
+    for shard in shards:
+        for rarity, value in state.pity[shard].items():
+            hard = rules_for(shard, rarity)["hard"]
+            print(f"{shard:<9}{rarity:<11}{value:>6}{chance(shard, value, rarity):>8.1f}%{hard:>6}")
+
+
+def cmd_record(args):
+    count = PULL_SIZES.get(args.kind, args.count)
+    if count is None or count <= 0:
+        raise SystemExit("record: custom pulls need --count N")
+
+    hits = []
+    if args.hits:
+        text = args.hits
+        if args.kind == "single" and not any(c.isdigit() for c in text):
+            text = f"1 {text}"  # "record Ancient single --hits L"
+        parsed, problems = parse_hits(text, count, SUPPORTED_RARITIES[args.shard])
+        if problems:
+            raise SystemExit("record: " + "; ".join(problems))
+        hits = sorted(parsed.items())
+        if args.kind == "single" and len(hits) > 1:
+            raise SystemExit("record: a single pull has one position")
+
+    pity = _record([(args.shard, args.kind, count, hits, None)])
+    _print_pity(args.shard, pity[args.shard])
+
+
+def cmd_reset(args):
+    pity = _record([(args.shard, "reset", 0, [], None)])
+    _print_pity(args.shard, pity[args.shard])
+
+
+def cmd_hard_pity(args):
+    pity = _record([(args.shard, "hard_pity", 0, [(0, HIGHEST_RARITY[args.shard])], None)])
+    _print_pity(args.shard, pity[args.shard])
+
+
+def cmd_set(args):
+    rarity = args.rarity or HIGHEST_RARITY[args.shard]
+    if rarity not in SUPPORTED_RARITIES[args.shard]:
+        raise SystemExit(f"set: {args.shard} shards do not track {rarity}")
+
+    pity = _record([(args.shard, "set", 0, set_hits({rarity: args.pity}), None)])
+    _print_pity(args.shard, pity[args.shard])
+
+
+def cmd_forecast(args):
+    from logic import mercy
+
+    # The pure-Python tables are built faster than NumPy is imported
+    mercy.use_numpy(False)
+
+    state = _log().refresh()
+    for shard in [args.shard] if args.shard else SHARDS:
+        pity = state.pity[shard][HIGHEST_RARITY[shard]]
+        dist = mercy.pulls_distribution(shard, pity)
+        within = ", ".join(f"{dist.hit_within(n) * 100:.1f}% within {n}" for n in args.within)
+        print(
+            f"{shard} {HIGHEST_RARITY[shard]} at pity {pity}: expected {dist.expected:.1f} more pulls, "
+            f"median {dist.median}, 90%: {dist.p90}, 99%: {dist.p99}; {within}"
+        )
+
+
+def cmd_simulate(args):
+    from logic.simulator import run_simulation
+
+    start_pity = None if args.fresh else _log().refresh().pity[args.shard]
+    summary = run_simulation(args.shard, args.shards, args.trials, args.seed, start_pity, args.workers)
+
+    start = "pity 0" if args.fresh else ", ".join(f"{r} {v}" for r, v in start_pity.items())
+    print(f"{args.shard}: {args.shards} shards x {summary.trials} trials, starting at {start}")
+    for rarity in summary.rarities:
+        print(
+            f"  {rarity:<10} mean {summary.mean(rarity):.3f}, "
+            f"P(>=1) {summary.chance_at_least(1, rarity) * 100:.2f}%, "
+            f"P(>=2) {summary.chance_at_least(2, rarity) * 100:.2f}%"
+        )
+
+
+def cmd_export(args):
+    import csv
+
+    events = _log().iter_events()
+    fmt = args.format or ("csv" if args.file.endswith(".csv") else "jsonl")
+    out = sys.stdout if args.file == "-" else open(args.file, "w", newline="", encoding="utf-8")
+
+    written = 0
+    try:
+        if fmt == "csv":
+            writer = csv.writer(out)
+            writer.writerow(EXPORT_FIELDS)
+            for e in events:
+                hits = ";".join(f"{pos}:{rarity}" for pos, rarity in e["hits"])
+                writer.writerow([repr(e["timestamp"]), e["shard"], e["kind"], e["count"], hits])
+                written += 1
+        else:
+            for e in events:
+                out.write(json.dumps({**e, "hits": [list(h) for h in e["hits"]]}) + "\n")
+                written += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Exported {written} events", file=sys.stderr)
+
+
+def _read_events(path: str, fmt: str | None):
+    import csv
+
+    fmt = fmt or ("csv" if path.endswith(".csv") else "jsonl")
+    f = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                hits = [(int(pos), rarity) for pos, rarity in
+                        (h.split(":", 1) for h in row["hits"].split(";") if h)]
+                yield float(row["timestamp"]), row["shard"], row["kind"], int(row["count"]), hits
+        else:
+            for line in f:
+                if line.strip():
+                    e = json.loads(line)
+                    yield float(e["timestamp"]), e["shard"], e["kind"], int(e["count"]), [tuple(h) for h in e["hits"]]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _import_hits(shard: str, kind: str, count: int, hits) -> list[tuple[int, str]]:
+    """
+    Hits of an imported event, checked the way record and set check
+    them. Raises ValueError naming what is wrong.
+    """
+    rarities = SUPPORTED_RARITIES[shard]
+    hits = [(int(p), r) for p, r in hits]
+
+    if kind in ("set", "reset", "hard_pity"):
+        # (value, rarity) pairs, not positions inside a pull
+        untracked = sorted({r for _, r in hits if r not in rarities})
+        if untracked:
+            raise ValueError(f"{shard} shards do not track {', '.join(untracked)}")
+        return hits
+
+    size = PULL_SIZES.get(kind, count)
+    if count <= 0 or count != size:
+        raise ValueError(f"a {kind} pull cannot be {count} shards")
+
+    text = " ".join(f"{p} {r}" for p, r in hits)
+    parsed, problems = parse_hits(text, count, rarities)
+    if problems:
+        raise ValueError("; ".join(problems))
+    if kind == "single" and len(parsed) > 1:
+        raise ValueError("a single pull has one position")
+    return sorted(parsed.items())
+
+
+def cmd_import(args):
+    # Every entry is checked before anything is appended to the log
+    events = []
+    for n, (ts, shard, kind, count, hits) in enumerate(_read_events(args.file, args.format), 1):
+        if shard not in SHARDS or kind not in KINDS:
+            raise SystemExit(f"import: entry {n}: unknown shard or kind ({shard}, {kind})")
+        try:
+            hits = _import_hits(shard, kind, count, hits)
+        except ValueError as e:
+            raise SystemExit(f"import: entry {n}: {e}")
+        events.append((shard, kind, count, hits, ts))
+
+    if not events:
+        print("Nothing to import", file=sys.stderr)
+        return
+
+    pity = _record(events)
+    print(f"Imported {len(events)} events", file=sys.stderr)
+    for shard in sorted({e[0] for e in events}, key=SHARDS.index):
+        _print_pity(shard, pity[shard])
+
+
+# -------------------------------------------------------------
+#  Entry point
+# -------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="hydra", description="Hydra Companion from the command line")
+    parser.add_argument("--data-dir", help=f"account data folder (default: ${DATA_DIR_ENV} or the app data folder)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("pity", help="print pity and chance per shard")
+    p.add_argument("shard", nargs="?", type=_shard)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_pity)
+
+    p = sub.add_parser("record", help="record a pull")
+    p.add_argument("shard", type=_shard)
+    p.add_argument("kind", choices=RECORD_KINDS)
+    p.add_argument("--count", type=int, help="shards used (custom pulls)")
+    p.add_argument("--hits", help='hits as "position rarity" pairs, e.g. "3 E, 17 L"')
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser("reset", help="reset a shard's pity to 0")
+    p.add_argument("shard", type=_shard)
+    p.set_defaults(func=cmd_reset)
+
+    p = sub.add_parser("hard-pity", help="record the guaranteed top-rarity hit at hard pity")
+    p.add_argument("shard", type=_shard)
+    p.set_defaults(func=cmd_hard_pity)
+
+    p = sub.add_parser("set", help="correct a pity counter by hand")
+    p.add_argument("shard", type=_shard)
+    p.add_argument("pity", type=int)
+    p.add_argument("--rarity", help="rarity to correct (default: the shard's top rarity)")
+    p.set_defaults(func=cmd_set)
+
+    p = sub.add_parser("forecast", help="pulls needed for the top rarity from the current pity")
+    p.add_argument("shard", nargs="?", type=_shard)
+    p.add_argument("--within", type=int, nargs="+", default=[10], metavar="N")
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser("simulate", help="Monte Carlo run of a number of shards")
+    p.add_argument("shard", type=_shard)
+    p.add_argument("shards", type=int)
+    p.add_argument("--trials", type=int, default=10_000)
+    p.add_argument("--seed", type=int)
+    p.add_argument("--workers", type=int)
+    p.add_argument("--fresh", action="store_true", help="start from pity 0 instead of the current pity")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("export", help="write the pull history (the event log) to a file")
+    p.add_argument("file", help='.jsonl or .csv file, or "-" for stdout')
+    p.add_argument("--format", choices=("jsonl", "csv"))
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="append pull events from an export")
+    p.add_argument("file", help='.jsonl or .csv file, or "-" for stdin')
+    p.add_argument("--format", choices=("jsonl", "csv"))
+    p.set_defaults(func=cmd_import)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.data_dir:
+        os.environ[DATA_DIR_ENV] = os.path.abspath(os.path.expanduser(args.data_dir))
+
+    try:
+        args.func(args)
+    except BrokenPipeError:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# -------------------------------------------------------------
+#  App state store
+# -------------------------------------------------------------
+#
+# The single core.store.Store the app's views read from. Keys:
+#
+#   pity/<Shard>      {rarity: pity} for every tracked rarity
+#   hits/<Shard>      {rarity: logged hits}
+#   inventory/<key>   shard counts (core.inventory)
+#
+# and values derived from them, computed once per change:
+#
+#   primary/<Shard>   top-rarity pity
+#   chance/<Shard>    % chance of the top rarity on the next pull
+#   eta/<Shard>       mercy.PullDistribution of pulls left to a hit
+#
+# ShardTrackerWidget writes pity and hits; pages subscribe to the keys
+# they render. Pity is loaded from the pull log at start-up and the
+# top-rarity pity is mirrored into the settings as a fallback.
+
+import weakref
+
+from core.rules import HIGHEST_RARITY, INVENTORY_KEYS, SHARDS, SUPPORTED_RARITIES
+from core.store import Store
+from logic import mercy
+
+
+def pity_key(shard: str) -> str:
+    return f"pity/{shard}"
+
+
+def hits_key(shard: str) -> str:
+    return f"hits/{shard}"
+
+
+def primary_key(shard: str) -> str:
+    return f"primary/{shard}"
+
+
+def chance_key(shard: str) -> str:
+    return f"chance/{shard}"
+
+
+def eta_key(shard: str) -> str:
+    return f"eta/{shard}"
+
+
+def shard_of(key: str) -> str:
+    """"primary/Void" -> "Void"."""
+    return key.split("/", 1)[1]
+
+
+def _settings_key(shard: str) -> str:
+    # Where the top-rarity pity lived before the pull log
+    return f"pity/{INVENTORY_KEYS[shard]}"
+
+
+def build_store() -> Store:
+    """Empty app store: zeroed pity and hits plus the derived values."""
+    store = Store()
+
+    for shard in SHARDS:
+        rarities = SUPPORTED_RARITIES[shard]
+        top = HIGHEST_RARITY[shard]
+        store.set(pity_key(shard), {r: 0 for r in rarities})
+        store.set(hits_key(shard), {r: 0 for r in rarities})
+
+        store.derive(primary_key(shard), [pity_key(shard)], lambda pity, top=top: pity.get(top, 0))
+        store.derive(
+            chance_key(shard), [primary_key(shard)],
+            lambda pulls, shard=shard: mercy.get_table(shard).chance_at(pulls),
+        )
+        store.derive(
+            eta_key(shard), [primary_key(shard)],
+            lambda pulls, shard=shard: mercy.pulls_distribution(shard, pulls),
+        )
+
+    return store
+
+
+def load_pull_state(store: Store, state):
+    """Copy pity and hits from a logic.pull_log.PullLogState."""
+    with store.batch():
+        for shard in SHARDS:
+            store.set(pity_key(shard), dict(state.pity[shard]))
+            store.set(hits_key(shard), dict(state.hits[shard]))
+
+
+# Settings mirror subscribed on each store
+_mirrors = weakref.WeakKeyDictionary()
+
+
+def sync_with_log(store: Store, settings):
+    """
+    Pity lives in the pull log, which the hydra CLI writes too. Seed the
+    log once from the settings (where pity was kept before), load it into
+    the store and keep the settings' top-rarity pity mirrored from then on
+    (used if the log cannot be read). Calling it again replaces the mirror.
+    """
+    from logic.pull_log import get_pull_log, seed_pity
+
+    try:
+        log = get_pull_log()
+        seed_pity(log, {shard: settings.value(_settings_key(shard)) for shard in SHARDS})
+        load_pull_state(store, log.refresh())
+    except (OSError, ValueError):
+        with store.batch():
+            for shard in SHARDS:
+                saved = int(settings.value(_settings_key(shard), 0))
+                store.set(pity_key(shard), {**store.get(pity_key(shard)), HIGHEST_RARITY[shard]: saved})
+
+    def mirror(changes):
+        for key, value in changes.items():
+            settings.setValue(_settings_key(shard_of(key)), value)
+
+    previous = _mirrors.pop(store, None)
+    if previous is not None:
+        store.unsubscribe(previous)
+
+    keys = [primary_key(shard) for shard in SHARDS]
+    mirror({key: store.get(key) for key in keys})
+    store.subscribe(keys, mirror)
+    _mirrors[store] = mirror
+
+
+def subscribe_widget(widget, keys, callback, store: Store | None = None):
+    """
+    store.subscribe() for as long as a Qt widget lives: the subscription
+    is dropped when the widget is destroyed.
+    """
+    store = store if store is not None else get_app_store()
+    store.subscribe(keys, callback)
+    # callback is often a bound method of widget, so the store keeps the
+    # widget's wrapper alive until it is destroyed; the lambda itself only
+    # needs store and callback and must not reference the widget
+    widget.destroyed.connect(lambda *_: store.unsubscribe(callback))
+
+
+_store = None
+
+
+def get_app_store() -> Store:
+    """Shared app-wide store (created on first use)."""
+    global _store
+    if _store is None:
+        _store = build_store()
+    return _store
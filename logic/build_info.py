@@ -0,0 +1,204 @@
+# -------------------------------------------------------------
+#  Build number helpers (Qt-free so the packaging step and the
+#  background build worker can both use them)
+# -------------------------------------------------------------
+
+import os
+import sys
+import json
+import hashlib
+
+
+BUILD_FILE = "build.json"
+BUILD_CACHE_FILE = os.path.join(os.path.dirname(BUILD_FILE), "build_cache.json")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directories that never contain project sources (virtualenvs, caches,
+# PyInstaller output). They are pruned from the walk entirely.
+EXCLUDED_DIRS = {
+    "venv",
+    ".venv",
+    "env",
+    "__pycache__",
+    "build",
+    "dist",
+    "installer",
+    "licenses",
+    "logos and assets",
+}
+
+
+# ---------------------------------------------------------
+#   BUILD SYSTEM HELPERS
+# ---------------------------------------------------------
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(8192), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_fingerprint_cache() -> dict:
+    """
+    Fingerprint cache: rel_path -> {"size", "mtime", "hash"}.
+    Lets warm launches skip re-hashing files that have not changed.
+    """
+    if os.path.exists(BUILD_CACHE_FILE):
+        try:
+            with open(BUILD_CACHE_FILE, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if isinstance(cache, dict):
+                return cache
+        except Exception:
+            pass
+    return {}
+
+
+def save_fingerprint_cache(cache: dict):
+    try:
+        with open(BUILD_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(cache, f, separators=(",", ":"))
+    except Exception:
+        pass
+
+
+def collect_project_hashes(root: str, cache: dict | None = None) -> dict:
+    """
+    Hash every project .py file under root.
+
+    When a fingerprint cache is given, files whose size and mtime match
+    the cached entry reuse the stored hash. The cache is updated in place
+    and stale entries (deleted files) are dropped.
+    """
+    hashes = {}
+    seen = set()
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            d for d in dirnames
+            if d not in EXCLUDED_DIRS and not d.startswith(".")
+        ]
+
+        for name in filenames:
+            if not name.endswith(".py"):
+                continue
+
+            full_path = os.path.join(dirpath, name)
+            rel_path = os.path.relpath(full_path, root)
+
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+
+            seen.add(rel_path)
+
+            if cache is not None:
+                entry = cache.get(rel_path)
+                if (
+                    isinstance(entry, dict)
+                    and entry.get("size") == st.st_size
+                    and entry.get("mtime") == st.st_mtime_ns
+                ):
+                    hashes[rel_path] = entry["hash"]
+                    continue
+
+            try:
+                digest = hash_file(full_path)
+            except Exception:
+                continue
+
+            hashes[rel_path] = digest
+            if cache is not None:
+                cache[rel_path] = {
+                    "size": st.st_size,
+                    "mtime": st.st_mtime_ns,
+                    "hash": digest,
+                }
+
+    if cache is not None:
+        for stale in [p for p in cache if p not in seen]:
+            del cache[stale]
+
+    return hashes
+
+
+def load_build_info() -> dict:
+    if os.path.exists(BUILD_FILE):
+        try:
+            with open(BUILD_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {"build": 1, "hashes": {}}
+
+
+def save_build_info(info: dict):
+    with open(BUILD_FILE, "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=4)
+
+
+def update_build_if_needed() -> int:
+    root = PROJECT_ROOT
+
+    cache = load_fingerprint_cache()
+    previous = dict(cache)
+
+    current_hashes = collect_project_hashes(root, cache)
+
+    if cache != previous:
+        save_fingerprint_cache(cache)
+
+    info = load_build_info()
+
+    if info.get("hashes") != current_hashes:
+        info["build"] = int(info.get("build", 1)) + 1
+        info["hashes"] = current_hashes
+        save_build_info(info)
+
+    return int(info.get("build", 1))
+
+
+# ---------------------------------------------------------
+#   FROZEN BUNDLE MANIFEST
+# ---------------------------------------------------------
+
+BUILD_MANIFEST_FILE = "build_manifest.json"
+
+
+def write_build_manifest(path: str = BUILD_MANIFEST_FILE) -> int:
+    """
+    Called at packaging time (see HydraCompanion.spec). Computes the build
+    number from the source tree and stores it so the frozen app never has
+    to walk sources.
+    """
+    build = update_build_if_needed()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"build": build}, f, indent=4)
+    return build
+
+
+def load_build_manifest() -> int | None:
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(sys.executable)))
+    path = os.path.join(base, BUILD_MANIFEST_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return int(json.load(f).get("build"))
+    except Exception:
+        return None
+
+
+def resolve_build_number() -> int:
+    """
+    Frozen bundles read the packaged manifest; source checkouts fall back
+    to the cached fingerprint walk.
+    """
+    if getattr(sys, "frozen", False):
+        build = load_build_manifest()
+        if build is not None:
+            return build
+        return int(load_build_info().get("build", 1))
+    return update_build_if_needed()
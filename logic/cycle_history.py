@@ -0,0 +1,152 @@
+# -------------------------------------------------------------
+#  Per-shard pity cycle history
+# -------------------------------------------------------------
+#
+# Completed pity cycles (the pity reached before the top rarity hit)
+# for one shard, kept in a fixed-capacity ring buffer. Each cycle is
+# only its length and end timestamp. The buffer lives in memory as two
+# arrays and on disk as a fixed-size file (cycles-<shard>.bin in the
+# data directory), so recording a cycle rewrites one 10-byte slot and
+# the header instead of the whole history.
+#
+# File layout (little endian):
+#   header  <4sIII  magic, capacity, next slot, count
+#   slot    <dH     end timestamp, cycle length
+
+import os
+import time
+import struct
+from array import array
+
+from logic.paths import app_data_dir
+
+
+CYCLE_MAGIC = b"HCY1"
+
+# Cycles kept per shard unless configured otherwise
+DEFAULT_DEPTH = 256
+MAX_CYCLE_LENGTH = 0xFFFF
+
+_HEADER = struct.Struct("<4sIII")
+_SLOT = struct.Struct("<dH")
+
+
+class CycleHistory:
+    def __init__(self, path: str, capacity: int = DEFAULT_DEPTH):
+        self.path = path
+        self.capacity = max(1, int(capacity))
+
+        # Ring storage; slot `_next` is written next
+        self._lengths = array("H", [0]) * self.capacity
+        self._ends = array("d", [0.0]) * self.capacity
+        self._next = 0
+        self._count = 0
+
+        self._load()
+
+    # -----------------------------
+    #   STORAGE
+    # -----------------------------
+    def _load(self):
+        try:
+            with open(self.path, "rb") as fh:
+                raw = fh.read()
+        except FileNotFoundError:
+            self._write_all()
+            return
+
+        try:
+            magic, capacity, next_slot, count = _HEADER.unpack_from(raw, 0)
+        except struct.error:
+            magic = None
+        if magic != CYCLE_MAGIC or len(raw) < _HEADER.size + capacity * _SLOT.size:
+            # Unreadable file: start over rather than refuse to open the page
+            self._write_all()
+            return
+
+        # Oldest first, then re-laid out at our capacity
+        cycles = []
+        for i in range(count):
+            slot = (next_slot - count + i) % capacity
+            ts, length = _SLOT.unpack_from(raw, _HEADER.size + slot * _SLOT.size)
+            cycles.append((length, ts))
+
+        for length, ts in cycles[-self.capacity:]:
+            self._put(length, ts)
+
+        if capacity != self.capacity:
+            self._write_all()
+
+    def _write_all(self):
+        with open(self.path, "wb") as fh:
+            fh.write(_HEADER.pack(CYCLE_MAGIC, self.capacity, self._next, self._count))
+            for slot in range(self.capacity):
+                fh.write(_SLOT.pack(self._ends[slot], self._lengths[slot]))
+
+    def _put(self, length: int, ts: float) -> int:
+        slot = self._next
+        self._lengths[slot] = max(0, min(int(length), MAX_CYCLE_LENGTH))
+        self._ends[slot] = ts
+        self._next = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        return slot
+
+    # -----------------------------
+    #   API
+    # -----------------------------
+    def append(self, length: int, timestamp: float | None = None):
+        """Record a completed cycle; the oldest one drops off when full."""
+        ts = time.time() if timestamp is None else timestamp
+        slot = self._put(length, ts)
+
+        with open(self.path, "r+b") as fh:
+            fh.write(_HEADER.pack(CYCLE_MAGIC, self.capacity, self._next, self._count))
+            fh.seek(_HEADER.size + slot * _SLOT.size)
+            fh.write(_SLOT.pack(ts, self._lengths[slot]))
+
+    def set_capacity(self, capacity: int):
+        """Change the depth, keeping the most recent cycles."""
+        capacity = max(1, int(capacity))
+        if capacity == self.capacity:
+            return
+        cycles = list(zip(self.lengths(), self.timestamps()))
+
+        self.capacity = capacity
+        self._lengths = array("H", [0]) * capacity
+        self._ends = array("d", [0.0]) * capacity
+        self._next = 0
+        self._count = 0
+        for length, ts in cycles[-capacity:]:
+            self._put(length, ts)
+        self._write_all()
+
+    def _order(self):
+        start = (self._next - self._count) % self.capacity
+        return [(start + i) % self.capacity for i in range(self._count)]
+
+    def lengths(self, last: int | None = None) -> list[int]:
+        """Cycle lengths, oldest first (optionally only the `last` newest)."""
+        order = self._order()
+        if last is not None:
+            order = order[-last:] if last > 0 else []
+        return [self._lengths[slot] for slot in order]
+
+    def timestamps(self) -> list[float]:
+        return [self._ends[slot] for slot in self._order()]
+
+    def __len__(self) -> int:
+        return self._count
+
+
+_histories = {}
+
+
+def get_cycle_history(shard: str, capacity: int = DEFAULT_DEPTH) -> CycleHistory:
+    """Shared history for a shard ("Ancient", "Void", ...), opened on first use."""
+    history = _histories.get(shard)
+    if history is None:
+        path = os.path.join(app_data_dir(), f"cycles-{shard.lower()}.bin")
+        history = _histories[shard] = CycleHistory(path, capacity)
+    else:
+        history.set_capacity(capacity)
+    return history
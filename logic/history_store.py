@@ -0,0 +1,289 @@
+# -------------------------------------------------------------
+#  SQLite pull history
+# -------------------------------------------------------------
+#
+# Queryable history of every logged pull (history.sqlite3 in the data
+# directory). One row per pull event plus one row per hit, indexed for
+# per-shard, per-rarity and time-range queries. The database runs in
+# WAL mode and each pull is written in a single transaction.
+#
+# Pages talk to PullHistoryRepository instead of reading ad-hoc
+# QSettings counters.
+
+import os
+import time
+import uuid
+import atexit
+import sqlite3
+
+from core.pull_state import hit_pities
+from logic.paths import app_data_dir
+
+
+HISTORY_FILE = "history.sqlite3"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pulls (
+    id       INTEGER PRIMARY KEY,
+    session  TEXT    NOT NULL,
+    ts       REAL    NOT NULL,
+    shard    TEXT    NOT NULL,
+    kind     TEXT    NOT NULL,
+    count    INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS hits (
+    id           INTEGER PRIMARY KEY,
+    pull_id      INTEGER NOT NULL REFERENCES pulls(id),
+    session      TEXT    NOT NULL,
+    ts           REAL    NOT NULL,
+    shard        TEXT    NOT NULL,
+    rarity       TEXT    NOT NULL,
+    position     INTEGER NOT NULL,
+    pity_at_hit  INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_pulls_shard_ts  ON pulls(shard, ts);
+CREATE INDEX IF NOT EXISTS idx_pulls_ts        ON pulls(ts);
+CREATE INDEX IF NOT EXISTS idx_hits_shard      ON hits(shard, rarity, pity_at_hit);
+CREATE INDEX IF NOT EXISTS idx_hits_rarity     ON hits(rarity, pull_id, position);
+CREATE INDEX IF NOT EXISTS idx_hits_ts         ON hits(ts);
+"""
+
+_HIT_COLUMNS = "id, ts, shard, rarity, position, pity_at_hit, session"
+
+
+def _hit_dict(row) -> dict:
+    hit_id, ts, shard, rarity, pos, pity, session = row
+    return {
+        "id": hit_id,
+        "timestamp": ts,
+        "shard": shard,
+        "rarity": rarity,
+        "position": pos,
+        "pity_at_hit": pity,
+        "session": session,
+    }
+
+
+class PullHistoryRepository:
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(app_data_dir(), HISTORY_FILE)
+        self.session = uuid.uuid4().hex
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            with self._conn:
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    # -----------------------------
+    #   WRITES
+    # -----------------------------
+    def record_pull(
+        self,
+        shard: str,
+        kind: str,
+        count: int,
+        hits=(),
+        pity_before: dict | None = None,
+        timestamp: float | None = None,
+    ) -> int:
+        """
+        Store one pull event and its hits in a single transaction.
+        pity_before maps rarity -> pity just before the pull; it is used to
+        work out the pity each hit landed at (core.pull_state.hit_pities).
+        """
+        ts = time.time() if timestamp is None else timestamp
+        with self._conn:
+            return self._insert_pull(shard, kind, count, hits, pity_before or {}, ts)
+
+    def record_many(self, events) -> int:
+        """
+        Bulk insert (shard, kind, count, hits, pity_before, timestamp)
+        tuples in one transaction. Returns the number of events written.
+        """
+        written = 0
+        with self._conn:
+            for shard, kind, count, hits, pity_before, ts in events:
+                self._insert_pull(shard, kind, count, hits, pity_before or {}, ts)
+                written += 1
+        return written
+
+    def _insert_pull(self, shard, kind, count, hits, pity_before, ts) -> int:
+        cur = self._conn.execute(
+            "INSERT INTO pulls (session, ts, shard, kind, count) VALUES (?, ?, ?, ?, ?)",
+            (self.session, ts, shard, kind, int(count)),
+        )
+        pull_id = cur.lastrowid
+
+        if hits:
+            self._conn.executemany(
+                "INSERT INTO hits (pull_id, session, ts, shard, rarity, position, pity_at_hit) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (pull_id, self.session, ts, shard, rarity, pos, pity)
+                    for pos, rarity, pity in hit_pities(pity_before, hits)
+                ],
+            )
+        return pull_id
+
+    def import_from_log(self, pull_log) -> int:
+        """Backfill from the append-only pull log (used when the database is new)."""
+        from logic.pull_log import PullLogState
+
+        state = PullLogState()
+
+        def events():
+            for event in pull_log.iter_events():
+                shard, kind = event["shard"], event["kind"]
+                pity_before = dict(state.pity[shard])
+                state.apply(shard, kind, event["count"], event["hits"])
+                # A set event's "hits" carry corrected pity, not pulled heroes
+                hits = () if kind == "set" else event["hits"]
+                yield shard, kind, event["count"], hits, pity_before, event["timestamp"]
+
+        return self.record_many(events())
+
+    # -----------------------------
+    #   QUERIES
+    # -----------------------------
+    def is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM pulls LIMIT 1").fetchone() is None
+
+    def total_pulls(self, shard: str | None = None) -> int:
+        if shard is None:
+            row = self._conn.execute("SELECT COALESCE(SUM(count), 0) FROM pulls").fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM pulls WHERE shard = ?", (shard,)
+            ).fetchone()
+        return int(row[0])
+
+    def pulls_since_last_hit(self, rarity: str) -> int | None:
+        """Shards pulled (any shard type) since the latest hit of a rarity, or None."""
+        row = self._conn.execute(
+            "SELECT h.pull_id, h.position, p.count FROM hits h "
+            "JOIN pulls p ON p.id = h.pull_id "
+            "WHERE h.rarity = ? ORDER BY h.pull_id DESC, h.position DESC LIMIT 1",
+            (rarity,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        pull_id, position, count = row
+        after = self._conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM pulls WHERE id > ?", (pull_id,)
+        ).fetchone()[0]
+        return int(after) + max(0, int(count) - int(position))
+
+    def hit_count(
+        self,
+        shard: str | None = None,
+        rarity: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> int:
+        where, params = self._hit_filter(shard, rarity, since, until)
+        row = self._conn.execute(f"SELECT COUNT(*) FROM hits{where}", params).fetchone()
+        return int(row[0])
+
+    def pity_at_hit_stats(self, shard: str, rarity: str) -> dict:
+        """Count / average / min / max pity at which a rarity was hit on a shard."""
+        row = self._conn.execute(
+            "SELECT COUNT(*), AVG(pity_at_hit), MIN(pity_at_hit), MAX(pity_at_hit) "
+            "FROM hits WHERE shard = ? AND rarity = ?",
+            (shard, rarity),
+        ).fetchone()
+        count, avg, low, high = row
+        return {
+            "count": int(count),
+            "average": float(avg) if avg is not None else None,
+            "min": low,
+            "max": high,
+        }
+
+    def recent_hits(
+        self,
+        limit: int = 50,
+        shard: str | None = None,
+        rarity: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        before: tuple[float, int] | None = None,
+    ) -> list[dict]:
+        """
+        Newest hits first, by (timestamp, id). Pass the last returned
+        (hit["timestamp"], hit["id"]) as before to page back.
+        """
+        where, params = self._hit_filter(shard, rarity, since, until)
+        if before is not None:
+            where += (" AND" if where else " WHERE") + " (ts, id) < (?, ?)"
+            params.extend((float(before[0]), int(before[1])))
+        rows = self._conn.execute(
+            f"SELECT {_HIT_COLUMNS} FROM hits{where} ORDER BY ts DESC, id DESC LIMIT ?",
+            params + [int(limit)],
+        ).fetchall()
+        return [_hit_dict(row) for row in rows]
+
+    def hits_after(self, hit_id: int) -> list[dict]:
+        """Hits written after hit_id, in the order they were written."""
+        rows = self._conn.execute(
+            f"SELECT {_HIT_COLUMNS} FROM hits WHERE id > ? ORDER BY id", (int(hit_id),)
+        ).fetchall()
+        return [_hit_dict(row) for row in rows]
+
+    def latest_hit_id(self) -> int:
+        """Id of the most recently written hit (0 when there are none)."""
+        return int(self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM hits").fetchone()[0])
+
+    @staticmethod
+    def _hit_filter(shard, rarity, since, until):
+        clauses, params = [], []
+        if shard is not None:
+            clauses.append("shard = ?")
+            params.append(shard)
+        if rarity is not None:
+            clauses.append("rarity = ?")
+            params.append(rarity)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, params
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_history = None
+
+
+def get_history() -> PullHistoryRepository:
+    """
+    Shared repository for the running app. A fresh database is backfilled
+    from the pull event log the first time it is opened.
+    """
+    global _history
+    if _history is None:
+        _history = PullHistoryRepository()
+        atexit.register(_history.close)
+
+        if _history.is_empty():
+            from logic.pull_log import get_pull_log
+            try:
+                _history.import_from_log(get_pull_log())
+            except (OSError, ValueError):
+                pass
+    return _history
@@ -0,0 +1,218 @@
+# -------------------------------------------------------------
+#  Mercy engine
+# -------------------------------------------------------------
+#
+# The mercy rules for every shard (core/rules.py), compiled once into
+# per-pity lookup tables indexed 0..hard:
+#
+#   chance[p]              % chance of the top rarity on the next pull at pity p
+#   survival[p]            probability of reaching pity p without a hit
+#   cumulative[p]          probability of having hit by the pull taken at pity p
+#   expected_remaining[p]  expected pulls (including the hit) from pity p
+#
+# Pages look values up instead of re-running the formula. Tables are
+# built with NumPy when it is installed and with array('d') otherwise.
+# NumPy is imported on the first table build, not at import time, and
+# use_numpy(False) keeps short-lived processes (the hydra CLI) off it.
+
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+# The rules are plain data in the Qt-free core; re-exported from here
+from core.rules import HIGHEST_RARITY, LINKED_RULES, MERCY_RULES, chance_formula, rules_for
+
+np = None
+_numpy_enabled = True
+_numpy_checked = False
+
+
+def use_numpy(enabled: bool):
+    """Choose the table backend; call before the first lookup."""
+    global _numpy_enabled
+    if enabled != _numpy_enabled:
+        _numpy_enabled = enabled
+        get_table.cache_clear()
+        _distribution.cache_clear()
+
+
+def _numpy():
+    """NumPy if it is enabled and installed, else None (imported once)."""
+    global np, _numpy_checked
+    if not _numpy_enabled:
+        return None
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+        except ImportError:  # NumPy is optional
+            numpy = None
+        np = numpy
+    return np
+
+
+# -------------------------------------------------------------
+#  Compiled tables
+# -------------------------------------------------------------
+class MercyTable:
+    def __init__(self, shard: str, rules: dict):
+        self.shard = shard
+        self.rules = dict(rules)
+        self.base = rules["base"]
+        self.soft = rules["soft"]
+        self.inc = rules["inc"]
+        self.hard = rules["hard"]
+        self.rarity = rules["rarity"]
+
+        self.vectorized = _numpy() is not None
+        if self.vectorized:
+            self._build_numpy()
+        else:
+            self._build_python()
+
+    def _build_numpy(self):
+        p = np.arange(self.hard + 1)
+        chance = np.where(p <= self.soft, self.base, self.base + (np.minimum(p, self.hard) - self.soft) * self.inc)
+        chance[p >= self.hard] = 100.0
+        chance = np.clip(chance, 0.0, 100.0)
+
+        q = chance / 100.0
+        survival = np.empty_like(q)
+        survival[0] = 1.0
+        survival[1:] = np.cumprod(1.0 - q[:-1])
+
+        cumulative = 1.0 - survival * (1.0 - q)
+
+        # E[p] = sum_{j >= p} survival[j] / survival[p]
+        tail = np.cumsum(survival[::-1])[::-1]
+        expected = np.divide(tail, survival, out=np.zeros_like(tail), where=survival > 0)
+
+        self.chance = chance
+        self.survival = survival
+        self.cumulative = cumulative
+        self.expected_remaining = expected
+
+    def _build_python(self):
+        size = self.hard + 1
+        chance = array("d", (chance_formula(p, self.base, self.soft, self.inc, self.hard) for p in range(size)))
+
+        survival = array("d", [1.0]) * size
+        for p in range(1, size):
+            survival[p] = survival[p - 1] * (1.0 - chance[p - 1] / 100.0)
+
+        cumulative = array("d", (1.0 - survival[p] * (1.0 - chance[p] / 100.0) for p in range(size)))
+
+        expected = array("d", [0.0]) * size
+        tail = 0.0
+        for p in range(size - 1, -1, -1):
+            tail += survival[p]
+            expected[p] = tail / survival[p] if survival[p] > 0 else 0.0
+
+        self.chance = chance
+        self.survival = survival
+        self.cumulative = cumulative
+        self.expected_remaining = expected
+
+    # -----------------------------
+    #   O(1) LOOKUPS
+    # -----------------------------
+    def index(self, pity: int) -> int:
+        """Clamp a tracked pity value into the table range."""
+        return max(0, min(int(pity), self.hard))
+
+    def chance_at(self, pity: int) -> float:
+        return float(self.chance[self.index(pity)])
+
+    def survival_at(self, pity: int) -> float:
+        return float(self.survival[self.index(pity)])
+
+    def cumulative_at(self, pity: int) -> float:
+        return float(self.cumulative[self.index(pity)])
+
+    def expected_remaining_at(self, pity: int) -> float:
+        return float(self.expected_remaining[self.index(pity)])
+
+
+@lru_cache(maxsize=None)
+def get_table(shard: str, rarity: str | None = None) -> MercyTable:
+    """
+    Compiled table for a shard ("Ancient", "Void", "Sacred", "Primal").
+    Defaults to the top rarity; pass the linked rarity for its table.
+    """
+    return MercyTable(shard, rules_for(shard, rarity))
+
+
+def rarity_tables(shard: str) -> tuple[MercyTable, ...]:
+    """Every table a shard tracks, lowest rarity first."""
+    tables = [get_table(shard)]
+    if shard in LINKED_RULES:
+        tables.insert(0, get_table(shard, LINKED_RULES[shard]["rarity"]))
+    return tuple(tables)
+
+
+def chance(shard: str, pity: int) -> float:
+    return get_table(shard).chance_at(pity)
+
+
+# -------------------------------------------------------------
+#  Pulls-to-guarantee distribution
+# -------------------------------------------------------------
+class PullDistribution:
+    """
+    Exact distribution of K, the number of further pulls needed for the
+    top rarity when the current pity is `pity`. pmf[k - 1] = P(K = k) and
+    cdf[k - 1] = P(K <= k), for k = 1 .. hard - pity + 1.
+    """
+
+    def __init__(self, table: MercyTable, pity: int):
+        self.shard = table.shard
+        self.pity = table.index(pity)
+
+        start = self.pity
+        self.vectorized = table.vectorized
+        if self.vectorized:
+            q = table.chance[start:] / 100.0
+            pmf = table.survival[start:] * q / table.survival[start]
+            cdf = np.cumsum(pmf)
+        else:
+            s0 = table.survival[start]
+            pmf = array("d", (table.survival[p] * table.chance[p] / 100.0 / s0 for p in range(start, table.hard + 1)))
+            cdf = array("d", pmf)
+            for i in range(1, len(cdf)):
+                cdf[i] += cdf[i - 1]
+
+        self.pmf = pmf
+        self.cdf = cdf
+        self.max_pulls = len(pmf)
+        self.expected = table.expected_remaining_at(start)
+
+        self.median = self.percentile(0.5)
+        self.p90 = self.percentile(0.9)
+        self.p99 = self.percentile(0.99)
+
+    def percentile(self, q: float) -> int:
+        """Smallest k with P(K <= k) >= q."""
+        target = q - 1e-12
+        if self.vectorized:
+            k = int(np.searchsorted(self.cdf, target)) + 1
+        else:
+            k = bisect_left(self.cdf, target) + 1
+        return min(k, self.max_pulls)
+
+    def hit_within(self, n: int) -> float:
+        """P(top rarity within the next n pulls)."""
+        if n <= 0:
+            return 0.0
+        if n >= self.max_pulls:
+            return 1.0
+        return float(self.cdf[n - 1])
+
+
+@lru_cache(maxsize=4096)
+def _distribution(shard: str, pity: int) -> PullDistribution:
+    return PullDistribution(get_table(shard), pity)
+
+
+def pulls_distribution(shard: str, pity: int) -> PullDistribution:
+    """Memoized per (shard, pity); pity is clamped into 0..hard first."""
+    return _distribution(shard, get_table(shard).index(pity))
@@ -0,0 +1,33 @@
+# -------------------------------------------------------------
+#  Per-user data directory
+# -------------------------------------------------------------
+
+import os
+import sys
+
+
+ORGANIZATION = "SketeRAID"
+APPLICATION = "Hydra Companion"
+
+# Point this at another folder to keep separate accounts apart
+DATA_DIR_ENV = "HYDRA_DATA_DIR"
+
+
+def app_data_dir() -> str:
+    """Folder for the pull log, snapshots and history database."""
+    override = os.environ.get(DATA_DIR_ENV)
+    if override:
+        base = override
+    elif sys.platform == "win32":
+        root = os.environ.get("APPDATA") or os.path.expanduser("~")
+        base = os.path.join(root, ORGANIZATION, APPLICATION)
+    elif sys.platform == "darwin":
+        base = os.path.join(
+            os.path.expanduser("~"), "Library", "Application Support", ORGANIZATION, APPLICATION
+        )
+    else:
+        root = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+        base = os.path.join(root, ORGANIZATION, APPLICATION)
+
+    os.makedirs(base, exist_ok=True)
+    return base
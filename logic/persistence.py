@@ -0,0 +1,117 @@
+# -------------------------------------------------------------
+#  Write-behind settings store
+# -------------------------------------------------------------
+#
+# One shared, in-memory view of the app's QSettings. Reads are served
+# from the cache after the first lookup; writes update the cache right
+# away and are flushed to QSettings on a short debounce from a single
+# background thread. Writing a value that is already stored is a no-op.
+#
+# The store mirrors the QSettings value()/setValue() API so widgets can
+# use it as a drop-in replacement.
+
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, QSettings, QTimer
+
+from logic.paths import ORGANIZATION, APPLICATION
+
+# Dirty keys are written this long after the last change
+FLUSH_DEBOUNCE_MS = 250
+
+_MISSING = object()
+
+
+def _write_values(values: dict):
+    """Runs on the writer thread; each thread needs its own QSettings."""
+    settings = QSettings(ORGANIZATION, APPLICATION)
+    for key, value in values.items():
+        if value is None:
+            settings.remove(key)
+        else:
+            settings.setValue(key, value)
+    settings.sync()
+
+
+class SettingsStore(QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._settings = QSettings(ORGANIZATION, APPLICATION)
+        self._cache = {}
+        self._dirty = {}
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="settings-writer")
+        self._closed = False
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_DEBOUNCE_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # -----------------------------
+    #   READ / WRITE
+    # -----------------------------
+    def value(self, key: str, default=None):
+        cached = self._cache.get(key, _MISSING)
+        if cached is _MISSING:
+            cached = self._settings.value(key, None)
+            self._cache[key] = cached
+        return default if cached is None else cached
+
+    def setValue(self, key: str, value):
+        if value is None or self._cache.get(key, _MISSING) == value:
+            return
+        self._mark_dirty(key, value)
+
+    def remove(self, key: str):
+        if self._cache.get(key, _MISSING) is None:
+            return
+        self._mark_dirty(key, None)
+
+    def _mark_dirty(self, key: str, value):
+        self._cache[key] = value
+        self._dirty[key] = value
+
+        if self._closed:
+            self.flush()
+        else:
+            self._flush_timer.start()
+
+    # -----------------------------
+    #   FLUSHING
+    # -----------------------------
+    def flush(self):
+        """Hand all dirty keys to the writer thread."""
+        self._flush_timer.stop()
+        if not self._dirty:
+            return
+
+        pending, self._dirty = self._dirty, {}
+
+        if self._closed:
+            _write_values(pending)
+        else:
+            self._writer.submit(_write_values, pending)
+
+    def close(self):
+        """Flush everything and wait for the writer. Connected to aboutToQuit."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.shutdown(wait=True)
+        # Closed: anything still dirty is written on this thread
+        self.flush()
+
+
+_store = None
+
+
+def get_settings_store() -> SettingsStore:
+    """Shared app-wide store (created on first use)."""
+    global _store
+    if _store is None:
+        _store = SettingsStore()
+        atexit.register(_store.close)
+    return _store
@@ -0,0 +1,508 @@
+# -------------------------------------------------------------
+#  Append-only pull event log
+# -------------------------------------------------------------
+#
+# Every pull recorded by the Mercy Tracker is appended to a compact
+# binary log (pulls.log in the data directory). The running counters the
+# app shows (pity per rarity, total pulls, last hits) are a pure fold
+# over that log, so they can always be rebuilt from it.
+#
+# A snapshot of the folded state plus the byte offset it covers is
+# written every SNAPSHOT_EVERY events, so startup only replays the tail.
+#
+# The app and the hydra CLI share the log: writes take pulls.lock and
+# first fold in anything the other process appended. The log is only
+# open for the length of one read or write, never held between them,
+# so either process can compact (replace) it, Windows included.
+#
+# Record layout (little endian):
+#   header  <dBBIH  timestamp, shard id, kind id, shard count, hit count
+#   hit     <IB     position in the pull (1-based), rarity id
+#
+# Run `python -m logic.pull_log --help` for the replay/compaction tools.
+
+import os
+import sys
+import json
+import time
+import struct
+import atexit
+from contextlib import contextmanager
+
+from core.rules import HIGHEST_RARITY, RARITIES, SHARDS, SUPPORTED_RARITIES
+from core.pull_state import KINDS, apply_pull, set_hits
+from logic.paths import app_data_dir
+
+
+LOG_MAGIC = b"HPL1"
+LOG_FILE = "pulls.log"
+SNAPSHOT_FILE = "pulls.snapshot.json"
+LOCK_FILE = "pulls.lock"
+# Present once pity saved outside the log has been brought into it
+SEED_MARKER = "pity.seeded"
+
+# Write a fresh snapshot after this many appended events
+SNAPSHOT_EVERY = 1000
+
+_HEADER = struct.Struct("<dBBIH")
+_HIT = struct.Struct("<IB")
+
+_SHARD_IDS = {name: i for i, name in enumerate(SHARDS)}
+_KIND_IDS = {name: i for i, name in enumerate(KINDS)}
+_RARITY_IDS = {name: i for i, name in enumerate(RARITIES)}
+
+
+# -------------------------------------------------------------
+#  Folded state
+# -------------------------------------------------------------
+class PullLogState:
+    """Counters derived from the event log."""
+
+    def __init__(self):
+        self.pity = {s: {r: 0 for r in SUPPORTED_RARITIES[s]} for s in SHARDS}
+        self.shards_pulled = {s: 0 for s in SHARDS}
+        self.hits = {s: {r: 0 for r in SUPPORTED_RARITIES[s]} for s in SHARDS}
+        self.total_pulls = 0
+        self.last_hit = {r: -1 for r in RARITIES}
+        self.events = 0
+
+    def apply(self, shard: str, kind: str, count: int, hits):
+        """
+        Apply one event. Pity follows the same transitions as the
+        trackers (core.pull_state.apply_pull).
+        """
+        self.events += 1
+
+        if kind not in ("reset", "set"):
+            base = self.total_pulls
+            self.total_pulls += count
+            self.shards_pulled[shard] += count
+
+            tracked = self.hits[shard]
+            for pos, rarity in hits:
+                if rarity in tracked:
+                    tracked[rarity] += 1
+                    self.last_hit[rarity] = base + pos
+
+        apply_pull(self.pity[shard], kind, count, hits)
+
+    def to_dict(self) -> dict:
+        return {
+            "pity": self.pity,
+            "shards_pulled": self.shards_pulled,
+            "hits": self.hits,
+            "total_pulls": self.total_pulls,
+            "last_hit": self.last_hit,
+            "events": self.events,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PullLogState":
+        state = cls()
+        for shard in SHARDS:
+            state.pity[shard].update(data.get("pity", {}).get(shard, {}))
+            state.hits[shard].update(data.get("hits", {}).get(shard, {}))
+            state.shards_pulled[shard] = int(data.get("shards_pulled", {}).get(shard, 0))
+        state.last_hit.update(data.get("last_hit", {}))
+        state.total_pulls = int(data.get("total_pulls", 0))
+        state.events = int(data.get("events", 0))
+        return state
+
+
+# -------------------------------------------------------------
+#  Encoding
+# -------------------------------------------------------------
+def encode_event(shard: str, kind: str, count: int, hits=(), timestamp: float | None = None) -> bytes:
+    hits = [(int(pos), rarity) for pos, rarity in hits if rarity in _RARITY_IDS]
+    parts = [
+        _HEADER.pack(
+            time.time() if timestamp is None else timestamp,
+            _SHARD_IDS[shard],
+            _KIND_IDS[kind],
+            int(count),
+            len(hits),
+        )
+    ]
+    for pos, rarity in hits:
+        parts.append(_HIT.pack(pos, _RARITY_IDS[rarity]))
+    return b"".join(parts)
+
+
+def iter_records(data: bytes, offset: int = len(LOG_MAGIC)):
+    """
+    Yield (end_offset, timestamp, shard, kind, count, hits) for every
+    complete record. A torn record at the end of the buffer is ignored.
+    """
+    size = len(data)
+    header_size = _HEADER.size
+    hit_size = _HIT.size
+    unpack_header = _HEADER.unpack_from
+    unpack_hit = _HIT.unpack_from
+
+    while offset + header_size <= size:
+        ts, shard_id, kind_id, count, n_hits = unpack_header(data, offset)
+        end = offset + header_size + n_hits * hit_size
+        if end > size:
+            break
+
+        hits = []
+        pos_offset = offset + header_size
+        for _ in range(n_hits):
+            pos, rarity_id = unpack_hit(data, pos_offset)
+            hits.append((pos, RARITIES[rarity_id]))
+            pos_offset += hit_size
+
+        yield end, ts, SHARDS[shard_id], KINDS[kind_id], count, hits
+        offset = end
+
+
+# -------------------------------------------------------------
+#  Cross-process lock
+# -------------------------------------------------------------
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive advisory lock on a small lock file (blocks until free)."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# -------------------------------------------------------------
+#  Log file
+# -------------------------------------------------------------
+class PullLog:
+    def __init__(self, directory: str | None = None, snapshot_every: int = SNAPSHOT_EVERY):
+        directory = directory or app_data_dir()
+        self.directory = directory
+        self.path = os.path.join(directory, LOG_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.lock_path = os.path.join(directory, LOCK_FILE)
+        self.snapshot_every = snapshot_every
+
+        self._state = None
+        self._offset = 0
+        self._since_snapshot = 0
+        # (device, inode) of the log file the state was folded from
+        self._log_id = None
+        self._lock_depth = 0
+
+    @contextmanager
+    def locked(self):
+        """Hold the cross-process log lock (re-entrant within this object)."""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        with _file_lock(self.lock_path):
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+
+    # -----------------------------
+    #   LOADING
+    # -----------------------------
+    @property
+    def state(self) -> PullLogState:
+        """Current counters: last snapshot plus a replay of the log tail."""
+        if self._state is None:
+            self._load()
+        return self._state
+
+    def _read_log(self) -> bytes:
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return LOG_MAGIC
+        if not data.startswith(LOG_MAGIC):
+            raise ValueError(f"{self.path} is not a Hydra Companion pull log")
+        return data
+
+    def _file_id(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_dev, st.st_ino
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            return int(snap["offset"]), PullLogState.from_dict(snap["state"])
+        except Exception:
+            return len(LOG_MAGIC), PullLogState()
+
+    def _load(self):
+        self._log_id = self._file_id()
+        data = self._read_log()
+        offset, state = self._load_snapshot()
+
+        if offset > len(data):
+            # Snapshot is ahead of the log (log replaced or truncated)
+            offset, state = len(LOG_MAGIC), PullLogState()
+
+        for end, _, shard, kind, count, hits in iter_records(data, offset):
+            state.apply(shard, kind, count, hits)
+            offset = end
+            self._since_snapshot += 1
+
+        self._state = state
+        self._offset = offset
+
+    def refresh(self) -> PullLogState:
+        """
+        Fold in events another process appended since the last look. A
+        log that was replaced (compacted elsewhere) is reloaded from scratch.
+        """
+        if self._state is None:
+            return self.state
+
+        if self._file_id() != self._log_id:
+            self._reopen()
+            return self.state
+
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                tail = f.read()
+        except FileNotFoundError:
+            return self._state
+
+        consumed = 0
+        for end, _, shard, kind, count, hits in iter_records(tail, 0):
+            self._state.apply(shard, kind, count, hits)
+            self._since_snapshot += 1
+            consumed = end
+        self._offset += consumed
+        return self._state
+
+    def _reopen(self):
+        self._state = None
+        self._since_snapshot = 0
+        self._load()
+
+    def replay(self) -> PullLogState:
+        """Fold the whole log from the beginning, ignoring the snapshot."""
+        state = PullLogState()
+        for _, _, shard, kind, count, hits in iter_records(self._read_log()):
+            state.apply(shard, kind, count, hits)
+        return state
+
+    def iter_events(self):
+        """Yield every event as a dict (oldest first)."""
+        for _, ts, shard, kind, count, hits in iter_records(self._read_log()):
+            yield {"timestamp": ts, "shard": shard, "kind": kind, "count": count, "hits": hits}
+
+    # -----------------------------
+    #   APPENDING
+    # -----------------------------
+    def _open_for_append(self):
+        """Open the log for one write (created if missing). Caller holds the lock."""
+        if not os.path.exists(self.path):
+            with open(self.path, "wb") as f:
+                f.write(LOG_MAGIC)
+            self._log_id = self._file_id()
+            self._offset = len(LOG_MAGIC)
+
+        return open(self.path, "r+b")
+
+    def _write_records(self, events) -> int:
+        """Append (shard, kind, count, hits, timestamp) events under the lock."""
+        written = 0
+        with self.locked():
+            self.refresh()
+            with self._open_for_append() as f:
+                # Drop a torn record left behind by a crash
+                if f.seek(0, os.SEEK_END) != self._offset:
+                    f.truncate(self._offset)
+                    f.seek(self._offset)
+
+                for shard, kind, count, hits, timestamp in events:
+                    supported = SUPPORTED_RARITIES[shard]
+                    hits = [(int(pos), rarity) for pos, rarity in hits if rarity in supported]
+                    record = encode_event(shard, kind, count, hits, timestamp)
+                    f.write(record)
+
+                    self._offset += len(record)
+                    self._state.apply(shard, kind, int(count), hits)
+                    self._since_snapshot += 1
+                    written += 1
+
+            if self._since_snapshot >= self.snapshot_every:
+                self.snapshot()
+        return written
+
+    def append(self, shard: str, kind: str, count: int = 0, hits=(), timestamp: float | None = None) -> PullLogState:
+        """Record one event and return the updated counters."""
+        self._write_records([(shard, kind, count, hits, timestamp)])
+        return self._state
+
+    def append_many(self, events) -> int:
+        """
+        Record (shard, kind, count, hits, timestamp) events in one locked
+        write. Returns the number of events appended.
+        """
+        return self._write_records(events)
+
+    # -----------------------------
+    #   SNAPSHOTS + COMPACTION
+    # -----------------------------
+    def snapshot(self):
+        """Persist the folded state and the log offset it covers."""
+        with self.locked():
+            state = self.refresh()
+            tmp = self.snapshot_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"offset": self._offset, "state": state.to_dict()}, f, separators=(",", ":"))
+            os.replace(tmp, self.snapshot_path)
+            self._since_snapshot = 0
+
+    def compact(self) -> tuple[int, int]:
+        """
+        Rewrite the log, merging runs of consecutive hitless pulls on the
+        same shard into one custom event. Pity, hits, shards pulled, total
+        pulls and last hit positions are preserved. What is discarded: the
+        event count drops, and a merged run keeps only the timestamp of its
+        last pull, so an export shows one custom pull in its place.
+        Returns (events before, events after).
+        """
+        with self.locked():
+            merged = []
+            before = 0
+            for _, ts, shard, kind, count, hits in iter_records(self._read_log()):
+                before += 1
+                prev = merged[-1] if merged else None
+                if (
+                    not hits
+                    and kind in ("single", "ten", "custom")
+                    and prev is not None
+                    and not prev[4]
+                    and prev[1] == shard
+                    and prev[2] in ("single", "ten", "custom")
+                ):
+                    merged[-1] = (ts, shard, "custom", prev[3] + count, [])
+                else:
+                    merged.append((ts, shard, kind, count, hits))
+
+            tmp = self.path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(LOG_MAGIC)
+                for ts, shard, kind, count, hits in merged:
+                    f.write(encode_event(shard, kind, count, hits, timestamp=ts))
+
+            # The old snapshot's offset means nothing in the new file
+            try:
+                os.remove(self.snapshot_path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, self.path)
+
+            self._reopen()
+            self.snapshot()
+        return before, len(merged)
+
+    def close(self):
+        if self._state is not None and self._since_snapshot:
+            self.snapshot()
+
+
+def seed_pity(log: PullLog, stored: dict) -> list[str]:
+    """
+    Once per data directory, bring top-rarity pity that was saved outside
+    the log ({shard: value or None}, e.g. the app settings from before the
+    log existed) into it as set events. Returns the shards corrected.
+    """
+    marker = os.path.join(log.directory, SEED_MARKER)
+    if os.path.exists(marker):
+        return []
+
+    with log.locked():
+        if os.path.exists(marker):
+            return []
+
+        state = log.refresh()
+        events = []
+        for shard, value in stored.items():
+            if value is None:
+                continue
+            top = HIGHEST_RARITY[shard]
+            if int(value) != state.pity[shard][top]:
+                events.append((shard, "set", 0, set_hits({top: int(value)}), None))
+
+        if events:
+            log.append_many(events)
+        with open(marker, "w", encoding="utf-8"):
+            pass
+
+    return [shard for shard, *_ in events]
+
+
+_log = None
+
+
+def get_pull_log() -> PullLog:
+    """Shared log for the running app (opened on first use)."""
+    global _log
+    if _log is None:
+        _log = PullLog()
+        atexit.register(_log.close)
+    return _log
+
+
+# -------------------------------------------------------------
+#  Command line
+# -------------------------------------------------------------
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m logic.pull_log", description="Hydra Companion pull log tools")
+    parser.add_argument("--dir", help="data directory (defaults to the app data folder)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("state", help="print counters (snapshot + tail replay)")
+    sub.add_parser("replay", help="print counters from a full replay")
+    sub.add_parser("snapshot", help="write a fresh snapshot")
+    sub.add_parser("compact", help="merge hitless pull runs and rewrite the log")
+    args = parser.parse_args(argv)
+
+    log = PullLog(args.dir)
+    if args.command == "state":
+        print(json.dumps(log.state.to_dict(), indent=4))
+    elif args.command == "replay":
+        started = time.perf_counter()
+        state = log.replay()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(json.dumps(state.to_dict(), indent=4))
+        print(f"Replayed {state.events} events in {elapsed:.1f} ms", file=sys.stderr)
+    elif args.command == "snapshot":
+        log.snapshot()
+        print(f"Snapshot written at offset {log._offset}")
+    elif args.command == "compact":
+        before, after = log.compact()
+        print(f"Compacted {before} events into {after}")
+
+
+if __name__ == "__main__":
+    main()
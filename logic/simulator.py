@@ -0,0 +1,318 @@
+# -------------------------------------------------------------
+#  Monte Carlo pull simulator
+# -------------------------------------------------------------
+#
+# Simulates many independent players ("trials") opening the same number
+# of shards, one NumPy step per pull across every trial at once. Each
+# pull uses the compiled mercy tables for the shard, so soft/hard pity
+# apply exactly as in the tracker, and a hit resets its own pity and the
+# pity of every lower rarity the shard tracks (linked resets).
+#
+# One uniform roll decides each pull: the top rarity wins below its
+# chance, the linked rarity below the sum of both chances.
+#
+# Large runs are cut into fixed-size chunks of trials. Chunk i always
+# draws from child i of the run's SeedSequence and only integer
+# histograms are merged, so a seeded run gives bit-identical results
+# whether it uses one worker process or sixteen.
+
+import os
+import queue
+import multiprocessing
+from itertools import islice
+
+import numpy as np
+
+from logic.mercy import rarity_tables
+
+# Uniform rolls are drawn in blocks of about this many values
+ROLL_BLOCK = 1 << 20
+
+# Trials per chunk; part of the seeding scheme, so changing it changes results
+CHUNK_TRIALS = 25_000
+
+# How often a multi-process run checks its checkpoint while chunks run
+POLL_INTERVAL_S = 0.05
+
+
+class SimulationCancelled(Exception):
+    """Raised from a checkpoint callback to stop a running simulation."""
+
+
+class SimulationResult:
+    """
+    Outcome arrays for one simulation. Every per-trial array has one
+    entry per trial:
+
+      hits[rarity]        number of hits of that rarity
+      final_pity[rarity]  pity left after the last shard
+      first_hit           1-based pull of the first top-rarity hit, 0 if none
+      outcomes            (trials, shards) int8, 0 for no hit, otherwise
+                          1 + index into `rarities`; only when recorded
+    """
+
+    def __init__(self, shard, shards, trials, rarities, hits, final_pity, first_hit, outcomes=None):
+        self.shard = shard
+        self.shards = shards
+        self.trials = trials
+        self.rarities = rarities
+        self.top_rarity = rarities[-1]
+        self.hits = hits
+        self.final_pity = final_pity
+        self.first_hit = first_hit
+        self.outcomes = outcomes
+
+    @property
+    def total_pulls(self) -> int:
+        return self.shards * self.trials
+
+    def histogram(self, rarity: str | None = None) -> np.ndarray:
+        """counts[n] = number of trials with exactly n hits of the rarity."""
+        return np.bincount(self.hits[rarity or self.top_rarity])
+
+    def mean(self, rarity: str | None = None) -> float:
+        return float(self.hits[rarity or self.top_rarity].mean())
+
+    def chance_at_least(self, n: int = 1, rarity: str | None = None) -> float:
+        return float(np.count_nonzero(self.hits[rarity or self.top_rarity] >= n) / self.trials)
+
+
+def simulate(
+    shard: str,
+    shards: int,
+    trials: int = 10_000,
+    seed=None,
+    start_pity: dict | None = None,
+    record_outcomes: bool = False,
+    checkpoint=None,
+) -> SimulationResult:
+    """
+    Open `shards` shards in each of `trials` independent runs.
+    start_pity maps rarity -> pity every run starts from (default 0).
+    checkpoint(step) is called before each block of rolls; it may block
+    to pause the run or raise SimulationCancelled to stop it.
+    """
+    tables = rarity_tables(shard)
+    rarities = tuple(t.rarity for t in tables)
+    start_pity = start_pity or {}
+    rng = np.random.default_rng(seed)
+
+    # Highest rarity first: its roll threshold comes first
+    order = range(len(tables) - 1, -1, -1)
+    chances = [tables[i].chance / 100.0 for i in order]
+    pity = [np.full(trials, tables[i].index(start_pity.get(tables[i].rarity, 0)), dtype=np.int64) for i in order]
+    hits = [np.zeros(trials, dtype=np.int32) for _ in order]
+
+    first_hit = np.zeros(trials, dtype=np.int32)
+    outcomes = np.zeros((shards, trials), dtype=np.int8) if record_outcomes else None
+
+    rows = max(1, min(shards, ROLL_BLOCK // max(1, trials)))
+    threshold = np.empty(trials)
+    rolls = None
+
+    for step in range(shards):
+        if step % rows == 0:
+            if checkpoint is not None:
+                checkpoint(step)
+            rolls = rng.random((min(rows, shards - step), trials))
+        u = rolls[step % rows]
+
+        # won[j] means the roll landed on rarity j or anything above it
+        threshold.fill(0.0)
+        above = None
+        for j, (chance, p) in enumerate(zip(chances, pity)):
+            threshold += chance[p]
+            won = u < threshold
+
+            if above is None:
+                landed = won
+                first_hit[won & (first_hit == 0)] = step + 1
+            else:
+                landed = won & ~above
+            hits[j] += landed
+            if outcomes is not None:
+                outcomes[step][landed] = len(tables) - j
+
+            # A hit of this rarity or any higher one resets this pity
+            p += 1
+            p[won] = 0
+            above = won
+
+    final_pity = {}
+    hit_counts = {}
+    for j, i in enumerate(order):
+        hit_counts[tables[i].rarity] = hits[j]
+        final_pity[tables[i].rarity] = pity[j]
+
+    return SimulationResult(
+        shard,
+        shards,
+        trials,
+        rarities,
+        hit_counts,
+        final_pity,
+        first_hit,
+        None if outcomes is None else outcomes.T,
+    )
+
+
+# -------------------------------------------------------------
+#  Chunked / multi-core runs
+# -------------------------------------------------------------
+class SimulationSummary:
+    """
+    Merged histograms of a chunked run. Same read API as
+    SimulationResult, without the per-trial arrays:
+
+      hit_histograms[rarity][n]  trials with exactly n hits of the rarity
+      first_hit_histogram[k]     trials whose first top-rarity hit was pull k
+                                 (k = 0: no hit)
+    """
+
+    def __init__(self, shard, shards, rarities, entropy):
+        self.shard = shard
+        self.shards = shards
+        self.rarities = rarities
+        self.top_rarity = rarities[-1]
+        self.entropy = entropy
+        self.trials = 0
+        self.hit_histograms = {r: np.zeros(shards + 1, dtype=np.int64) for r in rarities}
+        self.first_hit_histogram = np.zeros(shards + 1, dtype=np.int64)
+
+    @property
+    def total_pulls(self) -> int:
+        return self.shards * self.trials
+
+    def copy(self) -> "SimulationSummary":
+        """Independent snapshot, safe to hand to another thread."""
+        other = SimulationSummary(self.shard, self.shards, self.rarities, self.entropy)
+        other.merge(
+            {"trials": self.trials, "hits": self.hit_histograms, "first_hit": self.first_hit_histogram}
+        )
+        return other
+
+    def merge(self, partial: dict):
+        """Add one chunk's counts (integer sums, so merge order never matters)."""
+        self.trials += partial["trials"]
+        for rarity, counts in partial["hits"].items():
+            self.hit_histograms[rarity] += counts
+        self.first_hit_histogram += partial["first_hit"]
+
+    def histogram(self, rarity: str | None = None) -> np.ndarray:
+        counts = self.hit_histograms[rarity or self.top_rarity]
+        used = np.flatnonzero(counts)
+        return counts[: used[-1] + 1] if len(used) else counts[:1]
+
+    def mean(self, rarity: str | None = None) -> float:
+        counts = self.hit_histograms[rarity or self.top_rarity]
+        return float(np.dot(np.arange(len(counts)), counts) / max(1, self.trials))
+
+    def chance_at_least(self, n: int = 1, rarity: str | None = None) -> float:
+        counts = self.hit_histograms[rarity or self.top_rarity]
+        return float(counts[n:].sum() / max(1, self.trials))
+
+
+def _chunk_sizes(trials: int) -> list[int]:
+    full, rest = divmod(trials, CHUNK_TRIALS)
+    return [CHUNK_TRIALS] * full + ([rest] if rest else [])
+
+
+def simulate_chunk(shard, shards, trials, seed_seq, start_pity=None, checkpoint=None) -> dict:
+    """Run one chunk and reduce it to histograms (runs in a worker process)."""
+    result = simulate(shard, shards, trials, seed=seed_seq, start_pity=start_pity, checkpoint=checkpoint)
+    return {
+        "trials": trials,
+        "hits": {r: np.bincount(h, minlength=shards + 1) for r, h in result.hits.items()},
+        "first_hit": np.bincount(result.first_hit, minlength=shards + 1),
+    }
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def iter_simulation(
+    shard: str,
+    shards: int,
+    trials: int,
+    seed=None,
+    start_pity: dict | None = None,
+    workers: int | None = None,
+    checkpoint=None,
+):
+    """
+    Yield the merged SimulationSummary after each finished chunk. The
+    last summary covers every trial; pass summary.entropy back as the
+    seed to repeat an unseeded run.
+
+    Chunks are submitted only as earlier ones finish, so a consumer that
+    stops iterating also stops new work. checkpoint is forwarded to
+    simulate() when chunks run in this process, and called every
+    POLL_INTERVAL_S while waiting on worker processes; raising from it
+    stops the run and terminates chunks still running.
+    """
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    sizes = _chunk_sizes(trials)
+    children = root.spawn(len(sizes))
+    rarities = tuple(t.rarity for t in rarity_tables(shard))
+    summary = SimulationSummary(shard, shards, rarities, root.entropy)
+
+    workers = max(1, min(workers or default_workers(), len(sizes)))
+    if workers == 1:
+        for size, child in zip(sizes, children):
+            summary.merge(simulate_chunk(shard, shards, size, child, start_pity, checkpoint))
+            yield summary
+        return
+
+    # spawn: forking a process that runs Qt threads is not safe
+    context = multiprocessing.get_context("spawn")
+    finished = queue.SimpleQueue()
+    jobs = iter(zip(sizes, children))
+
+    # Leaving the with block terminates the workers, so an abandoned run
+    # neither waits for chunks still running nor leaves them behind
+    with context.Pool(workers) as pool:
+
+        def submit(count: int) -> int:
+            started = 0
+            for size, child in islice(jobs, count):
+                pool.apply_async(
+                    simulate_chunk,
+                    (shard, shards, size, child, start_pity),
+                    callback=finished.put,
+                    error_callback=finished.put,
+                )
+                started += 1
+            return started
+
+        # Keep every worker busy with one queued chunk behind it
+        in_flight = submit(2 * workers)
+        while in_flight:
+            if checkpoint is not None:
+                checkpoint(0)
+            try:
+                partial = finished.get(timeout=POLL_INTERVAL_S)
+            except queue.Empty:
+                continue
+
+            in_flight -= 1
+            if isinstance(partial, BaseException):
+                raise partial
+            in_flight += submit(1)
+            summary.merge(partial)
+            yield summary
+
+
+def run_simulation(
+    shard: str,
+    shards: int,
+    trials: int,
+    seed=None,
+    start_pity: dict | None = None,
+    workers: int | None = None,
+) -> SimulationSummary:
+    """Chunked run across `workers` processes (default: every core)."""
+    summary = None
+    for summary in iter_simulation(shard, shards, trials, seed, start_pity, workers):
+        pass
+    return summary
@@ -0,0 +1,245 @@
+# -------------------------------------------------------------
+#  Span timing
+# -------------------------------------------------------------
+#
+# Lightweight wall-clock spans for startup phases and the per-pull
+# refresh path. Off by default: span() then hands back one shared no-op
+# context manager, so instrumented code pays a flag check and nothing
+# else.
+#
+# Enable with HYDRA_TRACE=1 (summary on stderr at exit) or
+# HYDRA_TRACE=<file.json> (summary plus a Chrome-trace dump), or with
+# the app's --trace[=FILE] flag. Finished spans go into a bounded ring
+# buffer; open the dump in chrome://tracing or https://ui.perfetto.dev,
+# or summarise it with:
+#
+#     python -m logic.tracing trace.json
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import threading
+from collections import deque
+from functools import wraps
+
+
+TRACE_ENV = "HYDRA_TRACE"
+
+# Finished spans kept in memory; older ones are dropped first
+DEFAULT_CAPACITY = 20_000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_cat", "_args", "_start")
+
+    def __init__(self, tracer, name, cat, args):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._tracer.record(self._name, self._start, cat=self._cat, args=self._args)
+        return False
+
+
+class Tracer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.enabled = False
+        self.output_path = None
+        self._events = deque(maxlen=capacity)
+        self._origin = time.perf_counter_ns()
+        self._exit_hook = False
+
+    # -----------------------------
+    #   SWITCH
+    # -----------------------------
+    def enable(self, output_path: str | None = None):
+        """Start recording; with output_path, dump a Chrome trace at exit."""
+        self.enabled = True
+        if output_path:
+            self.output_path = output_path
+        if not self._exit_hook:
+            self._exit_hook = True
+            atexit.register(self._finish)
+
+    def disable(self):
+        self.enabled = False
+
+    def configure_from_env(self):
+        value = os.environ.get(TRACE_ENV, "").strip()
+        if not value or value.lower() in ("0", "false", "no", "off"):
+            return
+        self.enable(None if value.lower() in ("1", "true", "yes", "on") else value)
+
+    # -----------------------------
+    #   RECORDING
+    # -----------------------------
+    @staticmethod
+    def now() -> int:
+        return time.perf_counter_ns()
+
+    def span(self, name: str, cat: str = "app", **args):
+        """Context manager timing the enclosed block."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def traced(self, name: str | None = None, cat: str = "app"):
+        """Decorator timing every call of the wrapped function."""
+        def decorate(func):
+            label = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, start, cat=cat)
+
+            return wrapper
+
+        return decorate
+
+    def record(self, name: str, start_ns: int, end_ns: int | None = None,
+               cat: str = "app", args: dict | None = None):
+        """Store a finished span measured with now()."""
+        if not self.enabled:
+            return
+        if end_ns is None:
+            end_ns = time.perf_counter_ns()
+        self._events.append(
+            (name, cat, start_ns, end_ns - start_ns, threading.get_ident(), args or None)
+        )
+
+    def clear(self):
+        self._events.clear()
+
+    # -----------------------------
+    #   OUTPUT
+    # -----------------------------
+    def spans(self) -> list:
+        return list(self._events)
+
+    def to_chrome_trace(self) -> dict:
+        """The buffer as Chrome trace-event JSON ("X" complete events, µs)."""
+        pid = os.getpid()
+        events = []
+        for name, cat, start, dur, tid, args in list(self._events):
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000.0,
+                "dur": dur / 1000.0,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, separators=(",", ":"))
+
+    def summary(self) -> str:
+        return format_summary(
+            (name, dur / 1000.0) for name, _cat, _start, dur, _tid, _args in list(self._events)
+        )
+
+    def _finish(self):
+        if not self.enabled or not self._events:
+            return
+        print(self.summary(), file=sys.stderr)
+        if self.output_path:
+            try:
+                self.dump(self.output_path)
+            except OSError as exc:
+                print(f"Could not write trace to {self.output_path}: {exc}", file=sys.stderr)
+            else:
+                print(f"Trace written to {self.output_path}", file=sys.stderr)
+
+
+def format_summary(samples) -> str:
+    """Per-name count / total / mean / max table from (name, dur_us) pairs."""
+    stats = {}
+    for name, dur in samples:
+        entry = stats.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += dur
+        entry[2] = max(entry[2], dur)
+
+    width = max([len(name) for name in stats] + [4])
+    lines = [f"{'span':<{width}}  {'count':>6}  {'total ms':>9}  {'mean ms':>8}  {'max ms':>8}"]
+    for name, (count, total, peak) in sorted(stats.items(), key=lambda item: -item[1][1]):
+        lines.append(
+            f"{name:<{width}}  {count:>6}  {total / 1000:>9.2f}  "
+            f"{total / count / 1000:>8.3f}  {peak / 1000:>8.3f}"
+        )
+    return "\n".join(lines)
+
+
+# Shared tracer (configured from HYDRA_TRACE on import)
+_tracer = Tracer()
+_tracer.configure_from_env()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str, cat: str = "app", **args):
+    return _tracer.span(name, cat, **args)
+
+
+def traced(name: str | None = None, cat: str = "app"):
+    return _tracer.traced(name, cat)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m logic.tracing",
+        description="Summarise a Chrome-trace JSON file written by Hydra Companion.",
+    )
+    parser.add_argument("trace", help="trace file (HYDRA_TRACE=<file> or --trace=<file>)")
+    args = parser.parse_args(argv)
+
+    with open(args.trace, encoding="utf-8") as f:
+        data = json.load(f)
+
+    events = data.get("traceEvents", data) if isinstance(data, dict) else data
+    print(format_summary(
+        (event["name"], float(event.get("dur", 0.0)))
+        for event in events
+        if event.get("ph") == "X"
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
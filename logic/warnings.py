@@ -1,12 +1,7 @@
-from PySide6.QtWidgets import QMessageBox
+# The checks themselves are Qt-free (core/rules.py); only the popup needs
+# Qt, so QMessageBox is imported when a warning is actually shown
+from core.rules import tracking_problem
 
-# Highest rarity per shard
-HIGHEST_RARITY = {
-    "Ancient": "Legendary",
-    "Void": "Legendary",
-    "Primal": "Mythical",
-    "Sacred": "Legendary"
-}
 
 def check_hard_pity_and_chance(shard_name, current_pity, hard_pity, current_chance):
     """
@@ -16,37 +11,25 @@ def check_hard_pity_and_chance(shard_name, current_pity, hard_pity, current_chan
     current_chance: float  -> current % chance for highest rarity
     """
 
-    highest_rarity = HIGHEST_RARITY.get(shard_name, "Unknown")
-
-    # Condition 1: Exceeded hard pity
-    if current_pity > hard_pity:
-        show_warning_popup(
-            title="Incorrect Pull Tracking Detected",
-            message=(
-                f"Hello User!\n\n"
-                f"You have surpassed the Hard Pity Level for {highest_rarity} "
-                f"on the {shard_name} shard.\n\n"
-                f"This indicates that the correct number of pulls has not been accurately recorded."
-            )
-        )
+    problem = tracking_problem(shard_name, current_pity, hard_pity, current_chance)
+    if problem is None:
         return
 
-    # Condition 2: Chance exceeded 100%
-    if current_chance > 100:
-        show_warning_popup(
-            title="Incorrect Pull Tracking Detected",
-            message=(
-                f"Hello User!\n\n"
-                f"Your {highest_rarity} chance for the {shard_name} shard has exceeded 100%.\n\n"
-                f"This indicates that the correct number of pulls has not been accurately recorded."
-            )
+    show_warning_popup(
+        title="Incorrect Pull Tracking Detected",
+        message=(
+            f"Hello User!\n\n"
+            f"{problem}\n\n"
+            f"This indicates that the correct number of pulls has not been accurately recorded."
         )
-        return
+    )
 
 
 def show_warning_popup(title, message):
+    from PySide6.QtWidgets import QMessageBox
+
     popup = QMessageBox()
     popup.setIcon(QMessageBox.Warning)
     popup.setWindowTitle(title)
     popup.setText(message)
-    popup.exec()
\ No newline at end of file
+    popup.exec()
@@ -0,0 +1,30 @@
+from logic.history_store import PullHistoryRepository
+from ui import activity_feed
+from ui.activity_feed import ActivityModel, RarityRole
+
+
+def _rows(model):
+    return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+
+def test_feed_pages_older_hits_and_adds_live_ones_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(activity_feed, "FETCH_PAGE", 2)
+    history = PullHistoryRepository(str(tmp_path / "history.sqlite3"))
+    history.record_pull("Ancient", "single", 1, [(1, "Epic")], timestamp=2000.0)
+    history.record_pull("Void", "single", 1, [(1, "Legendary")], timestamp=2001.0)
+    history.record_pull("Ancient", "single", 1, [(1, "Legendary")], timestamp=1000.0)
+
+    model = ActivityModel(history)
+
+    # A hit logged before the view asked for any history
+    history.record_pull("Primal", "ten", 10, [(4, "Mythical")])
+    model.fetch_new()
+
+    while model.canFetchMore():
+        model.fetchMore()
+
+    rows = _rows(model)
+    assert len(rows) == 4
+    assert rows[0].endswith("Primal: Mythical at pity 4")
+    assert [model.index(row, 0).data(RarityRole) for row in range(1, 4)] == ["Legendary", "Epic", "Legendary"]
+    history.close()
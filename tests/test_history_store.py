@@ -0,0 +1,40 @@
+from logic.history_store import PullHistoryRepository
+
+
+def test_pity_at_hit_runs_across_a_multi_hit_pull(tmp_path):
+    history = PullHistoryRepository(str(tmp_path / "history.sqlite3"))
+
+    history.record_pull(
+        "Ancient", "custom", 300,
+        [(250, "Legendary"), (50, "Legendary"), (120, "Epic")],
+        {"Epic": 10, "Legendary": 100},
+    )
+
+    hits = sorted((h["position"], h["rarity"], h["pity_at_hit"]) for h in history.recent_hits())
+    assert hits == [(50, "Legendary", 150), (120, "Epic", 130), (250, "Legendary", 200)]
+
+    stats = history.pity_at_hit_stats("Ancient", "Legendary")
+    assert (stats["min"], stats["max"], stats["average"]) == (150, 200, 175.0)
+    history.close()
+
+
+def test_recent_hits_pages_through_out_of_order_timestamps(tmp_path):
+    history = PullHistoryRepository(str(tmp_path / "history.sqlite3"))
+
+    # Two live pulls, then an import of older history (later ids, older ts)
+    history.record_pull("Ancient", "single", 1, [(1, "Epic")], timestamp=2000.0)
+    history.record_pull("Void", "single", 1, [(1, "Legendary")], timestamp=2001.0)
+    history.record_pull("Ancient", "single", 1, [(1, "Legendary")], timestamp=1000.0)
+    history.record_pull("Primal", "single", 1, [(1, "Mythical")], timestamp=1001.0)
+
+    seen = []
+    before = None
+    while True:
+        page = history.recent_hits(limit=1, before=before)
+        if not page:
+            break
+        seen.extend(hit["timestamp"] for hit in page)
+        before = (page[-1]["timestamp"], page[-1]["id"])
+
+    assert seen == [2001.0, 2000.0, 1001.0, 1000.0]
+    history.close()
@@ -0,0 +1,62 @@
+import os
+
+from logic.pull_log import LOG_MAGIC, PullLog, encode_event
+
+
+def _fill(log):
+    log.append("Ancient", "ten", 10, [(4, "Epic")], timestamp=1.0)
+    log.append("Ancient", "single", 1, timestamp=2.0)
+    log.append("Ancient", "single", 1, timestamp=3.0)
+    log.append("Ancient", "ten", 10, timestamp=4.0)
+    log.append("Void", "custom", 25, [(7, "Legendary"), (20, "Epic")], timestamp=5.0)
+    log.append("Ancient", "custom", 30, timestamp=6.0)
+    log.append("Sacred", "set", 0, [(40, "Legendary")], timestamp=7.0)
+    log.append("Ancient", "single", 1, [(1, "Legendary")], timestamp=8.0)
+
+
+def test_snapshot_plus_tail_matches_full_replay(tmp_path):
+    log = PullLog(str(tmp_path), snapshot_every=3)
+    _fill(log)
+    assert os.path.exists(log.snapshot_path)
+
+    reopened = PullLog(str(tmp_path))
+    assert reopened.state.to_dict() == reopened.replay().to_dict()
+    assert reopened.state.events == 8
+
+
+def test_torn_trailing_record_is_truncated(tmp_path):
+    log = PullLog(str(tmp_path))
+    _fill(log)
+    intact = os.path.getsize(log.path)
+
+    with open(log.path, "ab") as f:
+        f.write(encode_event("Void", "ten", 10, [(3, "Epic")])[:-2])
+
+    reopened = PullLog(str(tmp_path))
+    assert reopened.state.events == 8
+
+    reopened.append("Void", "single", 1, timestamp=9.0)
+    assert os.path.getsize(log.path) == intact + len(encode_event("Void", "single", 1))
+    events = list(reopened.iter_events())
+    assert len(events) == 9
+    assert (events[-1]["shard"], events[-1]["kind"]) == ("Void", "single")
+
+
+def test_compact_keeps_counters(tmp_path):
+    # The snapshot written mid-way points into the log being replaced
+    log = PullLog(str(tmp_path), snapshot_every=3)
+    _fill(log)
+    before = log.replay()
+
+    assert log.compact() == (8, 6)
+
+    after = log.replay()
+    assert after.pity == before.pity
+    assert after.hits == before.hits
+    assert after.total_pulls == before.total_pulls
+    assert after.shards_pulled == before.shards_pulled
+    assert after.last_hit == before.last_hit
+    assert log.state.to_dict() == after.to_dict()
+
+    with open(log.path, "rb") as f:
+        assert f.read(len(LOG_MAGIC)) == LOG_MAGIC
@@ -0,0 +1,18 @@
+import numpy as np
+
+from logic import simulator
+from logic.simulator import run_simulation
+
+
+def test_seeded_run_is_identical_across_worker_counts(monkeypatch):
+    # Small chunks so three workers really share the run
+    monkeypatch.setattr(simulator, "CHUNK_TRIALS", 500)
+
+    single = run_simulation("Ancient", 40, 2600, seed=1234, workers=1)
+    several = run_simulation("Ancient", 40, 2600, seed=1234, workers=3)
+
+    assert several.trials == single.trials == 2600
+    for rarity in single.rarities:
+        assert np.array_equal(several.hit_histograms[rarity], single.hit_histograms[rarity])
+    assert np.array_equal(several.first_hit_histogram, single.first_hit_histogram)
+
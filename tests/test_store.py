@@ -0,0 +1,83 @@
+import pytest
+
+from core.store import Store
+from logic import mercy
+from logic.app_state import build_store, chance_key, eta_key, hits_key, pity_key, primary_key
+
+
+def test_batch_rolls_back_when_the_block_raises():
+    store = Store({"a": 1, "b": 2})
+    calls = []
+    store.subscribe(["a", "b"], calls.append)
+
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.set("a", 10)
+            store.set("c", 3)
+            raise RuntimeError
+
+    assert (store.get("a"), store.get("b"), store.get("c")) == (1, 2, None)
+    assert calls == []
+
+    # The next commit carries only its own writes
+    store.set("b", 20)
+    assert calls == [{"b": 20}]
+
+
+def test_subscribers_are_called_once_per_batch_with_their_keys():
+    store = Store({"a": 0, "b": 0, "c": 0})
+    ab, c = [], []
+    store.subscribe(["a", "b"], ab.append)
+    store.subscribe("c", c.append)
+
+    with store.batch():
+        store.set("a", 1)
+        store.set("a", 2)
+        with store.batch():
+            store.set("b", 1)
+        store.set("c", 0)  # unchanged
+
+    assert ab == [{"a": 2, "b": 1}]
+    assert c == []
+
+
+def test_derived_values_recompute_once_and_notify_on_change():
+    store = Store({"pity": {"Legendary": 3, "Epic": 1}})
+    computed = []
+
+    def top(pity):
+        computed.append(pity)
+        return pity["Legendary"]
+
+    store.derive("top", ["pity"], top)
+    seen = []
+    store.subscribe("top", seen.append)
+
+    assert store.get("top") == store.get("top") == 3
+    assert len(computed) == 1
+
+    # Epic moved, Legendary did not: recomputed, but nothing to report
+    store.set("pity", {"Legendary": 3, "Epic": 0})
+    assert seen == []
+
+    store.set("pity", {"Legendary": 4, "Epic": 0})
+    assert seen == [{"top": 4}]
+
+    with pytest.raises(KeyError):
+        store.set("top", 5)
+
+
+def test_app_store_derives_chance_and_eta_from_pity():
+    store = build_store()
+    changes = []
+    store.subscribe([chance_key("Ancient"), eta_key("Ancient")], changes.append)
+
+    with store.batch():
+        store.set(pity_key("Ancient"), {"Epic": 0, "Legendary": 210})
+        store.set(hits_key("Ancient"), {"Epic": 1, "Legendary": 0})
+
+    assert store.get(primary_key("Ancient")) == 210
+    assert store.get(chance_key("Ancient")) == mercy.get_table("Ancient").chance_at(210)
+    assert store.get(eta_key("Ancient")).expected == mercy.pulls_distribution("Ancient", 210).expected
+    assert len(changes) == 1
+    assert set(changes[0]) == {chance_key("Ancient"), eta_key("Ancient")}
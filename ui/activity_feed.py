@@ -0,0 +1,168 @@
+# -------------------------------------------------------------
+#  Recent Activity feed
+# -------------------------------------------------------------
+#
+# A bounded list model for the dashboard's Recent Activity view. Events
+# live in a ring buffer (deque with a cap); live events enter at the
+# top and push the oldest row out once the cap is reached. Older hits
+# are loaded from the pull history database a page at a time, only when
+# the view scrolls to the bottom (canFetchMore / fetchMore). Hits logged
+# while the app runs are read back from the same database (fetch_new),
+# so live and loaded rows look alike.
+#
+# ActivityFilterModel narrows the feed to one shard and/or rarity.
+
+import time
+from collections import deque, namedtuple
+
+from PySide6.QtCore import (
+    Qt,
+    QAbstractListModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+)
+
+
+# Rows kept in memory unless configured otherwise
+DEFAULT_ACTIVITY_CAP = 500
+# Older entries loaded per fetchMore()
+FETCH_PAGE = 50
+
+ShardRole = Qt.UserRole + 1
+RarityRole = Qt.UserRole + 2
+TimestampRole = Qt.UserRole + 3
+
+ActivityEvent = namedtuple("ActivityEvent", "timestamp shard rarity text")
+
+
+class ActivityModel(QAbstractListModel):
+    def __init__(self, history=None, cap: int = DEFAULT_ACTIVITY_CAP, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.cap = max(1, int(cap))
+
+        # Newest first
+        self._events = deque()
+        # Paging cursor into the history database: (timestamp, id) of the
+        # oldest hit loaded
+        self._oldest_hit = None
+        self._history_exhausted = history is None
+        # Hits written from here on arrive through fetch_new(); paging
+        # skips the ones already shown
+        self._newest_hit_id = history.latest_hit_id() if history is not None else 0
+        self._live_hit_ids = set()
+
+    # -----------------------------
+    #   MODEL API
+    # -----------------------------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._events)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._events):
+            return None
+
+        event = self._events[index.row()]
+        if role == Qt.DisplayRole:
+            return event.text
+        if role == ShardRole:
+            return event.shard
+        if role == RarityRole:
+            return event.rarity
+        if role == TimestampRole:
+            return event.timestamp
+        return None
+
+    # -----------------------------
+    #   LIVE EVENTS
+    # -----------------------------
+    def add_event(self, shard: str, rarity: str | None, text: str, timestamp: float | None = None):
+        """Insert at the top; drops the oldest row when the cap is reached."""
+        self._push(ActivityEvent(time.time() if timestamp is None else timestamp, shard, rarity, text))
+
+    def fetch_new(self):
+        """Insert hits written to the history database since the last call."""
+        if self.history is None:
+            return
+        for hit in self.history.hits_after(self._newest_hit_id):
+            self._newest_hit_id = hit["id"]
+            self._live_hit_ids.add(hit["id"])
+            self._push(self._event_from_hit(hit))
+
+    def _push(self, event: ActivityEvent):
+        if len(self._events) >= self.cap:
+            last = len(self._events) - 1
+            self.beginRemoveRows(QModelIndex(), last, last)
+            self._events.pop()
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._events.appendleft(event)
+        self.endInsertRows()
+
+    def set_cap(self, cap: int):
+        self.cap = max(1, int(cap))
+        extra = len(self._events) - self.cap
+        if extra > 0:
+            self.beginRemoveRows(QModelIndex(), self.cap, len(self._events) - 1)
+            for _ in range(extra):
+                self._events.pop()
+            self.endRemoveRows()
+
+    # -----------------------------
+    #   LAZY HISTORY LOADING
+    # -----------------------------
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return not self._history_exhausted and len(self._events) < self.cap
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        limit = min(FETCH_PAGE, self.cap - len(self._events))
+        hits = self.history.recent_hits(limit=limit, before=self._oldest_hit)
+        if len(hits) < limit:
+            self._history_exhausted = True
+        if hits:
+            self._oldest_hit = (hits[-1]["timestamp"], hits[-1]["id"])
+        hits = [hit for hit in hits if hit["id"] not in self._live_hit_ids]
+        if not hits:
+            return
+
+        first = len(self._events)
+        self.beginInsertRows(QModelIndex(), first, first + len(hits) - 1)
+        for hit in hits:
+            self._events.append(self._event_from_hit(hit))
+        self.endInsertRows()
+
+    @staticmethod
+    def _event_from_hit(hit: dict) -> ActivityEvent:
+        when = time.strftime("%d %b %H:%M", time.localtime(hit["timestamp"]))
+        text = f"{when} — {hit['shard']}: {hit['rarity']} at pity {hit['pity_at_hit']}"
+        return ActivityEvent(hit["timestamp"], hit["shard"], hit["rarity"], text)
+
+
+class ActivityFilterModel(QSortFilterProxyModel):
+    """Shows only rows matching a shard and/or rarity (None = any)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.shard = None
+        self.rarity = None
+
+    def set_filter(self, shard: str | None = None, rarity: str | None = None):
+        if (shard, rarity) == (self.shard, self.rarity):
+            return
+        self.shard = shard
+        self.rarity = rarity
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self.shard is not None and index.data(ShardRole) != self.shard:
+            return False
+        if self.rarity is not None and index.data(RarityRole) != self.rarity:
+            return False
+        return True
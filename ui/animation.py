@@ -0,0 +1,260 @@
+# -------------------------------------------------------------
+#  Animation manager
+# -------------------------------------------------------------
+#
+# One place that drives the app's decorative animations. Animations
+# handed to the manager are kept paused on Qt's own animation timer and
+# advanced from a single QTimer instead, which lets the manager:
+#
+# - cap the frame rate (per animation, never above max_fps),
+# - pause animations whose widget is hidden (e.g. a page behind another
+#   stack page) or whose window is minimised, resuming exactly where they
+#   left off; ambient ones also pause while the app is not the active
+#   application (a transition still finishes, so no page is left
+#   half-slid),
+# - honour the reduced-motion setting: finite animations jump to their
+#   end value and looping ones do not run at all.
+#
+# When nothing can run the timer is stopped, so an idle window costs no
+# wake-ups at all.
+
+from PySide6.QtCore import (
+    QAbstractAnimation,
+    QElapsedTimer,
+    QEvent,
+    QObject,
+    Qt,
+    QTimer,
+)
+from PySide6.QtWidgets import QApplication
+
+from ui.app_metadata import APP_REDUCED_MOTION_KEY
+
+
+# Upper bound for every managed animation
+DEFAULT_MAX_FPS = 60
+
+# Ambient loops (glow pulse) look the same at a much lower rate
+AMBIENT_FPS = 24
+
+# Endless loops are rewound by whole loops past this (QAbstractAnimation
+# times are 32-bit milliseconds)
+LOOP_WRAP_MS = 1 << 30
+
+
+class _Entry:
+    __slots__ = ("animation", "widget", "frame_ms", "ambient", "elapsed", "last_frame")
+
+    def __init__(self, animation, widget, frame_ms, ambient):
+        self.animation = animation
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.ambient = ambient
+        self.elapsed = 0
+        self.last_frame = 0
+
+
+class AnimationManager(QObject):
+    def __init__(self, max_fps: int = DEFAULT_MAX_FPS, reduced_motion: bool = False, parent=None):
+        super().__init__(parent)
+
+        self.max_fps = max(1, int(max_fps))
+        self.reduced_motion = bool(reduced_motion)
+
+        self._entries = {}
+        self._watched = set()
+
+        self._clock = QElapsedTimer()
+        self._clock.start()
+        self._last_tick = 0
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+        app = QApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._update_timer)
+
+    # -----------------------------
+    #   PUBLIC API
+    # -----------------------------
+    def start(
+        self,
+        animation: QAbstractAnimation,
+        widget,
+        fps: int | None = None,
+        ambient: bool = True,
+    ) -> bool:
+        """
+        Run animation while widget is on screen. Ambient animations also
+        wait while the app is inactive; pass ambient=False for transitions
+        the UI depends on finishing. Returns False when reduced motion is
+        on: a finite animation has then been jumped to its end, a looping
+        one was not started.
+        """
+        self.stop(animation)
+
+        if self.reduced_motion:
+            if animation.loopCount() < 0:
+                return False
+            # Applies the end value and emits finished()
+            animation.start()
+            animation.setCurrentTime(animation.totalDuration())
+            return False
+
+        frame_ms = 1000.0 / min(self.max_fps, fps or self.max_fps)
+        entry = _Entry(animation, widget, frame_ms, bool(ambient))
+        self._entries[animation] = entry
+
+        # Running on Qt's timer for a moment applies the start value;
+        # from then on the manager advances it
+        animation.start()
+        animation.pause()
+
+        animation.stateChanged.connect(self._on_state_changed)
+        animation.destroyed.connect(self._forget)
+        self._watch(widget)
+        self._update_timer()
+        return True
+
+    def stop(self, animation: QAbstractAnimation):
+        """Stop a managed animation (a no-op for unknown ones)."""
+        entry = self._entries.pop(animation, None)
+        if entry is None:
+            return
+        try:
+            animation.stateChanged.disconnect(self._on_state_changed)
+            animation.destroyed.disconnect(self._forget)
+        except (RuntimeError, TypeError):
+            pass
+        animation.stop()
+        self._update_timer()
+
+    def set_reduced_motion(self, enabled: bool):
+        self.reduced_motion = bool(enabled)
+        if not self.reduced_motion:
+            return
+        # Settle everything that is currently moving
+        for animation in list(self._entries):
+            if animation.loopCount() < 0:
+                self.stop(animation)
+            else:
+                # Still paused, so this lands on the end value and finishes
+                animation.setCurrentTime(animation.totalDuration())
+
+    def set_max_fps(self, fps: int):
+        self.max_fps = max(1, int(fps))
+        for entry in self._entries.values():
+            entry.frame_ms = max(entry.frame_ms, 1000.0 / self.max_fps)
+        self._update_timer()
+
+    def active_count(self) -> int:
+        """Managed animations that are currently allowed to advance."""
+        return sum(1 for entry in self._entries.values() if self._can_run(entry))
+
+    # -----------------------------
+    #   VISIBILITY
+    # -----------------------------
+    def _watch(self, widget):
+        for target in (widget, widget.window()):
+            if target not in self._watched:
+                self._watched.add(target)
+                target.installEventFilter(self)
+                target.destroyed.connect(lambda _=None, t=target: self._watched.discard(t))
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange):
+            # Re-evaluated after Qt has finished updating visibility
+            QTimer.singleShot(0, self._update_timer)
+        return False
+
+    def _app_active(self) -> bool:
+        app = QApplication.instance()
+        return app is None or app.applicationState() == Qt.ApplicationActive
+
+    def _can_run(self, entry: _Entry) -> bool:
+        widget = entry.widget
+        if not widget.isVisible() or widget.window().isMinimized():
+            return False
+        return not entry.ambient or self._app_active()
+
+    # -----------------------------
+    #   DRIVING
+    # -----------------------------
+    def _update_timer(self, *_):
+        runnable = [e for e in self._entries.values() if self._can_run(e)]
+        if not runnable:
+            self._timer.stop()
+            return
+
+        interval = int(min(e.frame_ms for e in runnable))
+        if not self._timer.isActive():
+            # Time spent paused does not count towards the animation
+            self._last_tick = self._clock.elapsed()
+            for entry in runnable:
+                entry.last_frame = entry.elapsed
+        if self._timer.interval() != interval or not self._timer.isActive():
+            self._timer.start(interval)
+
+    def _tick(self):
+        now = self._clock.elapsed()
+        delta = now - self._last_tick
+        self._last_tick = now
+        # Timer jitter allowance when deciding whether a frame is due
+        slack = self._timer.interval() / 2
+        finished = False
+
+        for animation, entry in list(self._entries.items()):
+            if not self._can_run(entry):
+                continue
+            entry.elapsed += delta
+
+            total = animation.totalDuration()
+            if 0 <= total <= entry.elapsed:
+                self._entries.pop(animation, None)
+                # Lands on the end value, stops and emits finished()
+                animation.setCurrentTime(total)
+                finished = True
+                continue
+
+            # Skip frames the per-animation cap does not allow yet
+            if entry.elapsed - entry.last_frame + slack < entry.frame_ms:
+                continue
+
+            if total < 0 and entry.elapsed > LOOP_WRAP_MS:
+                # Endless loops: keep the phase, drop whole loops
+                wrap = entry.elapsed - entry.elapsed % max(1, animation.duration())
+                entry.elapsed -= wrap
+            entry.last_frame = entry.elapsed
+            animation.setCurrentTime(entry.elapsed)
+
+        if finished:
+            # What is left may all be waiting (e.g. ambient while inactive)
+            self._update_timer()
+
+    def _on_state_changed(self, new_state, _old_state):
+        # Stopped from outside (or finished): drop it
+        if new_state == QAbstractAnimation.Stopped:
+            animation = self.sender()
+            if animation in self._entries:
+                self._entries.pop(animation, None)
+                self._update_timer()
+
+    def _forget(self, obj=None):
+        if self._entries.pop(obj, None) is not None:
+            self._update_timer()
+
+
+_manager = None
+
+
+def get_animation_manager() -> AnimationManager:
+    """Shared app-wide manager (created on first use, after QApplication)."""
+    global _manager
+    if _manager is None:
+        from logic.persistence import get_settings_store
+
+        reduced = get_settings_store().value(APP_REDUCED_MOTION_KEY, False)
+        _manager = AnimationManager(reduced_motion=str(reduced).lower() in ("1", "true"))
+    return _manager
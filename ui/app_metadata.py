@@ -1,3 +1,4 @@
 APP_VERSION = "1.0.0"
 APP_BUILD = 69
-APP_THEME_KEY = "theme"
\ No newline at end of file
+APP_THEME_KEY = "theme"
+APP_REDUCED_MOTION_KEY = "reduced_motion"
\ No newline at end of file
@@ -0,0 +1,254 @@
+# -------------------------------------------------------------
+#  Bulk pull entry
+# -------------------------------------------------------------
+#
+# One dialog for logging a large custom pull. Every position is a cell
+# in a QTableView over PullGridModel (ten positions per row), so only
+# the visible cells are ever painted, even for 9999 pulls.
+#
+# Keyboard: select one or more cells and press E / L / M to mark them
+# Epic / Legendary / Mythical, N, 0, Delete or Backspace to clear them.
+# Ctrl+V (or the Paste button) reads hits from text such as
+# "17 L, 23 legendary, 145:M".
+
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+from PySide6.QtGui import QColor, QKeySequence
+
+from core.pull_state import parse_hits
+from ui.prompt_dialogs import fusion_style
+
+
+RARITY_COLOURS = {
+    "Epic": ("#7b2cff", "white"),
+    "Legendary": ("#d4af37", "black"),
+    "Mythical": ("#cc3333", "white"),
+}
+
+RARITY_KEYS = {
+    Qt.Key_E: "Epic",
+    Qt.Key_L: "Legendary",
+    Qt.Key_M: "Mythical",
+}
+
+CLEAR_KEYS = (Qt.Key_N, Qt.Key_0, Qt.Key_Delete, Qt.Key_Backspace)
+
+
+# -------------------------------------------------------------
+#  Model
+# -------------------------------------------------------------
+class PullGridModel(QAbstractTableModel):
+    COLUMNS = 10
+
+    hits_changed = Signal()
+
+    def __init__(self, count: int, rarities, parent=None):
+        super().__init__(parent)
+        self.count = count
+        self.rarities = list(rarities)
+        self.hits = {}  # position -> rarity
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else (self.count + self.COLUMNS - 1) // self.COLUMNS
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.COLUMNS
+
+    def position(self, index) -> int | None:
+        pos = index.row() * self.COLUMNS + index.column() + 1
+        return pos if pos <= self.count else None
+
+    def index_for(self, pos: int):
+        return self.index((pos - 1) // self.COLUMNS, (pos - 1) % self.COLUMNS)
+
+    def flags(self, index):
+        if not index.isValid() or self.position(index) is None:
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        pos = self.position(index) if index.isValid() else None
+        if pos is None:
+            return None
+
+        rarity = self.hits.get(pos)
+        if role == Qt.DisplayRole:
+            return f"{pos} {rarity[0]}" if rarity else str(pos)
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter)
+        if role == Qt.ToolTipRole:
+            return f"Position {pos}: {rarity or 'No Hit'}"
+        if rarity and role == Qt.BackgroundRole:
+            return QColor(RARITY_COLOURS[rarity][0])
+        if rarity and role == Qt.ForegroundRole:
+            return QColor(RARITY_COLOURS[rarity][1])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            first = section * self.COLUMNS + 1
+            return f"{first}–{min(first + self.COLUMNS - 1, self.count)}"
+        return None
+
+    def set_rarity(self, positions, rarity: str | None):
+        """Mark positions as hits of a rarity (None clears them)."""
+        if rarity is not None and rarity not in self.rarities:
+            return
+        changed = []
+        for pos in positions:
+            if self.hits.get(pos) == rarity:
+                continue
+            if rarity is None:
+                self.hits.pop(pos, None)
+            else:
+                self.hits[pos] = rarity
+            changed.append(pos)
+        self._emit_changed(changed)
+
+    def merge_hits(self, hits: dict):
+        self.hits.update(hits)
+        self._emit_changed(list(hits))
+
+    def clear(self):
+        changed = list(self.hits)
+        self.hits.clear()
+        self._emit_changed(changed)
+
+    def _emit_changed(self, positions):
+        if not positions:
+            return
+        # One signal covering the changed rows instead of one per cell
+        top = (min(positions) - 1) // self.COLUMNS
+        bottom = (max(positions) - 1) // self.COLUMNS
+        self.dataChanged.emit(self.index(top, 0), self.index(bottom, self.COLUMNS - 1))
+        self.hits_changed.emit()
+
+    def sorted_hits(self) -> list[tuple[int, str]]:
+        return sorted(self.hits.items())
+
+
+# -------------------------------------------------------------
+#  View + dialog
+# -------------------------------------------------------------
+class PullGridView(QTableView):
+    paste_requested = Signal()
+
+    def keyPressEvent(self, event):
+        model = self.model()
+        key = event.key()
+
+        if event.matches(QKeySequence.Paste):
+            self.paste_requested.emit()
+            return
+
+        if key in RARITY_KEYS or key in CLEAR_KEYS:
+            rarity = RARITY_KEYS.get(key)
+            if rarity is not None and rarity not in model.rarities:
+                return
+            selected = [model.position(i) for i in self.selectionModel().selectedIndexes()]
+            positions = [p for p in selected if p is not None]
+            model.set_rarity(positions, rarity)
+
+            # Single cell: move on so a run can be typed key by key
+            if len(positions) == 1 and positions[0] < model.count:
+                self.setCurrentIndex(model.index_for(positions[0] + 1))
+            return
+
+        super().keyPressEvent(event)
+
+
+class BulkPullDialog(QDialog):
+    def __init__(self, count: int, rarities, parent=None):
+        super().__init__(parent)
+        self.setStyle(fusion_style())
+        self.setWindowTitle(f"Custom Pulls: {count} shards")
+        self.resize(560, 520)
+
+        self.model = PullGridModel(count, rarities, self)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        keys = ", ".join(f"{r[0]} = {r}" for r in self.model.rarities)
+        info = QLabel(
+            f"Select positions and press {keys}; N or Delete clears.\n"
+            "Ctrl+V pastes hits from text, e.g. \"17 L, 145 M\"."
+        )
+        info.setStyleSheet("font-size: 12px; color: #ccc;")
+        layout.addWidget(info)
+
+        self.view = PullGridView()
+        self.view.setModel(self.model)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(28)
+        self.view.setCurrentIndex(self.model.index(0, 0))
+        layout.addWidget(self.view)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("font-size: 12px;")
+        layout.addWidget(self.summary_label)
+
+        bottom = QHBoxLayout()
+
+        paste_btn = QPushButton("Paste from clipboard")
+        clear_btn = QPushButton("Clear")
+        cancel_btn = QPushButton("Cancel")
+        confirm_btn = QPushButton("Confirm")
+        confirm_btn.setDefault(True)
+
+        bottom.addWidget(paste_btn)
+        bottom.addWidget(clear_btn)
+        bottom.addStretch(1)
+        bottom.addWidget(cancel_btn)
+        bottom.addWidget(confirm_btn)
+        layout.addLayout(bottom)
+
+        paste_btn.clicked.connect(self.paste_from_clipboard)
+        clear_btn.clicked.connect(self.model.clear)
+        cancel_btn.clicked.connect(self.reject)
+        confirm_btn.clicked.connect(self.accept)
+        self.view.paste_requested.connect(self.paste_from_clipboard)
+        self.model.hits_changed.connect(self._refresh_summary)
+
+        self._refresh_summary()
+
+    def paste_from_clipboard(self):
+        self.paste_text(QApplication.clipboard().text())
+
+    def paste_text(self, text: str):
+        hits, problems = parse_hits(text, self.model.count, self.model.rarities)
+        self.model.merge_hits(hits)
+
+        if problems:
+            QMessageBox.warning(
+                self,
+                "Some entries were skipped",
+                "\n".join(problems[:15]) + ("\n…" if len(problems) > 15 else ""),
+            )
+
+    def _refresh_summary(self):
+        counts = {r: 0 for r in self.model.rarities}
+        for rarity in self.model.hits.values():
+            counts[rarity] += 1
+        parts = ", ".join(f"{n} {r}" for r, n in counts.items())
+        self.summary_label.setText(f"{len(self.model.hits)} hits in {self.model.count} pulls: {parts}")
+
+    def hits(self) -> list[tuple[int, str]]:
+        """(position, rarity) pairs in position order."""
+        return self.model.sorted_hits()
@@ -2,12 +2,18 @@ from functools import partial
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout,
-    QFrame, QListWidget, QListWidgetItem,
+    QFrame, QListView, QComboBox,
     QPushButton, QSizePolicy
 )
-from PySide6.QtCore import Qt, QSettings
+from PySide6.QtCore import Qt
 
 from ui.shardinventory import ShardInventory
+from ui.activity_feed import ActivityModel, ActivityFilterModel, DEFAULT_ACTIVITY_CAP
+from logic.persistence import get_settings_store
+from logic.history_store import get_history
+from logic.app_state import get_app_store, hits_key, primary_key, shard_of, subscribe_widget
+from logic.tracing import traced
+from core.inventory import inventory_key
 
 
 SHARD_DISPLAY_NAMES = [
@@ -24,29 +30,26 @@ SHARD_KEY_MAP = {
     "Sacred": "sacred",
 }
 
+ACTIVITY_RARITIES = ["Epic", "Legendary", "Mythical"]
+
+# Rows kept in the Recent Activity feed
+ACTIVITY_CAP_KEY = "dashboard/activity_cap"
+
 
 class DashboardTab(QWidget):
     def __init__(self):
         super().__init__()
+        self.setObjectName("dashboardTab")
+        self.current_theme = "dark"
 
         # Persistent storage
-        self.settings = QSettings("SketeRAID", "Hydra Companion")
-
-        # Pity values
-        self.pity_data = {
-            "Ancient": int(self.settings.value("pity/ancient", 0)),
-            "Void": int(self.settings.value("pity/void", 0)),
-            "Primal": int(self.settings.value("pity/primal", 0)),
-            "Sacred": int(self.settings.value("pity/sacred", 0)),
-        }
+        self.settings = get_settings_store()
 
-        # Stats
-        self.total_pulls = int(self.settings.value("stats/total_pulls", 0))
-        self.last_hits = {
-            "epic": int(self.settings.value("hits/last_epic", -1)),
-            "legendary": int(self.settings.value("hits/last_legendary", -1)),
-            "mythical": int(self.settings.value("hits/last_mythical", -1)),
-        }
+        # Pity and hit counts (logic/app_state.py)
+        self.store = get_app_store()
+
+        # Stats come from the pull history database
+        self.history = get_history()
 
         # Inventory (external)
         self.inventory: ShardInventory | None = None
@@ -56,6 +59,14 @@ class DashboardTab(QWidget):
         self._build_ui()
         self._refresh_last_hit_labels()
 
+        # Top-rarity pity for the shard bar, hit counts for the last-hit box
+        subscribe_widget(
+            self,
+            [primary_key(s) for s in SHARD_DISPLAY_NAMES] + [hits_key(s) for s in SHARD_DISPLAY_NAMES],
+            self.update_pity,
+            self.store,
+        )
+
     # ---------------------------------------------------------
     # UI BUILD
     # ---------------------------------------------------------
@@ -84,6 +95,7 @@ class DashboardTab(QWidget):
 
         # Divider
         self.top_divider = QFrame()
+        self.top_divider.setObjectName("dashboardDivider")
         self.top_divider.setFrameShape(QFrame.HLine)
         self.top_divider.setFixedHeight(2)
         layout.addWidget(self.top_divider)
@@ -104,22 +116,51 @@ class DashboardTab(QWidget):
 
         layout.addWidget(row_frame)
 
-        # Recent activity
+        # Recent activity (bounded model; older hits load on scroll)
+        activity_header = QHBoxLayout()
+
         activity_title = QLabel("Recent Activity")
         activity_title.setStyleSheet("font-size: 16px; font-weight: bold; margin-left: 4px;")
-        layout.addWidget(activity_title)
+        activity_header.addWidget(activity_title)
+        activity_header.addStretch(1)
+
+        self.activity_shard_filter = QComboBox()
+        self.activity_shard_filter.addItem("All shards", None)
+        for shard in SHARD_DISPLAY_NAMES:
+            self.activity_shard_filter.addItem(shard, shard)
+
+        self.activity_rarity_filter = QComboBox()
+        self.activity_rarity_filter.addItem("All rarities", None)
+        for rarity in ACTIVITY_RARITIES:
+            self.activity_rarity_filter.addItem(rarity, rarity)
+
+        activity_header.addWidget(self.activity_shard_filter)
+        activity_header.addWidget(self.activity_rarity_filter)
+        layout.addLayout(activity_header)
 
-        self.activity_list = QListWidget()
+        cap = int(self.settings.value(ACTIVITY_CAP_KEY, DEFAULT_ACTIVITY_CAP))
+        self.activity_model = ActivityModel(self.history, cap, self)
+        self.activity_filter = ActivityFilterModel(self)
+        self.activity_filter.setSourceModel(self.activity_model)
+
+        self.activity_list = QListView()
+        self.activity_list.setUniformItemSizes(True)
+        self.activity_list.setModel(self.activity_filter)
         self.activity_list.setFixedHeight(140)
         layout.addWidget(self.activity_list)
 
+        self.activity_shard_filter.currentIndexChanged.connect(self._apply_activity_filter)
+        self.activity_rarity_filter.currentIndexChanged.connect(self._apply_activity_filter)
+
         # Bottom divider + shadow
         self.bottom_divider = QFrame()
+        self.bottom_divider.setObjectName("dashboardDivider")
         self.bottom_divider.setFrameShape(QFrame.HLine)
         self.bottom_divider.setFixedHeight(1)
         layout.addWidget(self.bottom_divider)
 
         self.bottom_shadow = QLabel()
+        self.bottom_shadow.setObjectName("dashboardShadow")
         self.bottom_shadow.setFixedHeight(12)
         layout.addWidget(self.bottom_shadow)
 
@@ -154,7 +195,7 @@ class DashboardTab(QWidget):
                 f"font-size: 13px; font-weight: bold; color: {colour_map[shard]};"
             )
 
-            pity_value = self.pity_data.get(shard, 0)
+            pity_value = self.store.get(primary_key(shard), 0)
             pity = QLabel(f"Pity: {pity_value}")
             pity.setStyleSheet("font-size: 12px; opacity: 0.9;")
 
@@ -254,14 +295,22 @@ class DashboardTab(QWidget):
     # ---------------------------------------------------------
     def set_inventory(self, inventory: ShardInventory):
         self.inventory = inventory
-        inventory.inventory_changed.connect(self.update_inventory)
         self.update_inventory(inventory.to_dict())
 
+        # Only rows whose count changed are touched
+        store = inventory.model.store
+        keys = {inventory_key(key): key for key in SHARD_KEY_MAP.values()}
+        subscribe_widget(
+            self,
+            list(keys),
+            lambda changes: self.update_inventory({keys[k]: v for k, v in changes.items()}),
+            store,
+        )
+
     def update_inventory(self, data: dict):
         for shard_name, key in SHARD_KEY_MAP.items():
-            value = data.get(key, 0)
-            if shard_name in self.inventory_labels:
-                self.inventory_labels[shard_name].setText(str(value))
+            if key in data and shard_name in self.inventory_labels:
+                self.inventory_labels[shard_name].setText(str(data[key]))
 
     def adjust_inventory(self, shard_name: str, delta: int):
         if not self.inventory:
@@ -279,180 +328,43 @@ class DashboardTab(QWidget):
     # ---------------------------------------------------------
     # LAST HIT TRACKING
     # ---------------------------------------------------------
-    def register_pull(self, shard_name: str, rarity: str):
-        self.total_pulls += 1
-        self.settings.setValue("stats/total_pulls", self.total_pulls)
-
-        r = (rarity or "").strip().lower()
-
-        if r.startswith("myth") or r == "m":
-            self.last_hits["mythical"] = self.total_pulls
-            self.settings.setValue("hits/last_mythical", self.total_pulls)
-        elif r.startswith("legend") or r == "l":
-            self.last_hits["legendary"] = self.total_pulls
-            self.settings.setValue("hits/last_legendary", self.total_pulls)
-        elif r.startswith("epic") or r == "e":
-            self.last_hits["epic"] = self.total_pulls
-            self.settings.setValue("hits/last_epic", self.total_pulls)
-
-        self._refresh_last_hit_labels()
-
     def _refresh_last_hit_labels(self):
-        def fmt(label, key):
-            idx = self.last_hits[key]
-            if idx < 0 or self.total_pulls <= 0 or idx > self.total_pulls:
+        def fmt(label):
+            ago = self.history.pulls_since_last_hit(label)
+            if ago is None:
                 return f"{label}: no data"
-            return f"{label}: {self.total_pulls - idx} pulls ago"
+            return f"{label}: {ago} pulls ago"
 
-        self.last_epic_label.setText(fmt("Epic", "epic"))
-        self.last_legendary_label.setText(fmt("Legendary", "legendary"))
-        self.last_mythical_label.setText(fmt("Mythical", "mythical"))
+        self.last_epic_label.setText(fmt("Epic"))
+        self.last_legendary_label.setText(fmt("Legendary"))
+        self.last_mythical_label.setText(fmt("Mythical"))
 
     # ---------------------------------------------------------
     # PITY UPDATES
     # ---------------------------------------------------------
-    def update_pity(self, shard_name: str, pity_value: int):
-        if shard_name not in self.pity_data:
-            return
-
-        key = SHARD_KEY_MAP[shard_name]
-        self.settings.setValue(f"pity/{key}", pity_value)
-
-        self.pity_data[shard_name] = pity_value
-        self.summary_labels[shard_name].setText(f"Pity: {pity_value}")
+    @traced()
+    def update_pity(self, changes: dict):
+        """Store changes: top-rarity pity and/or hit counts per shard."""
+        for key, value in changes.items():
+            shard_name = shard_of(key)
+            if key == primary_key(shard_name):
+                self.summary_labels[shard_name].setText(f"Pity: {value}")
+
+        # The pull itself is already stored by the tracker; re-query once
+        # per commit, however many shards it touched
+        if any(key == hits_key(shard_of(key)) for key in changes):
+            self.activity_model.fetch_new()
+        self._refresh_last_hit_labels()
 
-        item = QListWidgetItem(f"{shard_name}: pity updated to {pity_value}")
-        self.activity_list.insertItem(0, item)
+    def _apply_activity_filter(self):
+        self.activity_filter.set_filter(
+            self.activity_shard_filter.currentData(),
+            self.activity_rarity_filter.currentData(),
+        )
 
     # ---------------------------------------------------------
     # THEME
     # ---------------------------------------------------------
     def set_theme(self, theme: str):
-        if theme == "dark":
-            self.apply_dark_theme()
-        else:
-            self.apply_light_theme()
-
-    def apply_dark_theme(self):
-        glow = "#99ff99"
-
-        self.setStyleSheet(
-            f"""
-            QLabel {{
-                color: #f0f0f0;
-                background: transparent;
-            }}
-
-            QFrame#segmentBox {{
-                border: 2px solid {glow};
-                border-radius: 8px;
-                background-color: #202020;
-                padding: 6px;
-                margin-left: auto;
-                margin-right: auto;
-            }}
-
-            QFrame#lastHitBox, QFrame#inventoryBox {{
-                border: 1px solid {glow};
-                border-radius: 10px;
-                background-color: #111111;
-                padding: 12px;
-            }}
-
-            QPushButton {{
-                background-color: #222222;
-                color: #f0f0f0;
-                border: 1px solid {glow};
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: #2b2b2b;
-            }}
-            """
-        )
-
-        self.top_divider.setStyleSheet(f"background-color: {glow};")
-        self.bottom_divider.setStyleSheet(f"background-color: {glow};")
-
-        self.bottom_shadow.setStyleSheet(
-            """
-            background: qlineargradient(
-                x1:0, y1:0, x2:0, y2:1,
-                stop:0 rgba(153,255,153,60),
-                stop:1 rgba(0,0,0,0)
-            );
-            """
-        )
-
-        self.activity_list.setStyleSheet(
-            f"""
-            QListWidget {{
-                background-color: transparent;
-                border: 1px solid {glow};
-                border-radius: 6px;
-                padding: 6px;
-            }}
-            """
-        )
-
-    def apply_light_theme(self):
-        green = "#225522"
-
-        self.setStyleSheet(
-            f"""
-            QLabel {{
-                color: #202020;
-                background: transparent;
-            }}
-
-            QFrame#segmentBox {{
-                border: 2px solid {green};
-                border-radius: 8px;
-                background-color: #f4faf4;
-                padding: 6px;
-                margin-left: auto;
-                margin-right: auto;
-            }}
-
-            QFrame#lastHitBox, QFrame#inventoryBox {{
-                border: 1px solid {green};
-                border-radius: 10px;
-                background-color: #f0f5f0;
-                padding: 12px;
-            }}
-
-            QPushButton {{
-                background-color: #ffffff;
-                color: #202020;
-                border: 1px solid {green};
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: #f0f5f0;
-            }}
-            """
-        )
-
-        self.top_divider.setStyleSheet(f"background-color: {green};")
-        self.bottom_divider.setStyleSheet(f"background-color: {green};")
-
-        self.bottom_shadow.setStyleSheet(
-            """
-            background: qlineargradient(
-                x1:0, y1:0, x2:0, y2:1,
-                stop:0 rgba(34,85,34,60),
-                stop:1 rgba(0,0,0,0)
-            );
-            """
-        )
-
-        self.activity_list.setStyleSheet(
-            f"""
-            QListWidget {{
-                background-color: transparent;
-                border: 1px solid {green};
-                border-radius: 6px;
-                padding: 6px;
-            }}
-            """
-        )
\ No newline at end of file
+        # Colours come from the window-level stylesheet (ui/theme.py)
+        self.current_theme = theme
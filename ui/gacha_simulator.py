@@ -1,19 +1,215 @@
+import time
+import threading
+
 from PySide6.QtWidgets import (
+    QApplication,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
     QPushButton,
     QFrame,
+    QComboBox,
+    QSpinBox,
+    QCheckBox,
+    QProgressBar,
 )
-from PySide6.QtCore import Qt
-import random
+from PySide6.QtCore import Qt, QRect, QThread, Signal
+from PySide6.QtGui import QPainter
+
+from core.rules import MERCY_RULES
+from logic.simulator import CHUNK_TRIALS, SimulationCancelled, iter_simulation
+from logic.app_state import get_app_store, pity_key
+
+
+# Partial results are sent to the GUI at most this often (10 Hz)
+PROGRESS_INTERVAL_S = 0.1
+# Hit counts beyond this many bars are folded into the last bar
+HISTOGRAM_BARS = 16
+
+
+# ---------------------------------------------------------
+#   BACKGROUND SIMULATION
+# ---------------------------------------------------------
+
+class SimulationWorker(QThread):
+    """
+    Runs a chunked simulation off the GUI thread. Partial histograms and
+    progress are emitted at most every PROGRESS_INTERVAL_S; the final
+    summary is always emitted.
+    """
+
+    progress = Signal(float)      # fraction of all pulls simulated
+    partial = Signal(object)      # SimulationSummary snapshot
+    completed = Signal(object)    # final SimulationSummary
+    cancelled = Signal()
+
+    def __init__(self, shard: str, shards: int, trials: int, start_pity: dict, parent=None):
+        super().__init__(parent)
+        self.shard = shard
+        self.shards = shards
+        self.trials = trials
+        self.start_pity = start_pity
+
+        self._resume = threading.Event()
+        self._resume.set()
+        self._cancel = False
+        self._merged = 0
+        self._last_progress = 0.0
+        self._last_partial = 0.0
+
+    # ---------------- CONTROL (GUI THREAD) ----------------
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    def is_paused(self) -> bool:
+        return not self._resume.is_set()
+
+    def cancel(self):
+        self._cancel = True
+        self._resume.set()
+
+    # ---------------- WORKER THREAD ----------------
+
+    def _checkpoint(self, step: int = 0):
+        self._resume.wait()
+        if self._cancel:
+            raise SimulationCancelled()
+
+        # Progress inside an in-process chunk
+        now = time.monotonic()
+        if now - self._last_progress >= PROGRESS_INTERVAL_S:
+            self._last_progress = now
+            chunk = min(CHUNK_TRIALS, self.trials - self._merged)
+            done = self._merged + chunk * step / max(1, self.shards)
+            self.progress.emit(done / self.trials)
+
+    def run(self):
+        summary = None
+        try:
+            for summary in iter_simulation(
+                self.shard,
+                self.shards,
+                self.trials,
+                start_pity=self.start_pity,
+                checkpoint=self._checkpoint,
+            ):
+                self._merged = summary.trials
+                self._checkpoint()
+
+                now = time.monotonic()
+                if summary.trials < self.trials and now - self._last_partial >= PROGRESS_INTERVAL_S:
+                    self._last_partial = now
+                    self.partial.emit(summary.copy())
+        except SimulationCancelled:
+            self.cancelled.emit()
+            return
+
+        self.progress.emit(1.0)
+        self.completed.emit(summary)
+
+
+# ---------------------------------------------------------
+#   HISTOGRAM
+# ---------------------------------------------------------
+
+class HistogramView(QWidget):
+    """
+    Bar chart of hits per run. New counts only repaint the bars that
+    changed, unless the scale (bar count or tallest bar) moved.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(180)
+        self.labels = []
+        self.shares = []
+        self.peak = 0.0
+
+    def clear(self):
+        self.labels = []
+        self.shares = []
+        self.peak = 0.0
+        self.update()
+
+    def set_counts(self, counts, trials: int):
+        # Skip empty leading bars so long runs still show their peak
+        nonzero = counts.nonzero()[0]
+        first = int(nonzero[0]) if len(nonzero) else 0
+        counts = counts[first:]
+
+        labels = [str(first + n) for n in range(min(len(counts), HISTOGRAM_BARS))]
+        if len(counts) > HISTOGRAM_BARS:
+            folded = counts[:HISTOGRAM_BARS].copy()
+            folded[-1] += counts[HISTOGRAM_BARS:].sum()
+            counts = folded
+            labels[-1] += "+"
+
+        shares = [float(c) / max(1, trials) for c in counts]
+        peak = max(shares, default=0.0)
+
+        if labels != self.labels or peak != self.peak:
+            self.labels, self.shares, self.peak = labels, shares, peak
+            self.update()
+            return
+
+        changed = [i for i, (old, new) in enumerate(zip(self.shares, shares)) if old != new]
+        self.shares = shares
+        for i in changed:
+            self.update(self._column_rect(i))
+
+    def _column_rect(self, index: int) -> QRect:
+        width = self.width() / max(1, len(self.labels))
+        return QRect(int(index * width), 0, int(width) + 1, self.height())
+
+    def paintEvent(self, event):
+        if not self.labels:
+            return
+
+        painter = QPainter(self)
+        palette = self.palette()
+        metrics = painter.fontMetrics()
+        text_h = metrics.height()
+        chart_h = max(1, self.height() - 2 * text_h - 4)
+        width = self.width() / len(self.labels)
+
+        for i, (label, share) in enumerate(zip(self.labels, self.shares)):
+            column = self._column_rect(i)
+            if not column.intersects(event.rect()):
+                continue
+
+            bar_h = int(chart_h * share / self.peak) if self.peak else 0
+            bar = QRect(int(i * width + width * 0.15), text_h + chart_h - bar_h, max(1, int(width * 0.7)), bar_h)
+            painter.fillRect(bar, palette.highlight())
+
+            painter.setPen(palette.text().color())
+            painter.drawText(
+                QRect(column.x(), 0, column.width(), text_h), Qt.AlignmentFlag.AlignCenter, f"{share * 100:.1f}%"
+            )
+            painter.drawText(
+                QRect(column.x(), self.height() - text_h, column.width(), text_h),
+                Qt.AlignmentFlag.AlignCenter,
+                label,
+            )
+
+        painter.end()
+
+
+# ---------------------------------------------------------
+#   SIMULATOR TAB
+# ---------------------------------------------------------
 
 
 class GachaSimulatorTab(QWidget):
     def __init__(self):
         super().__init__()
 
+        self.worker = None
+
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         layout.setSpacing(30)
@@ -24,6 +220,36 @@ class GachaSimulatorTab(QWidget):
         title.setStyleSheet("font-size: 22px; font-weight: bold;")
         layout.addWidget(title)
 
+        # Options Row
+        options = QHBoxLayout()
+        options.setSpacing(20)
+        options.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.shard_combo = QComboBox()
+        self.shard_combo.addItems(list(MERCY_RULES))
+
+        self.shards_spin = QSpinBox()
+        self.shards_spin.setRange(1, 10000)
+        self.shards_spin.setValue(100)
+        self.shards_spin.setPrefix("Open ")
+        self.shards_spin.setSuffix(" shards")
+
+        self.trials_spin = QSpinBox()
+        self.trials_spin.setRange(100, 1_000_000)
+        self.trials_spin.setSingleStep(1000)
+        self.trials_spin.setValue(10000)
+        self.trials_spin.setSuffix(" runs")
+
+        self.current_pity_check = QCheckBox("Start from my current pity")
+        self.current_pity_check.setChecked(True)
+
+        options.addWidget(self.shard_combo)
+        options.addWidget(self.shards_spin)
+        options.addWidget(self.trials_spin)
+        options.addWidget(self.current_pity_check)
+
+        layout.addLayout(options)
+
         # Results Box
         self.result_box = QFrame()
         self.result_box.setStyleSheet("""
@@ -36,11 +262,27 @@ class GachaSimulatorTab(QWidget):
         result_layout = QVBoxLayout(self.result_box)
         result_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.result_label = QLabel("No pull yet")
+        self.result_label = QLabel("No simulation yet")
         self.result_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.result_label.setStyleSheet("font-size: 20px; font-weight: bold;")
         result_layout.addWidget(self.result_label)
 
+        self.histogram_title = QLabel()
+        self.histogram_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.histogram_title.setStyleSheet("border: none; font-size: 14px;")
+        result_layout.addWidget(self.histogram_title)
+
+        self.histogram = HistogramView()
+        self.histogram.setStyleSheet("border: none;")
+        result_layout.addWidget(self.histogram)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedHeight(8)
+        self.progress_bar.hide()
+        result_layout.addWidget(self.progress_bar)
+
         layout.addWidget(self.result_box)
 
         # Buttons Row
@@ -48,49 +290,125 @@ class GachaSimulatorTab(QWidget):
         buttons.setSpacing(20)
         buttons.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        btn_single = QPushButton("Single Pull")
-        btn_reset = QPushButton("Clear Result")
+        self.btn_simulate = QPushButton("Simulate")
+        self.btn_pause = QPushButton("Pause")
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_reset = QPushButton("Clear Result")
 
-        btn_single.setMinimumWidth(150)
-        btn_reset.setMinimumWidth(150)
+        for btn in (self.btn_simulate, self.btn_pause, self.btn_cancel, self.btn_reset):
+            btn.setMinimumWidth(150)
+            btn.setStyleSheet("""
+                QPushButton {
+                    font-size: 16px;
+                    padding: 10px 16px;
+                }
+            """)
+            buttons.addWidget(btn)
 
-        btn_single.setStyleSheet("""
-            QPushButton {
-                font-size: 16px;
-                padding: 10px 16px;
-            }
-        """)
+        layout.addLayout(buttons)
 
-        btn_reset.setStyleSheet("""
-            QPushButton {
-                font-size: 16px;
-                padding: 10px 16px;
-            }
-        """)
+        # Logic
+        self.btn_simulate.clicked.connect(self.run_simulation)
+        self.btn_pause.clicked.connect(self.toggle_pause)
+        self.btn_cancel.clicked.connect(self.cancel_simulation)
+        self.btn_reset.clicked.connect(self.clear_result)
+        self._set_running(False)
 
-        buttons.addWidget(btn_single)
-        buttons.addWidget(btn_reset)
+        # A running worker thread must be stopped before the app exits
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_worker)
 
-        layout.addLayout(buttons)
+    def _start_pity(self, shard: str) -> dict:
+        # Every tracked rarity's pity, as the tracker left it
+        if not self.current_pity_check.isChecked():
+            return {}
+        return dict(get_app_store().get(pity_key(shard)))
 
-        # Logic
-        btn_single.clicked.connect(self.single_pull)
-        btn_reset.clicked.connect(self.clear_result)
-
-    def single_pull(self):
-        # Example rarity rates
-        roll = random.random()
-
-        if roll < 0.01:
-            rarity = "Legendary (1%)"
-        elif roll < 0.10:
-            rarity = "Epic (9%)"
-        elif roll < 0.40:
-            rarity = "Rare (30%)"
+    # ---------------- RUN CONTROL ----------------
+
+    def run_simulation(self):
+        if self.worker is not None:
+            return
+
+        shard = self.shard_combo.currentText()
+        # Chunked across every core on a worker thread; small runs stay in-process
+        self.worker = SimulationWorker(
+            shard,
+            self.shards_spin.value(),
+            self.trials_spin.value(),
+            self._start_pity(shard),
+            self,
+        )
+        self.worker.progress.connect(self._on_progress)
+        self.worker.partial.connect(self.show_result)
+        self.worker.completed.connect(self._on_completed)
+        self.worker.cancelled.connect(self._on_cancelled)
+        self.worker.finished.connect(self._on_worker_finished)
+
+        self.result_label.setText("Simulating…")
+        self.histogram.clear()
+        self.progress_bar.setValue(0)
+        self._set_running(True)
+        self.worker.start()
+
+    def toggle_pause(self):
+        if self.worker is None:
+            return
+        if self.worker.is_paused():
+            self.worker.resume()
+            self.btn_pause.setText("Pause")
         else:
-            rarity = "Common (60%)"
+            self.worker.pause()
+            self.btn_pause.setText("Resume")
+
+    def cancel_simulation(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def stop_worker(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+
+    def _set_running(self, running: bool):
+        self.btn_simulate.setEnabled(not running)
+        self.btn_pause.setEnabled(running)
+        self.btn_cancel.setEnabled(running)
+        self.btn_pause.setText("Pause")
+        self.progress_bar.setVisible(running)
+
+    def _on_progress(self, fraction: float):
+        self.progress_bar.setValue(int(fraction * 1000))
+
+    def _on_completed(self, result):
+        self.show_result(result)
+
+    def _on_cancelled(self):
+        self.result_label.setText("Simulation cancelled")
+
+    def _on_worker_finished(self):
+        self.worker.deleteLater()
+        self.worker = None
+        self._set_running(False)
+
+    # ---------------- RESULTS ----------------
+
+    def show_result(self, result):
+        top = result.top_rarity
+        lines = [
+            f"{result.shards} {result.shard} shards: "
+            f"{result.mean(top):.2f} {top} on average, "
+            f"{result.chance_at_least(1, top) * 100:.1f}% chance of at least one"
+        ]
+        for rarity in result.rarities[:-1]:
+            lines.append(f"{result.mean(rarity):.2f} {rarity} on average")
+        self.result_label.setText("\n".join(lines))
 
-        self.result_label.setText(rarity)
+        self.histogram_title.setText(f"{top} hits per run ({result.trials:,} runs)")
+        self.histogram.set_counts(result.histogram(top), result.trials)
 
     def clear_result(self):
-        self.result_label.setText("No pull yet")
\ No newline at end of file
+        self.result_label.setText("No simulation yet")
+        self.histogram_title.clear()
+        self.histogram.clear()
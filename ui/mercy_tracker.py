@@ -2,6 +2,8 @@
 #  Mercy Tracker
 # -------------------------------------------------------------
 
+import sqlite3
+
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -10,53 +12,24 @@ from PySide6.QtWidgets import (
     QPushButton,
     QFrame,
     QInputDialog,
-    QDialog,
-    QGridLayout,
     QSpacerItem,
     QSizePolicy,
     QMessageBox,
-    QStyleFactory,
     QStackedLayout,
     QButtonGroup,
 )
-from PySide6.QtCore import Qt, Slot, Signal, QSettings
+from PySide6.QtCore import Qt, Slot
 
 from ui.shardinventory import ShardInventory
-
-
-# -------------------------------------------------------------
-#  Mercy rules for each shard type
-# -------------------------------------------------------------
-MERCY_RULES = {
-    "Ancient": {
-        "base": 0.5,
-        "soft": 200,
-        "inc": 5.0,
-        "hard": 219,
-        "rarity": "Legendary",
-    },
-    "Void": {
-        "base": 0.5,
-        "soft": 200,
-        "inc": 5.0,
-        "hard": 219,
-        "rarity": "Legendary",
-    },
-    "Sacred": {
-        "base": 6.0,
-        "soft": 12,
-        "inc": 2.0,
-        "hard": 59,
-        "rarity": "Legendary",
-    },
-    "Primal": {
-        "base": 0.1,
-        "soft": 200,
-        "inc": 10.0,
-        "hard": 210,
-        "rarity": "Mythical",
-    },
-}
+from ui.bulk_entry import BulkPullDialog
+from ui.prompt_dialogs import RarityPromptDialog, HitPositionDialog
+from logic.app_state import get_app_store, hits_key, pity_key, subscribe_widget
+from logic.pull_log import get_pull_log
+from logic.history_store import get_history
+from logic.tracing import span, traced
+from core.inventory import inventory_key
+from core.pull_state import PullState, set_hits
+from core.rules import DISPLAY_NAMES, INVENTORY_KEYS, NO_HIT
 
 
 # -------------------------------------------------------------
@@ -78,54 +51,35 @@ ACTION_BOX_BG = "#333"
 #  ShardTrackerWidget
 # -------------------------------------------------------------
 class ShardTrackerWidget(QWidget):
-    pity_changed = Signal(str, int)
-
     def __init__(self, shard_name: str):
         super().__init__()
 
         self.shard_name = shard_name
-        self.settings = QSettings("SketeRAID", "Hydra Companion")
         self.colour = SHARD_COLOURS.get(shard_name, "#2d6cdf")
 
         # Inventory mapping
-        mapping = {
-            "Ancient": ("Ancient Shards", "ancient"),
-            "Void": ("Void Shards", "void"),
-            "Primal": ("Primal Shards", "primal"),
-            "Sacred": ("Sacred Shards", "sacred"),
-        }
-        self.shard_display_name, self.inventory_key = mapping.get(
-            shard_name, (shard_name, None)
-        )
+        self.shard_display_name = DISPLAY_NAMES[shard_name]
+        self.inventory_key = INVENTORY_KEYS[shard_name]
+
+        # Pity is published to the app store (logic/app_state.py), which
+        # the other pages read; the transitions run on a PullState
+        # (core/pull_state.py) kept in step with it
+        self.store = get_app_store()
+        self._pity_key = pity_key(shard_name)
+        self._hits_key = hits_key(shard_name)
+
+        self.state = PullState(shard_name, self.store.get(self._pity_key))
+        # This shard's pity in the pull log after this tracker last wrote
+        # to it (None until the first write)
+        self._log_pity = None
+        self.supported_rarities = list(self.state.rarities)
 
-        # Supported rarities
-        if shard_name in ("Ancient", "Void"):
-            self.supported_rarities = ["Epic", "Legendary"]
-        elif shard_name == "Primal":
-            self.supported_rarities = ["Legendary", "Mythical"]
-        elif shard_name == "Sacred":
-            self.supported_rarities = ["Legendary"]
-        else:
-            self.supported_rarities = []
-
-        # Pity counters
-        self.pity = {r: 0 for r in self.supported_rarities}
-
-        # Load saved pity
-        primary_map = {
-            "Ancient": ("ancient", "Legendary"),
-            "Void": ("void", "Legendary"),
-            "Sacred": ("sacred", "Legendary"),
-            "Primal": ("primal", "Mythical"),
-        }
-        if shard_name in primary_map:
-            key, rarity = primary_map[shard_name]
-            saved = int(self.settings.value(f"pity/{key}", 0))
-            self.pity[rarity] = max(saved, 0)
-
-        self.dashboard_tab = None
         self.inventory: ShardInventory | None = None
 
+        # Prompt dialogs are built on first use and reused afterwards
+        self._rarity_dialogs = {}
+        self._hit_dialog = None
+
         # ---------------- UI ----------------
         main_layout = QVBoxLayout(self)
         main_layout.setAlignment(Qt.AlignTop)
@@ -208,7 +162,7 @@ class ShardTrackerWidget(QWidget):
         self.btn_reset.clicked.connect(self.reset_pity)
 
         self.update_pity_labels()
-        self.emit_primary_pity()
+        subscribe_widget(self, self._pity_key, self._on_pity_changed, self.store)
 
     # -------------------------------------------------------------
     #  UI Helpers
@@ -249,19 +203,19 @@ class ShardTrackerWidget(QWidget):
         if not self.inventory_key:
             self.inventory_label.setText("Current inventory: —")
             return
-        self._update_inventory_label(inventory.to_dict())
-        inventory.inventory_changed.connect(self._update_inventory_label)
+        # Only this shard's count, straight from the inventory's store
+        key = inventory_key(self.inventory_key)
+        self._update_inventory_label({key: inventory.get(self.inventory_key)})
+        subscribe_widget(self, key, self._update_inventory_label, inventory.model.store)
 
-    def _update_inventory_label(self, data: dict):
-        if not self.inventory_key:
-            return
-        value = data.get(self.inventory_key, 0)
-        self.inventory_label.setText(f"Current inventory: {value}")
+    def _update_inventory_label(self, changes: dict):
+        for value in changes.values():
+            self.inventory_label.setText(f"Current inventory: {value}")
 
     def _get_current_inventory(self) -> int:
         if not self.inventory or not self.inventory_key:
             return 0
-        return int(self.inventory.to_dict().get(self.inventory_key, 0))
+        return self.inventory.get(self.inventory_key)
 
     def _ensure_inventory_for_pulls(self, pulls: int) -> bool:
         if pulls <= 0 or not self.inventory_key:
@@ -283,46 +237,72 @@ class ShardTrackerWidget(QWidget):
         if not ok:
             return False
 
-        diff = new_count - current
-        if diff > 0:
-            for _ in range(diff):
-                self.inventory.add(self.inventory_key)
-        elif diff < 0:
-            for _ in range(-diff):
-                self.inventory.remove(self.inventory_key)
+        self.inventory.adjust(self.inventory_key, new_count - current)
 
         return pulls <= new_count
 
     def _deduct_inventory(self, pulls: int):
         if not self.inventory_key or not self.inventory:
             return
-        for _ in range(pulls):
-            self.inventory.remove(self.inventory_key)
+        self.inventory.adjust(self.inventory_key, -pulls)
 
     # -------------------------------------------------------------
-    #  Pity + Settings
+    #  Pity + Store
     # -------------------------------------------------------------
+    @property
+    def pity(self) -> dict:
+        """Current counters, {rarity: pity} (owned by self.state)."""
+        return self.state.pity
+
     def update_pity_labels(self):
         for rarity, value in self.pity.items():
             self.pity_labels[rarity].setText(f"{rarity}: {value}")
 
-    def emit_primary_pity(self):
-        primary_map = {
-            "Ancient": ("Legendary", "ancient"),
-            "Void": ("Legendary", "void"),
-            "Sacred": ("Legendary", "sacred"),
-            "Primal": ("Mythical", "primal"),
-        }
-        if self.shard_name not in primary_map:
-            return
-
-        rarity_key, settings_key = primary_map[self.shard_name]
-        if rarity_key not in self.pity:
-            return
+    def _on_pity_changed(self, changes: dict):
+        self.state.load(changes[self._pity_key])
+        self.update_pity_labels()
 
-        value = self.pity[rarity_key]
-        self.settings.setValue(f"pity/{settings_key}", value)
-        self.pity_changed.emit(self.shard_display_name, value)
+    @traced()
+    def _publish(self):
+        """Hand the new counters to the store (one commit per batch)."""
+        self.store.set(self._pity_key, dict(self.state.pity))
+
+    def _log_pull(self, kind: str, count: int, hits=()):
+        """
+        Record this pull in the event log and the history database, and
+        update the shard's hit counts in the store. Must run before
+        self.pity is updated (hits store the pity they landed at).
+        Logging never blocks tracking: a pull the log missed is made up
+        for by a set event on the next successful write.
+        """
+        try:
+            log = get_pull_log()
+            with log.locked():
+                logged = dict(log.refresh().pity[self.shard_name])
+                events = []
+                if logged != self._log_pity:
+                    # The hydra CLI recorded pulls while the app was open
+                    self.state.load(logged)
+                elif logged != self.pity:
+                    # An earlier append failed; the log is behind this tracker
+                    events.append((self.shard_name, "set", 0, set_hits(self.pity), None))
+                events.append((self.shard_name, kind, count, hits, None))
+                log.append_many(events)
+
+                state = log.state
+                self._log_pity = dict(state.pity[self.shard_name])
+                totals = dict(state.hits[self.shard_name])
+        except (OSError, ValueError):
+            totals = dict(self.store.get(self._hits_key))
+            for _pos, rarity in hits:
+                if rarity in totals:
+                    totals[rarity] += 1
+        self.store.set(self._hits_key, totals)
+
+        try:
+            get_history().record_pull(self.shard_name, kind, count, hits, dict(self.pity))
+        except sqlite3.Error:
+            pass
 
     # -------------------------------------------------------------
     #  Reset
@@ -344,28 +324,19 @@ class ShardTrackerWidget(QWidget):
     def reset_pity(self):
         if not self._confirm_reset_pity():
             return
-        for r in self.pity:
-            self.pity[r] = 0
-        self.update_pity_labels()
-        self.emit_primary_pity()
+        with self.store.batch():
+            self._log_pull("reset", 0)
+            self.state.reset()
+            self._publish()
 
     # -------------------------------------------------------------
     #  Hard Pity
     # -------------------------------------------------------------
     def _highest_rarity_for_shard(self):
-        return {
-            "Ancient": "Legendary",
-            "Void": "Legendary",
-            "Sacred": "Legendary",
-            "Primal": "Mythical",
-        }.get(self.shard_name)
+        return self.state.top_rarity
 
     def _check_and_handle_hard_pity(self):
-        rules = MERCY_RULES.get(self.shard_name)
-        highest = self._highest_rarity_for_shard()
-        if not rules or not highest:
-            return
-        if self.pity.get(highest, 0) >= rules["hard"]:
+        if self.state.at_hard_pity():
             self._handle_hard_pity_reached()
 
     def _show_hard_pity_choice_dialog(self, highest_rarity: str):
@@ -395,13 +366,10 @@ class ShardTrackerWidget(QWidget):
         return "cancel"
 
     def _record_hard_pity_hit(self, highest_rarity: str):
-        for r in self.pity:
-            self.pity[r] = 0
-        self.update_pity_labels()
-        self.emit_primary_pity()
-
-        if self.dashboard_tab:
-            self.dashboard_tab.register_pull(self.shard_display_name, highest_rarity)
+        with self.store.batch():
+            self._log_pull("hard_pity", 0, [(0, highest_rarity)])
+            self.state.record_hard_pity()
+            self._publish()
 
     def _handle_hard_pity_reached(self):
         highest = self._highest_rarity_for_shard()
@@ -421,7 +389,7 @@ class ShardTrackerWidget(QWidget):
         if not self._ensure_inventory_for_pulls(1):
             return
 
-        rarities = list(self.supported_rarities) + ["No Hit"]
+        rarities = list(self.supported_rarities) + [NO_HIT]
         dialog, selected = self._build_rarity_dialog(
             "Single Pull Result",
             "Select the rarity for this pull.",
@@ -433,26 +401,17 @@ class ShardTrackerWidget(QWidget):
 
         rarity = selected["rarity"]
 
-        if rarity == "No Hit" or rarity is None:
-            for r in self.pity:
-                self.pity[r] += 1
-        else:
-            if rarity in self.pity:
-                for r in self.pity:
-                    if r == rarity:
-                        self.pity[r] = 0
-                    else:
-                        if r == "Epic" and rarity in ("Legendary", "Mythical"):
-                            self.pity[r] = 0
-                        if r == "Legendary" and rarity == "Mythical":
-                            self.pity[r] = 0
-
-            if self.dashboard_tab:
-                self.dashboard_tab.register_pull(self.shard_display_name, rarity)
-
-        self._deduct_inventory(1)
-        self.update_pity_labels()
-        self.emit_primary_pity()
+        # Timed from the answer on, so the span excludes the user's think time
+        with span("ShardTrackerWidget.handle_single_pull", shard=self.shard_name), self.store.batch():
+            if rarity == NO_HIT or rarity is None:
+                self._log_pull("single", 1)
+                self.state.single()
+            else:
+                self._log_pull("single", 1, [(1, rarity)])
+                self.state.single(rarity)
+
+            self._deduct_inventory(1)
+            self._publish()
         self._check_and_handle_hard_pity()
 
     @Slot()
@@ -460,31 +419,18 @@ class ShardTrackerWidget(QWidget):
         if not self._ensure_inventory_for_pulls(10):
             return
 
-        hits = self.ask_hits_shards_10pull()
+        logged_hits = []
+        for pos in self.ask_hits_shards_10pull():
+            rarity = self.ask_rarity_for_shard(pos)
+            if rarity in self.pity:
+                logged_hits.append((pos, rarity))
 
-        if not hits:
-            for r in self.pity:
-                self.pity[r] += 10
-        else:
-            hits_by_rarity = {r: [] for r in self.pity}
-
-            for pos in hits:
-                rarity = self.ask_rarity_for_shard(pos)
-                if rarity in hits_by_rarity:
-                    hits_by_rarity[rarity].append(pos)
-                    if self.dashboard_tab:
-                        self.dashboard_tab.register_pull(self.shard_display_name, rarity)
-
-            for rarity in self.pity:
-                if hits_by_rarity[rarity]:
-                    latest = max(hits_by_rarity[rarity])
-                    self.pity[rarity] = 10 - latest
-                else:
-                    self.pity[rarity] += 10
-
-        self._deduct_inventory(10)
-        self.update_pity_labels()
-        self.emit_primary_pity()
+        with span("ShardTrackerWidget.handle_ten_pull", shard=self.shard_name), self.store.batch():
+            self._log_pull("ten", 10, logged_hits)
+            self.state.apply("ten", 10, logged_hits)
+
+            self._deduct_inventory(10)
+            self._publish()
         self._check_and_handle_hard_pity()
 
     @Slot()
@@ -498,330 +444,82 @@ class ShardTrackerWidget(QWidget):
         if not self._ensure_inventory_for_pulls(count):
             return
 
-        total = count
-        remaining = total
-        offset = 0
-
-        hits_by_rarity = {r: [] for r in self.pity}
-
-        while remaining > 0:
-            block = min(10, remaining)
-            start = offset + 1
-            end = offset + block
-
-            block_hits = self.ask_hits_shards_block(block, start, end)
-
-            for pos in block_hits:
-                rarity = self.ask_rarity_for_shard(pos)
-                if rarity in hits_by_rarity:
-                    hits_by_rarity[rarity].append(pos)
-                    if self.dashboard_tab:
-                        self.dashboard_tab.register_pull(self.shard_display_name, rarity)
-
-            remaining -= block
-            offset += block
+        # One bulk-entry view for every position instead of a dialog per block/hit
+        dialog = BulkPullDialog(count, self.supported_rarities, self)
+        if not dialog.exec():
+            return
 
-        for rarity in self.pity:
-            if hits_by_rarity[rarity]:
-                latest = max(hits_by_rarity[rarity])
-                self.pity[rarity] = total - latest
-            else:
-                self.pity[rarity] += total
+        self._commit_bulk_pull("custom", count, dialog.hits())
+
+    @traced()
+    def _commit_bulk_pull(self, kind: str, total: int, hits: list[tuple[int, str]]):
+        """
+        Apply a multi-shard pull in one step: log it, then publish the new
+        pity, hits and inventory in one store batch. If anything fails the
+        batch rolls back the store keys only; the log and history entries
+        written by _log_pull stay.
+        """
+        hits = [(pos, r) for pos, r in hits if r in self.pity]
+        with self.store.batch():
+            self._log_pull(kind, total, hits)
+            new_pity = self.state.preview(kind, total, hits)
+
+            self._deduct_inventory(total)
+            self.state.load(new_pity)
+            self._publish()
 
-        self._deduct_inventory(total)
-        self.update_pity_labels()
-        self.emit_primary_pity()
         self._check_and_handle_hard_pity()
 
     # -------------------------------------------------------------
     #  Dialogs
     # -------------------------------------------------------------
     def _build_rarity_dialog(self, title: str, message: str, rarities: list[str]):
-        dialog = QDialog(self)
-        dialog.setStyle(QStyleFactory.create("Fusion"))
-        dialog.setWindowTitle(title)
-
-        layout = QVBoxLayout(dialog)
-        layout.setSpacing(8)
-
-        info = QLabel(message)
-        info.setStyleSheet("font-size: 12px; color: #ccc;")
-        layout.addWidget(info)
-
-        style_epic = (
-            "QPushButton { background-color: #7b2cff; color: white; "
-            "border-radius: 6px; padding: 6px 10px; border: none; }"
-        )
-        style_legendary = (
-            "QPushButton { background-color: #d4af37; color: black; "
-            "border-radius: 6px; padding: 6px 10px; border: none; }"
-        )
-        style_mythical = (
-            "QPushButton { background-color: #cc3333; color: white; "
-            "border-radius: 6px; padding: 6px 10px; border: none; }"
-        )
-        style_nohit = (
-            "QPushButton { background-color: #444; color: #ccc; "
-            "border-radius: 6px; padding: 6px 10px; border: none; }"
-        )
-
-        selected = {"rarity": None}
-        buttons = {}
-
-        rarity_row = QHBoxLayout()
-        rarity_row.setSpacing(8)
-
-        for rarity in rarities:
-            if rarity == "Epic":
-                base = style_epic
-            elif rarity == "Legendary":
-                base = style_legendary
-            elif rarity == "Mythical":
-                base = style_mythical
-            else:
-                base = style_nohit
-
-            btn = QPushButton(rarity)
-            btn.setCheckable(True)
-            btn.setStyleSheet(
-                base
-                + "QPushButton:checked { "
-                "background-color: #2d6cdf; "
-                "color: white; "
-                "border: 2px solid white; "
-                "font-weight: bold; "
-                "} "
-            )
-
-            def handler(r=rarity, b=btn):
-                selected["rarity"] = r
-                for other in buttons.values():
-                    if other is not b:
-                        other.setChecked(False)
-                b.setChecked(True)
-
-            btn.clicked.connect(handler)
-            buttons[rarity] = btn
-            rarity_row.addWidget(btn)
-
-        layout.addLayout(rarity_row)
-
-        bottom_row = QHBoxLayout()
-        bottom_row.setAlignment(Qt.AlignRight)
-        bottom_row.setSpacing(8)
-
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setStyleSheet(
-            "QPushButton { background-color: #555; color: #eee; "
-            "border-radius: 6px; padding: 6px 10px; }"
-        )
-
-        confirm_btn = QPushButton("Confirm")
-        confirm_btn.setStyleSheet(
-            "QPushButton { background-color: #2d6cdf; color: white; "
-            "border-radius: 6px; padding: 6px 10px; }"
-        )
-
-        cancel_btn.clicked.connect(dialog.reject)
-        confirm_btn.clicked.connect(dialog.accept)
-
-        bottom_row.addWidget(cancel_btn)
-        bottom_row.addWidget(confirm_btn)
-        layout.addLayout(bottom_row)
-
-        return dialog, selected
+        """Pooled rarity prompt for this tracker, reset for a new question."""
+        key = tuple(rarities)
+        dialog = self._rarity_dialogs.get(key)
+        if dialog is None:
+            dialog = self._rarity_dialogs[key] = RarityPromptDialog(list(rarities), self)
+        dialog.prepare(title, message)
+        return dialog, dialog.selected
+
+    def _position_dialog(self, title: str, message: str, start: int, end: int) -> HitPositionDialog:
+        if self._hit_dialog is None:
+            self._hit_dialog = HitPositionDialog(self)
+        return self._hit_dialog.prepare(title, message, start, end)
 
     def ask_hits_shards_10pull(self) -> list[int]:
-        dialog = QDialog(self)
-        dialog.setWindowTitle("10‑Pull: Hit Positions")
-        dialog.setStyle(QStyleFactory.create("Fusion"))
-
-        layout = QVBoxLayout(dialog)
-        layout.setSpacing(10)
-
-        label = QLabel("Select which shard positions (1–10) were hits.")
-        label.setStyleSheet("font-size: 12px; color: #ccc;")
-        layout.addWidget(label)
-
-        grid = QGridLayout()
-        grid.setSpacing(6)
-
-        buttons = {}
-        for i in range(1, 11):
-            btn = QPushButton(str(i))
-            btn.setCheckable(True)
-            btn.setStyleSheet(
-                "QPushButton { background-color: #444; color: #eee; "
-                "border-radius: 6px; padding: 6px 10px; }"
-                "QPushButton:checked { background-color: #2d6cdf; color: white; }"
-            )
-            buttons[i] = btn
-            grid.addWidget(btn, (i - 1) // 5, (i - 1) % 5)
-
-        layout.addLayout(grid)
-
-        bottom = QHBoxLayout()
-        bottom.setAlignment(Qt.AlignRight)
-
-        cancel_btn = QPushButton("Cancel")
-        confirm_btn = QPushButton("Confirm")
-
-        cancel_btn.clicked.connect(dialog.reject)
-        confirm_btn.clicked.connect(dialog.accept)
-
-        bottom.addWidget(cancel_btn)
-        bottom.addWidget(confirm_btn)
-        layout.addLayout(bottom)
-
+        dialog = self._position_dialog(
+            "10‑Pull: Hit Positions",
+            "Select which shard positions (1–10) were hits.",
+            1,
+            10,
+        )
         if not dialog.exec():
             return []
 
-        return [i for i, b in buttons.items() if b.isChecked()]
+        return dialog.checked_positions()
 
     def ask_rarity_for_shard(self, position: int) -> str:
-        rarities = list(self.supported_rarities) + ["No Hit"]
-
-        dialog = QDialog(self)
-        dialog.setWindowTitle(f"Hit at Position {position}")
-        dialog.setStyle(QStyleFactory.create("Fusion"))
-
-        layout = QVBoxLayout(dialog)
-        layout.setSpacing(10)
+        rarities = list(self.supported_rarities) + [NO_HIT]
 
-        label = QLabel(f"Select the rarity for hit at position {position}:")
-        label.setStyleSheet("font-size: 12px; color: #ccc;")
-        layout.addWidget(label)
-
-        selected = {"rarity": None}
-        buttons = {}
-
-        row = QHBoxLayout()
-        row.setSpacing(8)
-
-        style_epic = (
-            "QPushButton { background-color: #7b2cff; color: white; "
-            "border-radius: 6px; padding: 6px 10px; border: none; }"
-        )
-        style_legendary = (
-            "QPushButton { background-color: #d4af37; color: black; "
-            "border-radius: 6px; padding: 6px 10px; border: none; }"
-        )
-        style_mythical = (
-            "QPushButton { background-color: #cc3333; color: white; "
-            "border-radius: 6px; padding: 6px 10px; border: none; }"
-        )
-        style_nohit = (
-            "QPushButton { background-color: #444; color: #ccc; "
-            "border-radius: 6px; padding: 6px 10px; border: none; }"
+        dialog, selected = self._build_rarity_dialog(
+            f"Hit at Position {position}",
+            f"Select the rarity for hit at position {position}:",
+            rarities,
         )
-
-        for rarity in rarities:
-            if rarity == "Epic":
-                base = style_epic
-            elif rarity == "Legendary":
-                base = style_legendary
-            elif rarity == "Mythical":
-                base = style_mythical
-            else:
-                base = style_nohit
-
-            btn = QPushButton(rarity)
-            btn.setCheckable(True)
-            btn.setStyleSheet(
-                base
-                + "QPushButton:checked { background-color: #2d6cdf; color: white; "
-                "border: 2px solid white; font-weight: bold; }"
-            )
-
-            def handler(r=rarity, b=btn):
-                selected["rarity"] = r
-                for other in buttons.values():
-                    if other is not b:
-                        other.setChecked(False)
-                b.setChecked(True)
-
-            btn.clicked.connect(handler)
-            buttons[rarity] = btn
-            row.addWidget(btn)
-
-        layout.addLayout(row)
-
-        bottom = QHBoxLayout()
-        bottom.setAlignment(Qt.AlignRight)
-
-        cancel_btn = QPushButton("Cancel")
-        confirm_btn = QPushButton("Confirm")
-
-        cancel_btn.clicked.connect(dialog.reject)
-        confirm_btn.clicked.connect(dialog.accept)
-
-        bottom.addWidget(cancel_btn)
-        bottom.addWidget(confirm_btn)
-        layout.addLayout(bottom)
-
         if not dialog.exec():
-            return "No Hit"
-
-        return selected["rarity"] or "No Hit"
+            return NO_HIT
 
-    def ask_hits_shards_block(self, block_size: int, start: int, end: int) -> list[int]:
-        dialog = QDialog(self)
-        dialog.setWindowTitle(f"Hits in Positions {start}–{end}")
-        dialog.setStyle(QStyleFactory.create("Fusion"))
-
-        layout = QVBoxLayout(dialog)
-        layout.setSpacing(10)
-
-        label = QLabel(f"Select which positions ({start}–{end}) were hits:")
-        label.setStyleSheet("font-size: 12px; color: #ccc;")
-        layout.addWidget(label)
-
-        grid = QGridLayout()
-        grid.setSpacing(6)
-
-        buttons = {}
-        for i in range(start, end + 1):
-            btn = QPushButton(str(i))
-            btn.setCheckable(True)
-            btn.setStyleSheet(
-                "QPushButton { background-color: #444; color: #eee; "
-                "border-radius: 6px; padding: 6px 10px; }"
-                "QPushButton:checked { background-color: #2d6cdf; color: white; }"
-            )
-            buttons[i] = btn
-            grid.addWidget(btn, (i - start) // 5, (i - start) % 5)
-
-        layout.addLayout(grid)
-
-        bottom = QHBoxLayout()
-        bottom.setAlignment(Qt.AlignRight)
-
-        cancel_btn = QPushButton("Cancel")
-        confirm_btn = QPushButton("Confirm")
-
-        cancel_btn.clicked.connect(dialog.reject)
-        confirm_btn.clicked.connect(dialog.accept)
-
-        bottom.addWidget(cancel_btn)
-        bottom.addWidget(confirm_btn)
-        layout.addLayout(bottom)
-
-        if not dialog.exec():
-            return []
-
-        return [i for i, b in buttons.items() if b.isChecked()]
+        return selected["rarity"] or NO_HIT
 
 
 # -------------------------------------------------------------
 #  MercyTrackerTab
 # -------------------------------------------------------------
 class MercyTrackerTab(QWidget):
-    pity_updated = Signal(str, int)
-
     def __init__(self):
         super().__init__()
 
-        self.dashboard_tab = None
         self.inventory: ShardInventory | None = None
 
         main_layout = QVBoxLayout(self)
@@ -876,11 +574,6 @@ class MercyTrackerTab(QWidget):
 
         main_layout.addWidget(self.stack_container)
 
-        self.ancient_tab.pity_changed.connect(self.pity_updated.emit)
-        self.void_tab.pity_changed.connect(self.pity_updated.emit)
-        self.primal_tab.pity_changed.connect(self.pity_updated.emit)
-        self.sacred_tab.pity_changed.connect(self.pity_updated.emit)
-
         self.segment_group.idClicked.connect(self._on_segment_clicked)
 
         self.segment_group.button(0).setChecked(True)
@@ -941,13 +634,6 @@ class MercyTrackerTab(QWidget):
         for i, w in enumerate(widgets):
             w.set_active(i == index)
 
-    def set_dashboard(self, dashboard):
-        self.dashboard_tab = dashboard
-        self.ancient_tab.dashboard_tab = dashboard
-        self.void_tab.dashboard_tab = dashboard
-        self.primal_tab.dashboard_tab = dashboard
-        self.sacred_tab.dashboard_tab = dashboard
-
     def set_inventory(self, inventory: ShardInventory):
         self.inventory = inventory
         self.ancient_tab.set_inventory(inventory)
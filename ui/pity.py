@@ -7,70 +7,70 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QFrame,
 )
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QSettings
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve
 from PySide6.QtWidgets import QGraphicsOpacityEffect
 
+from ui import theme as theme_engine
+from ui.animation import AMBIENT_FPS, get_animation_manager
+from ui.pity_curve import PityCurveWidget
+from logic.persistence import get_settings_store
+from logic.history_store import get_history
+from logic.cycle_history import DEFAULT_DEPTH, get_cycle_history
+from logic.app_state import chance_key, eta_key, get_app_store, primary_key, shard_of, subscribe_widget
+from logic import mercy
+from logic.tracing import traced
+from core.rules import DISPLAY_NAMES, MERCY_RULES, SHARDS, shard_from_display
+
+
+# Completed cycles kept per banner (ghost lines on the pity curve)
+CYCLE_DEPTH_KEY = "pity_curve/depth"
+
+# The old list mixed all banners; replaced by the per-banner buffers
+LEGACY_HISTORY_KEY = "pity_curve/history"
+LEGACY_HISTORY_DROPPED_KEY = "pity_curve/history_dropped"
+
+
+def _drop_legacy_cycle_history(settings):
+    """One-time removal of the pre-ring-buffer cycle list."""
+    if str(settings.value(LEGACY_HISTORY_DROPPED_KEY, False)).lower() in ("1", "true"):
+        return
+    settings.remove(LEGACY_HISTORY_KEY)
+    settings.setValue(LEGACY_HISTORY_DROPPED_KEY, True)
+
 
 class PityPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.setObjectName("pityPage")
 
         # Persistent storage
-        self.settings = QSettings("SketeRAID", "Hydra Companion")
+        self.settings = get_settings_store()
+        self.history = get_history()
 
         # Theme awareness
         self.current_theme = "dark"
+        self.theme_tokens = theme_engine.tokens(self.current_theme)
 
-        # Mercy rules
+        # Mercy rules (shared with the rest of the app, see core/rules.py)
         self.banners = {
-            "Ancient Shards": {
-                "current": 0,
-                "base": 0.5,
-                "soft": 200,
-                "inc": 5.0,
-                "hard": 219,
-                "rarity": "Legendary",
-            },
-            "Void Shards": {
-                "current": 0,
-                "base": 0.5,
-                "soft": 200,
-                "inc": 5.0,
-                "hard": 219,
-                "rarity": "Legendary",
-            },
-            "Sacred Shards": {
-                "current": 0,
-                "base": 6.0,
-                "soft": 12,
-                "inc": 2.0,
-                "hard": 59,
-                "rarity": "Legendary",
-            },
-            "Primal Shards": {
-                "current": 0,
-                "base": 0.1,
-                "soft": 200,
-                "inc": 10.0,
-                "hard": 210,
-                "rarity": "Mythical",
-            },
+            DISPLAY_NAMES[shard]: dict(rules)
+            for shard, rules in MERCY_RULES.items()
         }
 
-        # Load saved pity
-        key_map = {
-            "Ancient Shards": "ancient",
-            "Void Shards": "void",
-            "Sacred Shards": "sacred",
-            "Primal Shards": "primal",
+        # Top-rarity pity, chance and ETA come from the app store
+        # (logic/app_state.py); the page only watches the pity
+        self.store = get_app_store()
+        self._previous_pulls = {
+            banner: self._pulls(banner) for banner in self.banners
         }
 
-        for banner, key in key_map.items():
-            saved = int(self.settings.value(f"pity/{key}", 0))
-            self.banners[banner]["current"] = saved
-
-        # Load curve history
-        self.curve_history = self._load_curve_history()
+        # Completed cycles per banner, in fixed-size ring buffers
+        depth = int(self.settings.value(CYCLE_DEPTH_KEY, DEFAULT_DEPTH))
+        self.cycle_history = {
+            banner: get_cycle_history(shard_from_display(banner), depth)
+            for banner in self.banners
+        }
+        _drop_legacy_cycle_history(self.settings)
 
         self.current_banner = "Ancient Shards"
         self.last_chance_value = 0.0
@@ -122,6 +122,12 @@ class PityPage(QWidget):
         self.combined_label.setStyleSheet("font-size: 13px;")
         main_layout.addWidget(self.combined_label)
 
+        # Forecast label (exact pulls-to-guarantee distribution)
+        self.forecast_label = QLabel()
+        self.forecast_label.setAlignment(Qt.AlignCenter)
+        self.forecast_label.setStyleSheet("font-size: 12px;")
+        main_layout.addWidget(self.forecast_label)
+
         # Increment label
         self.increment_label = QLabel()
         self.increment_label.setAlignment(Qt.AlignCenter)
@@ -130,6 +136,7 @@ class PityPage(QWidget):
 
         # --- Status box ---
         self.status_frame = QFrame()
+        self.status_frame.setObjectName("pityStatusFrame")
         status_layout = QVBoxLayout(self.status_frame)
         status_layout.setContentsMargins(8, 6, 8, 6)
         status_layout.setAlignment(Qt.AlignCenter)
@@ -143,6 +150,7 @@ class PityPage(QWidget):
 
         # --- Milestone box ---
         self.milestone_frame = QFrame()
+        self.milestone_frame.setObjectName("pityPanel")
         milestone_layout = QVBoxLayout(self.milestone_frame)
         milestone_layout.setContentsMargins(8, 6, 8, 6)
         milestone_layout.setSpacing(2)
@@ -150,8 +158,9 @@ class PityPage(QWidget):
         self.milestone_soft = QLabel()
         self.milestone_hard = QLabel()
         self.milestone_next = QLabel()
+        self.milestone_history = QLabel()
 
-        for lbl in (self.milestone_soft, self.milestone_hard, self.milestone_next):
+        for lbl in (self.milestone_soft, self.milestone_hard, self.milestone_next, self.milestone_history):
             lbl.setStyleSheet("font-size: 12px;")
             milestone_layout.addWidget(lbl)
 
@@ -161,6 +170,7 @@ class PityPage(QWidget):
         # NEW: Pity Curve Frame (replaces sparkline)
         # ---------------------------------------------------------
         self.curve_frame = QFrame()
+        self.curve_frame.setObjectName("pityPanel")
         curve_layout = QVBoxLayout(self.curve_frame)
         curve_layout.setContentsMargins(8, 6, 8, 6)
         curve_layout.setSpacing(4)
@@ -170,14 +180,8 @@ class PityPage(QWidget):
         self.curve_title.setStyleSheet("font-size: 13px; font-weight: bold;")
         curve_layout.addWidget(self.curve_title)
 
-        # 6 rows of hybrid curve
-        self.curve_rows = []
-        for _ in range(6):
-            row = QLabel()
-            row.setAlignment(Qt.AlignCenter)
-            row.setStyleSheet("font-family: Consolas, 'Courier New', monospace; font-size: 11px;")
-            self.curve_rows.append(row)
-            curve_layout.addWidget(row)
+        self.curve_widget = PityCurveWidget()
+        curve_layout.addWidget(self.curve_widget)
 
         self.curve_explanation = QLabel(
             "Current pity shown bold. Previous cycles appear as faint ghost lines."
@@ -191,6 +195,11 @@ class PityPage(QWidget):
         # Apply theme + UI
         self.apply_theme_styles()
         self.refresh_ui(initial=True)
+
+        subscribe_widget(
+            self, [primary_key(shard) for shard in SHARDS], self._on_pity_changed, self.store
+        )
+
     # ---------------------------------------------------------
     # Theme handling
     # ---------------------------------------------------------
@@ -202,147 +211,26 @@ class PityPage(QWidget):
 
     def apply_theme_styles(self):
         """
-        Applies theme styling to all UI elements, including the new Pity Curve frame.
-        """
-        if self.current_theme == "dark":
-            track_bg = "#222222"
-            text_color = "#FFFFFF"
-
-            tooltip_style = """
-                QToolTip {
-                    background-color: #333333;
-                    color: #f0f0f0;
-                    border: 1px solid #888;
-                    padding: 6px;
-                    font-size: 12px;
-                }
-            """
-
-            status_bg = "#222222"
-            status_border = "#555555"
-            milestone_bg = "#1b1b1b"
-            milestone_border = "#555555"
-
-        else:
-            track_bg = "#EEEEEE"
-            text_color = "#202020"
-
-            tooltip_style = """
-                QToolTip {
-                    background-color: #fdfdfd;
-                    color: #202020;
-                    border: 1px solid #aaa;
-                    padding: 6px;
-                    font-size: 12px;
-                }
-            """
-
-            status_bg = "#f0f0f0"
-            status_border = "#CCCCCC"
-            milestone_bg = "#f5f5f5"
-            milestone_border = "#CCCCCC"
-
-        # Apply tooltip theme
-        if self.window():
-            current = self.window().styleSheet()
-            self.window().setStyleSheet(current + tooltip_style)
-
-        # Global widget theme
-        self.setStyleSheet(
-            f"""
-            QWidget {{
-                background-color: transparent;
-                color: {text_color};
-            }}
-            QComboBox {{
-                background-color: {track_bg};
-                color: {text_color};
-                border: 1px solid #666;
-                border-radius: 4px;
-                padding: 4px 8px;
-            }}
-            QComboBox QAbstractItemView {{
-                background-color: {track_bg};
-                color: {text_color};
-                selection-background-color: #555555;
-            }}
-        """
-        )
-
-        # Progress bar base style
-        self.base_progress_stylesheet = f"""
-            QProgressBar {{
-                border: 1px solid #444;
-                border-radius: 6px;
-                background-color: {track_bg};
-                text-align: center;
-                color: {text_color};
-            }}
-            QProgressBar::chunk {{
-                background-color: #4CAF50;
-                border-radius: 6px;
-            }}
-        """
-        self.progress_bar.setStyleSheet(self.base_progress_stylesheet)
-
-        # Status frame
-        self.status_frame.setStyleSheet(
-            f"""
-            QFrame {{
-                border: 1px solid {status_border};
-                border-radius: 8px;
-                padding: 8px;
-                background-color: {status_bg};
-            }}
-        """
-        )
-
-        # Milestone frame
-        self.milestone_frame.setStyleSheet(
-            f"""
-            QFrame {{
-                border: 1px solid {milestone_border};
-                border-radius: 8px;
-                padding: 6px;
-                background-color: {milestone_bg};
-            }}
-        """
-        )
-
-        # NEW: Curve frame theme
-        self.curve_frame.setStyleSheet(
-            f"""
-            QFrame {{
-                border: 1px solid {milestone_border};
-                border-radius: 8px;
-                padding: 6px;
-                background-color: {milestone_bg};
-            }}
+        Pulls colour tokens for the current theme. The stylesheet itself is
+        applied once on the main window (see ui/theme.py); the page only
+        keeps tokens for the parts it renders by hand (the pity curve).
         """
-        )
+        self.theme_tokens = theme_engine.tokens(self.current_theme)
 
     # ---------------------------------------------------------
     # Mercy logic
     # ---------------------------------------------------------
 
-    def compute_chance(self, banner_name: str) -> float:
-        data = self.banners[banner_name]
-        pulls = data["current"]
-        base = data["base"]
-        soft = data["soft"]
-        inc = data["inc"]
-        hard = data["hard"]
+    def _pulls(self, banner_name: str) -> int:
+        """Top-rarity pity of a banner, clamped to its hard pity."""
+        pulls = self.store.get(primary_key(shard_from_display(banner_name)))
+        return max(0, min(pulls, self.banners[banner_name]["hard"]))
 
-        if pulls <= soft:
-            chance = base
-        else:
-            extra = min(pulls, hard) - soft
-            chance = base + extra * inc
-
-        if pulls >= hard:
-            chance = 100.0
+    def compute_chance(self, banner_name: str) -> float:
+        return self.store.get(chance_key(shard_from_display(banner_name)))
 
-        return max(0.0, min(chance, 100.0))
+    def _mercy_table(self, banner_name: str) -> mercy.MercyTable:
+        return mercy.get_table(shard_from_display(banner_name))
 
     # ---------------------------------------------------------
     # Progress bar animation
@@ -355,60 +243,46 @@ class PityPage(QWidget):
             self.progress_bar.setValue(new_value)
             return
 
-        if self.value_animation.state() == QPropertyAnimation.Running:
-            self.value_animation.stop()
+        animations = get_animation_manager()
+        animations.stop(self.value_animation)
 
         self.value_animation = QPropertyAnimation(self.progress_bar, b"value", self)
         self.value_animation.setDuration(700)
         self.value_animation.setEasingCurve(QEasingCurve.InOutCubic)
         self.value_animation.setStartValue(self.progress_bar.value())
         self.value_animation.setEndValue(new_value)
-        self.value_animation.start()
+        animations.start(self.value_animation, self.progress_bar)
 
     # ---------------------------------------------------------
     # Glow + pulse
     # ---------------------------------------------------------
 
     def apply_glow_and_pulse(self, chance: float, rarity: str):
-        # Reset to base style
-        self.progress_bar.setStyleSheet(self.base_progress_stylesheet)
+        glow = rarity if chance >= 75.0 else ""
+
+        animations = get_animation_manager()
 
         # Stop previous pulse
-        if self.pulse_animation and self.pulse_animation.state() == QPropertyAnimation.Running:
-            self.pulse_animation.stop()
+        if self.pulse_animation:
+            animations.stop(self.pulse_animation)
+            self.pulse_animation.deleteLater()
+            self.pulse_animation = None
         if self.pulse_effect:
             self.progress_bar.setGraphicsEffect(None)
             self.pulse_effect = None
 
+        # Glow colours live in the theme stylesheet; only repolish on change
+        if self.progress_bar.property("glow") != glow:
+            self.progress_bar.setProperty("glow", glow)
+            self.progress_bar.style().unpolish(self.progress_bar)
+            self.progress_bar.style().polish(self.progress_bar)
+
         # Only glow at high chance
-        if chance < 75.0:
+        if not glow:
             return
 
-        chunk_color = "#FFD700" if rarity == "Legendary" else "#FF3B3B"
-
-        if self.current_theme == "dark":
-            track_bg = "#222222"
-            text_color = "#FFFFFF"
-        else:
-            track_bg = "#EEEEEE"
-            text_color = "#202020"
-
-        glow_stylesheet = f"""
-            QProgressBar {{
-                border: 1px solid #888;
-                border-radius: 6px;
-                background-color: {track_bg};
-                text-align: center;
-                color: {text_color};
-            }}
-            QProgressBar::chunk {{
-                background-color: {chunk_color};
-                border-radius: 6px;
-            }}
-        """
-        self.progress_bar.setStyleSheet(glow_stylesheet)
-
-        # Pulse effect
+        # Pulse effect (paused by the manager while the bar is off screen;
+        # with reduced motion the glow stays at full opacity)
         self.pulse_effect = QGraphicsOpacityEffect(self.progress_bar)
         self.progress_bar.setGraphicsEffect(self.pulse_effect)
 
@@ -418,15 +292,16 @@ class PityPage(QWidget):
         self.pulse_animation.setEndValue(1.0)
         self.pulse_animation.setEasingCurve(QEasingCurve.InOutQuad)
         self.pulse_animation.setLoopCount(-1)
-        self.pulse_animation.start()
+        animations.start(self.pulse_animation, self.progress_bar, fps=AMBIENT_FPS)
 
     # ---------------------------------------------------------
     # UI refresh
     # ---------------------------------------------------------
 
+    @traced()
     def refresh_ui(self, initial: bool = False):
         data = self.banners[self.current_banner]
-        pulls = data["current"]
+        pulls = self._pulls(self.current_banner)
         soft = data["soft"]
         inc = data["inc"]
         hard = data["hard"]
@@ -441,6 +316,13 @@ class PityPage(QWidget):
         self.combined_label.setText(f"{pulls} pulls — {chance:.1f}% chance")
         self.increment_label.setText(f"+{inc:.1f}% per pull after {soft} pulls")
 
+        dist = self.store.get(eta_key(shard_from_display(self.current_banner)))
+        self.forecast_label.setText(
+            f"Expected {dist.expected:.1f} more pulls — median {dist.median}, "
+            f"90%: {dist.p90}, 99%: {dist.p99} — "
+            f"{dist.hit_within(10) * 100:.1f}% within 10 pulls"
+        )
+
         # Status text
         if chance >= 75.0:
             preview_text = f"High chance of {rarity}"
@@ -464,7 +346,17 @@ class PityPage(QWidget):
         else:
             self.milestone_next.setText("Next: At or beyond hard pity")
 
-        # NEW: Render the hybrid pity curve
+        # Logged history for this banner's top rarity
+        shard = shard_from_display(self.current_banner)
+        stats = self.history.pity_at_hit_stats(shard, rarity)
+        if stats["count"]:
+            self.milestone_history.setText(
+                f"Logged {rarity} hits: {stats['count']} — average pity {stats['average']:.1f}"
+            )
+        else:
+            self.milestone_history.setText(f"Logged {rarity} hits: none yet")
+
+        # Pity curve
         self._render_pity_curve(self.current_banner)
 
         # Tooltips
@@ -477,6 +369,11 @@ class PityPage(QWidget):
             "Shows your current pity count and the resulting chance for the next pull."
         )
 
+        self.forecast_label.setToolTip(
+            f"Exact distribution of how many more pulls it takes to hit a {rarity}:\n"
+            "expected value, median and the 90th / 99th percentiles."
+        )
+
         self.rarity_preview.setToolTip(
             f"Indicates how likely you are to pull a {rarity} based on your current pity."
         )
@@ -487,82 +384,27 @@ class PityPage(QWidget):
         self.last_chance_value = chance
 
     # ---------------------------------------------------------
-    # Hybrid 6-row pity curve renderer
+    # Pity curve
     # ---------------------------------------------------------
 
+    @traced()
     def _render_pity_curve(self, banner_name: str):
         """
-        Renders a 6-row text-based curve:
-        - Current cycle: bold █ characters
-        - Previous cycles: faint · ghost lines
+        Feeds the painted curve. Only the pity changes on a normal pull,
+        which repaints the overlay alone; the widget rebuilds its cached
+        layer when the banner, ghost cycles or theme change.
         """
         data = self.banners[banner_name]
-        pulls = data["current"]
-        soft = data["soft"]
-        hard = data["hard"]
-
-        rows = 6
-        cols = 32  # horizontal resolution
-
-        # Compute normalized chance (0..1)
-        def norm_chance(pull: int) -> float:
-            if pull <= soft:
-                return 0.0
-            extra = min(pull, hard) - soft
-            span = max(1, hard - soft)
-            return max(0.0, min(extra / span, 1.0))
-
-        # Build empty grid
-        grid = [[" " for _ in range(cols)] for _ in range(rows)]
-
-        # Map normalized value to row index (0 = top)
-        def value_to_row(v: float) -> int:
-            return max(0, min(rows - 1, rows - 1 - int(round(v * (rows - 1)))))
-
-        # 1) Draw ghost history
-        ghost_cycles = getattr(self, "curve_history", [])[-4:]
-        for cycle in ghost_cycles:
-            for i in range(cols):
-                t = i / max(1, cols - 1)
-                virtual_pull = int(t * hard)
-                if virtual_pull > len(cycle) - 1:
-                    continue
-                v = norm_chance(virtual_pull)
-                r = value_to_row(v)
-                if grid[r][i] == " ":
-                    grid[r][i] = "·"
-
-        # 2) Draw current cycle
-        for i in range(cols):
-            t = i / max(1, cols - 1)
-            virtual_pull = int(t * hard)
-            if virtual_pull > pulls:
-                continue
-            v = norm_chance(virtual_pull)
-            r = value_to_row(v)
-            grid[r][i] = "█"
-
-        # Theme colours
-        if self.current_theme == "dark":
-            current_color = "#FFFFFF"
-            ghost_color = "#777777"
-        else:
-            current_color = "#202020"
-            ghost_color = "#888888"
-
-        # Convert rows to HTML
-        for row_idx in range(rows):
-            text = "".join(grid[row_idx])
-            html = []
-            for ch in text:
-                if ch == "█":
-                    html.append(f'<span style="color:{current_color}">█</span>')
-                elif ch == "·":
-                    html.append(f'<span style="color:{ghost_color}">·</span>')
-                else:
-                    html.append("&nbsp;")
-            self.curve_rows[row_idx].setText("".join(html))
-            self.curve_rows[row_idx].setTextFormat(Qt.RichText)
+        table = self._mercy_table(banner_name)
+
+        self.curve_widget.set_curve(table.chance, data["soft"], data["hard"])
+        self.curve_widget.set_ghost_cycles(self.cycle_history[banner_name].lengths())
+        self.curve_widget.set_colors(
+            self.theme_tokens["curve_current"],
+            self.theme_tokens["curve_ghost"],
+            self.theme_tokens["pity_panel_border"],
+        )
+        self.curve_widget.set_pity(self._pulls(banner_name))
 
     # ---------------------------------------------------------
     # Banner switching + pity updates
@@ -579,55 +421,19 @@ class PityPage(QWidget):
         self.current_banner = banner_name
         self.refresh_ui(initial=True)
 
-    def update_pity(self, banner_name: str, pulls: int):
-        if banner_name not in self.banners:
-            return
-
-        data = self.banners[banner_name]
-        data["current"] = max(0, min(pulls, data["hard"]))
+    @traced()
+    def _on_pity_changed(self, changes: dict):
+        refresh = False
+        for key in changes:
+            banner_name = DISPLAY_NAMES[shard_of(key)]
 
-        # Detect completed cycles
-        self._record_cycle_if_completed(banner_name, data["current"])
+            # Detect completed cycles
+            self._record_cycle_if_completed(banner_name, self._pulls(banner_name))
+            refresh = refresh or banner_name == self.current_banner
 
-        # Save pity
-        key_map = {
-            "Ancient Shards": "ancient",
-            "Void Shards": "void",
-            "Sacred Shards": "sacred",
-            "Primal Shards": "primal",
-        }
-
-        if banner_name in key_map:
-            self.settings.setValue(f"pity/{key_map[banner_name]}", data["current"])
-
-        if banner_name == self.current_banner:
+        if refresh:
             self.refresh_ui(initial=False)
 
-    # ---------------------------------------------------------
-    # Curve history (persistent JSON storage)
-    # ---------------------------------------------------------
-
-    def _load_curve_history(self):
-        """Load stored pity curve history from QSettings."""
-        import json
-        raw = self.settings.value("pity_curve/history", "[]")
-        try:
-            history = json.loads(raw)
-            if isinstance(history, list):
-                return history
-        except Exception:
-            pass
-        return []
-
-    def _save_curve_history(self):
-        """Save curve history to QSettings."""
-        import json
-        try:
-            encoded = json.dumps(self.curve_history)
-            self.settings.setValue("pity_curve/history", encoded)
-        except Exception:
-            pass
-
     # ---------------------------------------------------------
     # Cycle detection (records completed pity cycles)
     # ---------------------------------------------------------
@@ -637,17 +443,14 @@ class PityPage(QWidget):
         Detects when a pity cycle completes:
         - previous pulls > 0
         - new pulls == 0
-        Stores the completed cycle as a ghost-line entry.
+        Stores the pity the cycle reached in the banner's ring buffer
+        (one slot written to disk).
         """
-        data = self.banners[banner_name]
-        prev = data.get("_previous_pulls", 0)
+        prev = self._previous_pulls.get(banner_name, 0)
 
         # Cycle completed
         if prev > 0 and new_pulls == 0:
-            completed = list(range(prev + 1))
-            self.curve_history.append(completed)
-            self.curve_history = self.curve_history[-4:]  # keep last 4 cycles
-            self._save_curve_history()
+            self.cycle_history[banner_name].append(prev)
 
         # Update previous pulls
-        data["_previous_pulls"] = new_pulls
\ No newline at end of file
+        self._previous_pulls[banner_name] = new_pulls
\ No newline at end of file
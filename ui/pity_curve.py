@@ -0,0 +1,154 @@
+# -------------------------------------------------------------
+#  Pity curve widget
+# -------------------------------------------------------------
+#
+# Paints the mercy curve (chance of the top rarity against pity) for the
+# selected banner. The static layer (axes, soft/hard markers and ghost
+# lines of previous cycles) is rendered once into a device-pixel-ratio
+# aware QPixmap and only rebuilt on resize, theme, banner or ghost
+# changes. A pity change repaints the overlay alone: a blit of the cached
+# layer plus one polyline of at most hard + 1 points.
+
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QColor, QPainter, QPen, QPixmap, QPolygonF
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+
+class PityCurveWidget(QWidget):
+    MARGIN = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(90)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, False)
+
+        self.chances = []        # % chance per pity, 0..hard
+        self.soft = 0
+        self.hard = 0
+        self.pity = 0
+        self.ghost_cycles = []   # pity reached in previous cycles, oldest first
+
+        self.current_color = QColor("#FFFFFF")
+        self.ghost_color = QColor("#777777")
+        self.axis_color = QColor("#555555")
+
+        self._points = []        # curve in widget coordinates, one per pity
+        self._static = None      # cached QPixmap of the static layer
+
+    # ---------------------------------------------------------
+    # Inputs
+    # ---------------------------------------------------------
+
+    def set_curve(self, chances, soft: int, hard: int):
+        chances = [float(c) for c in chances]
+        if chances == self.chances and soft == self.soft and hard == self.hard:
+            return
+        self.chances = chances
+        self.soft = soft
+        self.hard = hard
+        self._invalidate()
+
+    def set_ghost_cycles(self, cycles):
+        cycles = [int(c) for c in cycles]
+        if cycles != self.ghost_cycles:
+            self.ghost_cycles = cycles
+            self._invalidate()
+
+    def set_colors(self, current: str, ghost: str, axis: str):
+        colors = (QColor(current), QColor(ghost), QColor(axis))
+        if colors != (self.current_color, self.ghost_color, self.axis_color):
+            self.current_color, self.ghost_color, self.axis_color = colors
+            self._invalidate()
+
+    def set_pity(self, pity: int):
+        pity = max(0, min(int(pity), self.hard))
+        if pity != self.pity:
+            self.pity = pity
+            self.update()
+
+    # ---------------------------------------------------------
+    # Static layer
+    # ---------------------------------------------------------
+
+    def _invalidate(self):
+        self._points = []
+        self._static = None
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._invalidate()
+
+    def _plot_rect(self) -> QRectF:
+        m = self.MARGIN
+        return QRectF(m, m, max(1, self.width() - 2 * m), max(1, self.height() - 2 * m))
+
+    def _build_points(self):
+        rect = self._plot_rect()
+        span = max(1, self.hard)
+        self._points = [
+            QPointF(rect.left() + rect.width() * p / span, rect.bottom() - rect.height() * c / 100.0)
+            for p, c in enumerate(self.chances)
+        ]
+
+    def _build_static(self):
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self._plot_rect()
+
+        # Axes + soft / hard pity markers
+        painter.setPen(QPen(self.axis_color, 1))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+        painter.drawLine(rect.bottomLeft(), rect.topLeft())
+        painter.setPen(QPen(self.axis_color, 1, Qt.DashLine))
+        for marker in (self.soft, self.hard):
+            if 0 < marker < len(self._points):
+                x = self._points[marker].x()
+                painter.drawLine(QPointF(x, rect.top()), QPointF(x, rect.bottom()))
+
+        # Ghost cycles all follow the same curve: one faint line up to the
+        # furthest cycle, plus a tick where each previous cycle ended
+        ends = sorted({min(reached, len(self._points) - 1) for reached in self.ghost_cycles if reached > 0})
+        if ends:
+            painter.setPen(QPen(self.ghost_color, 1.2, Qt.DotLine))
+            painter.drawPolyline(QPolygonF(self._points[: ends[-1] + 1]))
+
+            painter.setPen(QPen(self.ghost_color, 1.2))
+            for end in ends:
+                point = self._points[end]
+                painter.drawLine(QPointF(point.x(), point.y() - 4), QPointF(point.x(), point.y() + 4))
+
+        painter.end()
+        self._static = pixmap
+
+    # ---------------------------------------------------------
+    # Painting
+    # ---------------------------------------------------------
+
+    def paintEvent(self, event):
+        if not self.chances:
+            return
+
+        if not self._points:
+            self._build_points()
+        if self._static is None or self._static.devicePixelRatio() != self.devicePixelRatioF():
+            self._build_static()
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._static)
+
+        # Overlay: the current cycle up to the current pity
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.current_color, 2.5, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        if self.pity > 0:
+            painter.drawPolyline(QPolygonF(self._points[: self.pity + 1]))
+
+        painter.setBrush(self.current_color)
+        painter.drawEllipse(self._points[self.pity], 3.5, 3.5)
+        painter.end()
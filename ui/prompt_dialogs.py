@@ -0,0 +1,187 @@
+# -------------------------------------------------------------
+#  Reusable pull prompts
+# -------------------------------------------------------------
+#
+# The rarity and hit-position prompts are built once per tracker and
+# reused: prepare() resets the title, message and selection and the
+# dialog is shown again, instead of rebuilding widgets, layouts,
+# stylesheets and a Fusion style for every prompt.
+
+from PySide6.QtWidgets import (
+    QDialog,
+    QGridLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QStyleFactory,
+    QVBoxLayout,
+)
+from PySide6.QtCore import Qt
+
+
+RARITY_BUTTON_STYLES = {
+    "Epic": (
+        "QPushButton { background-color: #7b2cff; color: white; "
+        "border-radius: 6px; padding: 6px 10px; border: none; }"
+    ),
+    "Legendary": (
+        "QPushButton { background-color: #d4af37; color: black; "
+        "border-radius: 6px; padding: 6px 10px; border: none; }"
+    ),
+    "Mythical": (
+        "QPushButton { background-color: #cc3333; color: white; "
+        "border-radius: 6px; padding: 6px 10px; border: none; }"
+    ),
+}
+
+NO_HIT_BUTTON_STYLE = (
+    "QPushButton { background-color: #444; color: #ccc; "
+    "border-radius: 6px; padding: 6px 10px; border: none; }"
+)
+
+CHECKED_BUTTON_STYLE = (
+    "QPushButton:checked { "
+    "background-color: #2d6cdf; "
+    "color: white; "
+    "border: 2px solid white; "
+    "font-weight: bold; "
+    "} "
+)
+
+POSITION_BUTTON_STYLE = (
+    "QPushButton { background-color: #444; color: #eee; "
+    "border-radius: 6px; padding: 6px 10px; }"
+    "QPushButton:checked { background-color: #2d6cdf; color: white; }"
+)
+
+# Hit-position prompts cover at most one 10-pull block
+BLOCK_SIZE = 10
+
+_fusion = None
+
+
+def fusion_style():
+    """One Fusion QStyle shared by every prompt (QStyleFactory.create builds a new one)."""
+    global _fusion
+    if _fusion is None:
+        _fusion = QStyleFactory.create("Fusion")
+    return _fusion
+
+
+def _add_confirm_row(dialog: QDialog, layout: QVBoxLayout):
+    bottom_row = QHBoxLayout()
+    bottom_row.setAlignment(Qt.AlignRight)
+    bottom_row.setSpacing(8)
+
+    cancel_btn = QPushButton("Cancel")
+    cancel_btn.setStyleSheet(
+        "QPushButton { background-color: #555; color: #eee; "
+        "border-radius: 6px; padding: 6px 10px; }"
+    )
+
+    confirm_btn = QPushButton("Confirm")
+    confirm_btn.setStyleSheet(
+        "QPushButton { background-color: #2d6cdf; color: white; "
+        "border-radius: 6px; padding: 6px 10px; }"
+    )
+
+    cancel_btn.clicked.connect(dialog.reject)
+    confirm_btn.clicked.connect(dialog.accept)
+
+    bottom_row.addWidget(cancel_btn)
+    bottom_row.addWidget(confirm_btn)
+    layout.addLayout(bottom_row)
+
+
+class RarityPromptDialog(QDialog):
+    """Pick one rarity (or "No Hit") from a fixed set of buttons."""
+
+    def __init__(self, rarities: list[str], parent=None):
+        super().__init__(parent)
+        self.setStyle(fusion_style())
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(8)
+
+        self.info = QLabel()
+        self.info.setStyleSheet("font-size: 12px; color: #ccc;")
+        layout.addWidget(self.info)
+
+        # Kept as a dict so callers can read selected["rarity"] after exec()
+        self.selected = {"rarity": None}
+        self.buttons = {}
+
+        rarity_row = QHBoxLayout()
+        rarity_row.setSpacing(8)
+
+        for rarity in rarities:
+            btn = QPushButton(rarity)
+            btn.setCheckable(True)
+            btn.setStyleSheet(RARITY_BUTTON_STYLES.get(rarity, NO_HIT_BUTTON_STYLE) + CHECKED_BUTTON_STYLE)
+            btn.clicked.connect(lambda _=False, r=rarity: self._select(r))
+            self.buttons[rarity] = btn
+            rarity_row.addWidget(btn)
+
+        layout.addLayout(rarity_row)
+        _add_confirm_row(self, layout)
+
+    def _select(self, rarity: str):
+        self.selected["rarity"] = rarity
+        for name, btn in self.buttons.items():
+            btn.setChecked(name == rarity)
+
+    def prepare(self, title: str, message: str) -> "RarityPromptDialog":
+        """Reset for the next prompt."""
+        self.setWindowTitle(title)
+        self.info.setText(message)
+        self.selected["rarity"] = None
+        for btn in self.buttons.values():
+            btn.setChecked(False)
+        return self
+
+
+class HitPositionDialog(QDialog):
+    """Tick which positions of a block (up to 10) were hits."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyle(fusion_style())
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        self.info = QLabel()
+        self.info.setStyleSheet("font-size: 12px; color: #ccc;")
+        layout.addWidget(self.info)
+
+        grid = QGridLayout()
+        grid.setSpacing(6)
+
+        self.buttons = []
+        for i in range(BLOCK_SIZE):
+            btn = QPushButton()
+            btn.setCheckable(True)
+            btn.setStyleSheet(POSITION_BUTTON_STYLE)
+            self.buttons.append(btn)
+            grid.addWidget(btn, i // 5, i % 5)
+
+        layout.addLayout(grid)
+        _add_confirm_row(self, layout)
+
+        self.start = 1
+
+    def prepare(self, title: str, message: str, start: int, end: int) -> "HitPositionDialog":
+        """Relabel the buttons for positions start..end and clear them."""
+        self.setWindowTitle(title)
+        self.info.setText(message)
+        self.start = start
+
+        for i, btn in enumerate(self.buttons):
+            pos = start + i
+            btn.setChecked(False)
+            btn.setVisible(pos <= end)
+            btn.setText(str(pos))
+        return self
+
+    def checked_positions(self) -> list[int]:
+        return [self.start + i for i, btn in enumerate(self.buttons) if not btn.isHidden() and btn.isChecked()]
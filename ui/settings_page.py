@@ -4,14 +4,19 @@ from PySide6.QtWidgets import (
     QLabel,
     QScrollArea,
     QFrame,
+    QCheckBox,
 )
 from PySide6.QtCore import Qt
 
-from ui.app_metadata import APP_VERSION, APP_BUILD, APP_THEME_KEY
+from ui.app_metadata import APP_VERSION, APP_THEME_KEY, APP_REDUCED_MOTION_KEY
+from ui.animation import get_animation_manager
+
+
+BUILD_PLACEHOLDER = "checking…"
 
 
 class SettingsPage(QWidget):
-    def __init__(self, settings, build_number):
+    def __init__(self, settings, build_number=None):
         super().__init__()
 
         self.settings = settings
@@ -54,15 +59,17 @@ class SettingsPage(QWidget):
         container_layout.addWidget(title)
 
         # Build + version + theme info (store as instance variable)
-        current_theme = self.settings.value(APP_THEME_KEY, "Dark")
-        self.info_label = QLabel(
-            f"Version: {APP_VERSION}\n"
-            f"Build Number: {APP_BUILD}\n"
-            f"Current Theme: {current_theme}"
-        )
+        self.info_label = QLabel()
+        self.refresh_theme_label()
         self.info_label.setStyleSheet("font-size: 14px;")
         container_layout.addWidget(self.info_label)
 
+        # Motion
+        self.reduced_motion_check = QCheckBox("Reduce motion (no page slides, glow pulse or bar animations)")
+        self.reduced_motion_check.setChecked(get_animation_manager().reduced_motion)
+        self.reduced_motion_check.toggled.connect(self._set_reduced_motion)
+        container_layout.addWidget(self.reduced_motion_check)
+
         # Divider
         divider = QFrame()
         divider.setFrameShape(QFrame.HLine)
@@ -168,8 +175,18 @@ Full license text: https://creativecommons.org/licenses/by-nc/4.0/
     # NEW: Refresh method
     def refresh_theme_label(self):
         current_theme = self.settings.value(APP_THEME_KEY, "Dark")
+        build = self.build_number if self.build_number is not None else BUILD_PLACEHOLDER
         self.info_label.setText(
             f"Version: {APP_VERSION}\n"
-            f"Build Number: {APP_BUILD}\n"
+            f"Build Number: {build}\n"
             f"Current Theme: {current_theme}"
-        )
\ No newline at end of file
+        )
+
+    def _set_reduced_motion(self, enabled: bool):
+        self.settings.setValue(APP_REDUCED_MOTION_KEY, enabled)
+        get_animation_manager().set_reduced_motion(enabled)
+
+    def set_build_number(self, build_number: int):
+        """Called once the background build check has finished."""
+        self.build_number = build_number
+        self.refresh_theme_label()
\ No newline at end of file
@@ -1,79 +1,99 @@
-from PySide6.QtCore import QObject, Signal
+from contextlib import contextmanager
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from core.inventory import Inventory
 
 
 class ShardInventory(QObject):
     """
     Centralised shard inventory manager.
-    All shard counts live here.
+    All shard counts live in a core.inventory.Inventory model; this
+    adapter turns its change notifications into a Qt signal.
     Any UI can listen to inventory_changed to stay in sync.
+
+    Change notifications are coalesced: any number of updates made in the
+    same event-loop turn (or inside a batch()) produce a single
+    inventory_changed emission.
     """
 
     inventory_changed = Signal(dict)
 
-    def __init__(self):
+    def __init__(self, model: Inventory | None = None):
         super().__init__()
 
-        # Core shard values
-        self.ancient = 0
-        self.void = 0
-        self.primal = 0
-        self.sacred = 0
+        self.model = model or Inventory()
+        self.model.subscribe(self._on_model_changed)
+
+        # Coalescing state
+        self._dirty = False
+        self._emit_scheduled = False
 
     # -----------------------------
     #   INTERNAL UPDATE EMITTER
     # -----------------------------
-    def _emit_update(self):
-        self.inventory_changed.emit({
-            "ancient": self.ancient,
-            "void": self.void,
-            "primal": self.primal,
-            "sacred": self.sacred,
-        })
+    def _on_model_changed(self, _counts: dict):
+        """Mark the inventory dirty; the signal fires once per event-loop turn."""
+        self._dirty = True
+        if self._emit_scheduled:
+            return
+        self._emit_scheduled = True
+        QTimer.singleShot(0, self._flush_update)
+
+    def _flush_update(self):
+        self._emit_scheduled = False
+        if not self._dirty:
+            return
+        self._dirty = False
+        self.inventory_changed.emit(self.to_dict())
 
     # -----------------------------
     #   PUBLIC METHODS
     # -----------------------------
     def add(self, shard_type: str):
         """Increment a shard count by name."""
-        if hasattr(self, shard_type):
-            setattr(self, shard_type, getattr(self, shard_type) + 1)
-            self._emit_update()
+        self.model.adjust(shard_type, 1)
 
     def remove(self, shard_type: str):
         """Decrement a shard count safely (never below 0)."""
-        if hasattr(self, shard_type):
-            current = getattr(self, shard_type)
-            setattr(self, shard_type, max(0, current - 1))
-            self._emit_update()
+        self.model.adjust(shard_type, -1)
+
+    def adjust(self, shard_type: str, delta: int):
+        """Change a shard count by delta in one step (never below 0)."""
+        self.model.adjust(shard_type, delta)
+
+    def apply_deltas(self, deltas: dict):
+        """Apply several shard deltas at once, e.g. {"ancient": -10, "void": 3}."""
+        self.model.apply_deltas(deltas)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several updates into one change notification, emitted when the
+        outermost batch commits. If the block raises, counts are rolled back.
+        """
+        with self.model.batch():
+            yield self
+
+        if not self.model.in_batch:
+            self._flush_update()
 
     def set_value(self, shard_type: str, value: int):
         """Directly set a shard count."""
-        if hasattr(self, shard_type):
-            setattr(self, shard_type, max(0, int(value)))
-            self._emit_update()
+        self.model.set_value(shard_type, value)
 
     def reset(self):
         """Reset all shard counts to zero."""
-        self.ancient = 0
-        self.void = 0
-        self.primal = 0
-        self.sacred = 0
-        self._emit_update()
+        self.model.reset()
+
+    def get(self, shard_type: str) -> int:
+        return self.model.get(shard_type)
 
     # -----------------------------
     #   EXPORT / IMPORT
     # -----------------------------
     def to_dict(self):
-        return {
-            "ancient": self.ancient,
-            "void": self.void,
-            "primal": self.primal,
-            "sacred": self.sacred,
-        }
+        return self.model.to_dict()
 
     def load_from_dict(self, data: dict):
-        self.ancient = data.get("ancient", 0)
-        self.void = data.get("void", 0)
-        self.primal = data.get("primal", 0)
-        self.sacred = data.get("sacred", 0)
-        self._emit_update()
\ No newline at end of file
+        self.model.load_from_dict(data)
@@ -0,0 +1,250 @@
+# -------------------------------------------------------------
+#  Theme engine
+# -------------------------------------------------------------
+#
+# Every theme is described by a flat dict of colour tokens. The full
+# application stylesheet is generated from those tokens once per theme,
+# cached, and applied with a single setStyleSheet() on the top-level
+# window. Pages scope their rules through object names (#dashboardTab,
+# #pityPage, ...) instead of calling setStyleSheet() themselves.
+
+from functools import lru_cache
+
+
+THEME_TOKENS = {
+    "dark": {
+        # Window + toolbar
+        "window_bg": "#000000",
+        "window_text": "#f0f0f0",
+        "toolbar_bg": "#0a0a0a",
+        "toolbar_border": "#222",
+        "nav_bg": "#111",
+        "nav_border": "#222",
+        "nav_text": "#f0f0f0",
+        "nav_hover_border": "#66ff66",
+        "nav_hover_bg": "#151515",
+        "nav_active_border": "#99ff99",
+        "nav_active_bg": "#0d0d0d",
+        "nav_pressed_bg": "#222",
+
+        # Tooltips
+        "tooltip_bg": "#333333",
+        "tooltip_text": "#f0f0f0",
+        "tooltip_border": "#888",
+
+        # Dashboard
+        "dash_text": "#f0f0f0",
+        "dash_accent": "#99ff99",
+        "dash_segment_bg": "#202020",
+        "dash_box_bg": "#111111",
+        "dash_button_bg": "#222222",
+        "dash_button_text": "#f0f0f0",
+        "dash_button_hover": "#2b2b2b",
+        "dash_shadow": "rgba(153,255,153,60)",
+
+        # Pity page
+        "pity_text": "#FFFFFF",
+        "pity_track_bg": "#222222",
+        "pity_status_bg": "#222222",
+        "pity_status_border": "#555555",
+        "pity_panel_bg": "#1b1b1b",
+        "pity_panel_border": "#555555",
+        "curve_current": "#FFFFFF",
+        "curve_ghost": "#777777",
+    },
+    "light": {
+        # Window + toolbar
+        "window_bg": "#f5f5f5",
+        "window_text": "#202020",
+        "toolbar_bg": "#e0e0e0",
+        "toolbar_border": "#c0c0c0",
+        "nav_bg": "transparent",
+        "nav_border": "transparent",
+        "nav_text": "#202020",
+        "nav_hover_border": "#225522",
+        "nav_hover_bg": "#f0f0f0",
+        "nav_active_border": "#337733",
+        "nav_active_bg": "#dff5df",
+        "nav_pressed_bg": "#cfcfcf",
+
+        # Tooltips
+        "tooltip_bg": "#fdfdfd",
+        "tooltip_text": "#202020",
+        "tooltip_border": "#aaa",
+
+        # Dashboard
+        "dash_text": "#202020",
+        "dash_accent": "#225522",
+        "dash_segment_bg": "#f4faf4",
+        "dash_box_bg": "#f0f5f0",
+        "dash_button_bg": "#ffffff",
+        "dash_button_text": "#202020",
+        "dash_button_hover": "#f0f5f0",
+        "dash_shadow": "rgba(34,85,34,60)",
+
+        # Pity page
+        "pity_text": "#202020",
+        "pity_track_bg": "#EEEEEE",
+        "pity_status_bg": "#f0f0f0",
+        "pity_status_border": "#CCCCCC",
+        "pity_panel_bg": "#f5f5f5",
+        "pity_panel_border": "#CCCCCC",
+        "curve_current": "#202020",
+        "curve_ghost": "#888888",
+    },
+}
+
+# Rarity colours are the same in both themes
+RARITY_GLOW = {
+    "Legendary": "#FFD700",
+    "Mythical": "#FF3B3B",
+}
+
+DEFAULT_THEME = "dark"
+
+
+_STYLESHEET_TEMPLATE = """
+/* ---------------- Window + toolbar ---------------- */
+QWidget {{
+    background-color: {window_bg};
+    color: {window_text};
+}}
+QToolBar {{
+    background-color: {toolbar_bg};
+    border-bottom: 1px solid {toolbar_border};
+}}
+QToolButton {{
+    padding: 6px 14px;
+    font-weight: bold;
+    border-radius: 10px;
+    background-color: {nav_bg};
+    border: 2px solid {nav_border};
+    color: {nav_text};
+}}
+QToolButton:hover {{
+    border: 2px solid {nav_hover_border};
+    background-color: {nav_hover_bg};
+}}
+QToolButton[active="true"] {{
+    border: 2px solid {nav_active_border};
+    background-color: {nav_active_bg};
+}}
+QToolButton:pressed {{
+    background-color: {nav_pressed_bg};
+}}
+QToolTip {{
+    background-color: {tooltip_bg};
+    color: {tooltip_text};
+    border: 1px solid {tooltip_border};
+    padding: 6px;
+    font-size: 12px;
+}}
+
+/* ---------------- Dashboard ---------------- */
+#dashboardTab QLabel {{
+    color: {dash_text};
+    background: transparent;
+}}
+#dashboardTab QFrame#segmentBox {{
+    border: 2px solid {dash_accent};
+    border-radius: 8px;
+    background-color: {dash_segment_bg};
+    padding: 6px;
+}}
+#dashboardTab QFrame#lastHitBox, #dashboardTab QFrame#inventoryBox {{
+    border: 1px solid {dash_accent};
+    border-radius: 10px;
+    background-color: {dash_box_bg};
+    padding: 12px;
+}}
+#dashboardTab QPushButton {{
+    background-color: {dash_button_bg};
+    color: {dash_button_text};
+    border: 1px solid {dash_accent};
+    border-radius: 4px;
+}}
+#dashboardTab QPushButton:hover {{
+    background-color: {dash_button_hover};
+}}
+#dashboardTab QFrame#dashboardDivider {{
+    background-color: {dash_accent};
+}}
+#dashboardTab QLabel#dashboardShadow {{
+    background: qlineargradient(
+        x1:0, y1:0, x2:0, y2:1,
+        stop:0 {dash_shadow},
+        stop:1 rgba(0,0,0,0)
+    );
+}}
+#dashboardTab QListView {{
+    background-color: transparent;
+    border: 1px solid {dash_accent};
+    border-radius: 6px;
+    padding: 6px;
+}}
+
+/* ---------------- Pity page ---------------- */
+#pityPage, #pityPage QWidget {{
+    background-color: transparent;
+    color: {pity_text};
+}}
+#pityPage QComboBox {{
+    background-color: {pity_track_bg};
+    color: {pity_text};
+    border: 1px solid #666;
+    border-radius: 4px;
+    padding: 4px 8px;
+}}
+#pityPage QComboBox QAbstractItemView {{
+    background-color: {pity_track_bg};
+    color: {pity_text};
+    selection-background-color: #555555;
+}}
+#pityPage QProgressBar {{
+    border: 1px solid #444;
+    border-radius: 6px;
+    background-color: {pity_track_bg};
+    text-align: center;
+    color: {pity_text};
+}}
+#pityPage QProgressBar::chunk {{
+    background-color: #4CAF50;
+    border-radius: 6px;
+}}
+#pityPage QProgressBar[glow="Legendary"], #pityPage QProgressBar[glow="Mythical"] {{
+    border: 1px solid #888;
+}}
+#pityPage QProgressBar[glow="Legendary"]::chunk {{
+    background-color: {glow_legendary};
+}}
+#pityPage QProgressBar[glow="Mythical"]::chunk {{
+    background-color: {glow_mythical};
+}}
+QFrame#pityStatusFrame, QFrame#pityStatusFrame QFrame {{
+    border: 1px solid {pity_status_border};
+    border-radius: 8px;
+    padding: 8px;
+    background-color: {pity_status_bg};
+}}
+QFrame#pityPanel, QFrame#pityPanel QFrame {{
+    border: 1px solid {pity_panel_border};
+    border-radius: 8px;
+    padding: 6px;
+    background-color: {pity_panel_bg};
+}}
+"""
+
+
+def tokens(theme: str) -> dict:
+    """Colour tokens for a theme (falls back to the default theme)."""
+    return THEME_TOKENS.get(theme, THEME_TOKENS[DEFAULT_THEME])
+
+
+@lru_cache(maxsize=None)
+def stylesheet(theme: str) -> str:
+    """Full application stylesheet for a theme, generated once and cached."""
+    return _STYLESHEET_TEMPLATE.format(
+        glow_legendary=RARITY_GLOW["Legendary"],
+        glow_mythical=RARITY_GLOW["Mythical"],
+        **tokens(theme),
+    )